@@ -0,0 +1,255 @@
+"""
+Aggregates module keeping monthly and all-time leaderboards.
+
+Votes reset on the 1st, so the API forgets a month as soon as it ends. Every
+run folds its ranking into a small store of precomputed rows: all-time votes,
+months active and best rank per player, each player's votes of the last few
+months (needed for the running totals and month-over-month comparisons), and
+only the top rows of older months. Month-over-month and hall-of-fame embeds
+read those rows directly instead of rescanning snapshot history.
+"""
+
+import heapq
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+import logging
+from models import Player
+
+logger = logging.getLogger(__name__)
+
+# Aggregate store file name inside a snapshots directory
+AGGREGATES_FILENAME = 'aggregates.json'
+
+# Rows kept ready for the month and hall-of-fame leaderboards
+TOP_ROWS = 25
+
+# Months whose votes are kept per player: the running month, the month a
+# missed month end is caught up for, and the month that one is compared with
+FULL_MONTHS = 3
+
+# Fields of a player's all-time row, stored as a list to keep the file compact
+VOTES, MONTHS_ACTIVE, BEST_RANK = range(3)
+
+
+def previous_month(month: str) -> str:
+    """
+    Get the month before a month.
+
+    Args:
+        month: Month as YYYY-MM
+
+    Returns:
+        str: Previous month as YYYY-MM
+    """
+    year, number = int(month[:4]), int(month[5:7])
+    return f"{year - 1}-12" if number == 1 else f"{year}-{number - 1:02d}"
+
+
+class AggregateStore:
+    """Materialized per-month and all-time leaderboard rows."""
+
+    def __init__(self, store_file: str = os.path.join("snapshots", AGGREGATES_FILENAME)):
+        """
+        Initialize the store and load its rows.
+
+        Args:
+            store_file: Path to the JSON file storing the rows
+        """
+        self.store_file = store_file
+        self._data: Dict[str, Any] = self._load()
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Any]:
+        """
+        Load the rows from disk.
+
+        Returns:
+            dict: Stored rows (empty store if missing or unreadable)
+        """
+        empty = {'months': {}, 'folded': {}, 'all_time': {}, 'hall_of_fame': []}
+        if not os.path.exists(self.store_file):
+            return empty
+
+        try:
+            with open(self.store_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.error(f"Failed to load aggregates {self.store_file}: {e}")
+            return empty
+
+        # Stores written before months were folded keep every month in full
+        data.setdefault('folded', {})
+        self._fold_old_months(data)
+        return data
+
+    @staticmethod
+    def _fold_old_months(data: Dict[str, Any]):
+        """
+        Replace the per-player votes of months older than FULL_MONTHS by their top rows.
+
+        Args:
+            data: Stored rows, changed in place
+        """
+        months = data['months']
+        for month in sorted(months)[:-FULL_MONTHS]:
+            row = months.pop(month)
+            data['folded'][month] = [[name, row['votes'][name]] for name in row['top']]
+
+    def _save(self):
+        """Write the rows to disk, replacing the old file in one step."""
+        directory = os.path.dirname(self.store_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        temp_file = f"{self.store_file}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(self._data, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temp_file, self.store_file)
+
+    def update(self, ranked_players: List[Player], today: datetime):
+        """
+        Fold a run's ranking into the monthly and all-time rows.
+
+        The API totals of a month only grow, so a player's all-time votes
+        change by the difference to the month's previous total. A lower total
+        (e.g. an older snapshot folded in by a catch-up) changes nothing, and
+        the file is only rewritten when something changed.
+
+        Args:
+            ranked_players: Full ranking of the run (or of a month's last snapshot), sorted by rank
+            today: Date of the run (any date in the month the ranking belongs to)
+        """
+        month = today.strftime('%Y-%m')
+        with self._lock:
+            if month in self._data['folded']:
+                logger.warning(f"Not folding votes into {month}: the month is already closed")
+                return
+            months = self._data['months']
+            changed = month not in months
+            row = months.setdefault(month, {'votes': {}, 'top': []})
+            month_votes = row['votes']
+            all_time = self._data['all_time']
+
+            for player in ranked_players:
+                name, votes, rank = player.playername, player.votes, player.rank
+                if votes <= 0:
+                    continue
+
+                entry = all_time.get(name)
+                if entry is None:
+                    entry = all_time[name] = [0, 0, rank]
+                    changed = True
+                previous = month_votes.get(name)
+                if previous is None:
+                    entry[MONTHS_ACTIVE] += 1
+                    previous = 0
+                if votes > previous:
+                    entry[VOTES] += votes - previous
+                    month_votes[name] = votes
+                    changed = True
+                if rank < entry[BEST_RANK]:
+                    entry[BEST_RANK] = rank
+                    changed = True
+
+            if not changed:
+                return
+            row['top'] = heapq.nlargest(TOP_ROWS, month_votes, key=month_votes.__getitem__)
+            self._data['hall_of_fame'] = heapq.nlargest(TOP_ROWS, all_time, key=lambda name: all_time[name][VOTES])
+            self._fold_old_months(self._data)
+            self._save()
+
+    def newcomer_filter(self, today: datetime) -> Callable[[Player], bool]:
+        """
+        Get a test for players voting in their first month (for a newcomers view).
+
+        Players the store has never seen count as newcomers, so on a fresh
+        store everyone does until a month has been recorded.
+
+        Args:
+            today: Date of the run
+
+        Returns:
+            callable: Returns True for a player with votes whose only active month is this one
+        """
+        all_time = self._data['all_time']
+        month_votes = self._data['months'].get(today.strftime('%Y-%m'), {}).get('votes', {})
+
+        def is_newcomer(player: Player) -> bool:
+            entry = all_time.get(player.playername)
+            if entry is None:
+                return player.votes > 0
+            return entry[MONTHS_ACTIVE] == 1 and player.playername in month_votes
+
+        return is_newcomer
+
+    def month_over_month(self, month: str, count: int = 10) -> List[Dict[str, Any]]:
+        """
+        Get a month's top players next to their votes of the month before.
+
+        Args:
+            month: Month as YYYY-MM
+            count: Number of players
+
+        Returns:
+            list: Rows with rank, playername, votes, previous_votes and change
+                (previous_votes is None for players who didn't vote the month before)
+        """
+        top = self._month_top(month)
+        if top is None:
+            return []
+        before = self._data['months'].get(previous_month(month), {}).get('votes')
+        if before is None:
+            # Only the top rows of a closed month are left
+            before = dict(self._month_top(previous_month(month)) or [])
+
+        rows = []
+        for rank, (name, votes) in enumerate(top[:count], start=1):
+            previous_votes = before.get(name)
+            rows.append({
+                'rank': rank,
+                'playername': name,
+                'votes': votes,
+                'previous_votes': previous_votes,
+                'change': None if previous_votes is None else votes - previous_votes,
+            })
+        return rows
+
+    def _month_top(self, month: str) -> Optional[List[List[Any]]]:
+        """
+        Get a month's top rows.
+
+        Args:
+            month: Month as YYYY-MM
+
+        Returns:
+            list or None: [playername, votes] pairs, best first; None if the month is unknown
+        """
+        row = self._data['months'].get(month)
+        if row is not None:
+            return [[name, row['votes'][name]] for name in row['top']]
+        return self._data['folded'].get(month)
+
+    def hall_of_fame(self, count: int = 10) -> List[Dict[str, Any]]:
+        """
+        Get the all-time top players.
+
+        Args:
+            count: Number of players
+
+        Returns:
+            list: Rows with rank, playername, votes, months_active and best_rank
+        """
+        all_time = self._data['all_time']
+        return [
+            {
+                'rank': rank,
+                'playername': name,
+                'votes': all_time[name][VOTES],
+                'months_active': all_time[name][MONTHS_ACTIVE],
+                'best_rank': all_time[name][BEST_RANK],
+            }
+            for rank, name in enumerate(self._data['hall_of_fame'][:count], start=1)
+        ]
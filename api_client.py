@@ -4,23 +4,36 @@ API Client module for fetching data from TopGames API.
 This module handles HTTP requests to the TopGames API and returns player voting data.
 """
 
+import json
+import time
 import requests
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+import metrics
 
 
 class APIClient:
     """Client for interacting with the TopGames API."""
 
-    def __init__(self, api_url: str, timeout: int = 10):
+    def __init__(
+        self,
+        api_url: str,
+        timeout: int = 10,
+        session: Optional[requests.Session] = None,
+        server: str = 'default'
+    ):
         """
         Initialize the API client.
 
         Args:
             api_url: The URL of the TopGames API endpoint
             timeout: Request timeout in seconds (default: 10)
+            session: Optional requests session to reuse connections across runs
+            server: Server (tenant) name the request metrics are recorded under
         """
         self.api_url = api_url
         self.timeout = timeout
+        self.session = session
+        self.server = server
 
     def fetch_voters(self) -> Dict[str, Any]:
         """
@@ -33,21 +46,58 @@ class APIClient:
             requests.RequestException: If the API request fails
             ValueError: If the response is not valid JSON
         """
+        response = None
+        started = time.perf_counter()
         try:
-            response = requests.get(self.api_url, timeout=self.timeout)
+            http = self.session if self.session is not None else requests
+            response = http.get(self.api_url, timeout=self.timeout)
+            metrics.observe_response(self.server, 'api', response, started, len(response.content))
             response.raise_for_status()  # Raise an exception for bad status codes
 
             data = response.json()
             return data
 
         except requests.Timeout:
+            metrics.observe_response(self.server, 'api', None, started)
             raise requests.RequestException(f"Request to {self.api_url} timed out after {self.timeout} seconds")
         except requests.RequestException as e:
+            if response is None:
+                metrics.observe_response(self.server, 'api', None, started)
             raise requests.RequestException(f"Failed to fetch data from API: {str(e)}")
         except ValueError as e:
             raise ValueError(f"Invalid JSON response from API: {str(e)}")
 
 
+class RecordedAPIClient:
+    """Stand-in for APIClient answering with a recorded API response from disk."""
+
+    def __init__(self, response_file: str):
+        """
+        Initialize the client.
+
+        Args:
+            response_file: JSON file holding a players-ranking response
+        """
+        self.api_url = response_file
+        self.response_file = response_file
+
+    def fetch_voters(self) -> Dict[str, Any]:
+        """
+        Read the recorded response.
+
+        Returns:
+            dict: Recorded API response
+
+        Raises:
+            ValueError: If the file is not valid JSON
+        """
+        with open(self.response_file, 'r', encoding='utf-8') as f:
+            try:
+                return json.load(f)
+            except ValueError as e:
+                raise ValueError(f"Invalid JSON in recorded response {self.response_file}: {str(e)}")
+
+
 def fetch_top_voters(api_url: str) -> Dict[str, Any]:
     """
     Convenience function to fetch top voters.
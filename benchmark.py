@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for ranking, snapshot and embed performance.
+
+Generates synthetic TopGames payloads (see synthetic_data.py), measures the
+throughput and peak memory of the hot paths and writes the results as JSON so
+runs can be compared between commits:
+
+    python benchmark.py --sizes 1k,100k,1m --output before.json
+    python benchmark.py --sizes 1k,100k,1m --output after.json --compare before.json
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import platform
+import tempfile
+import tracemalloc
+import subprocess
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from models import Player
+from ranking import RankingProcessor, RankingView, rank_views
+from render import DEFAULT_LOCALE, Renderer, RenderCache
+from snapshot_manager import SnapshotManager
+from synthetic_data import generate_payload
+from webhook import DiscordWebhook
+
+logger = logging.getLogger(__name__)
+
+# Sizes used when --sizes is not given (5m needs several GB of RAM)
+DEFAULT_SIZES = '1k,10k,100k,1m'
+
+# Embeds rendered per measurement (rendering cost doesn't depend on the payload size)
+EMBEDS_PER_MEASUREMENT = 1000
+
+# A benchmark prepares its input once and returns (function to measure, items processed)
+Benchmark = Callable[[Dict[str, Any], str], Tuple[Callable[[], Any], int]]
+
+
+def parse_size(value: str) -> int:
+    """
+    Parse a player count like 1000, 10k or 5m.
+
+    Args:
+        value: Player count with optional k/m suffix
+
+    Returns:
+        int: Player count
+    """
+    value = value.strip().lower()
+    multiplier = {'k': 1_000, 'm': 1_000_000}.get(value[-1:], 1)
+    return int(float(value.rstrip('km')) * multiplier)
+
+
+def bench_ranking(payload: Dict[str, Any], work_dir: str) -> Tuple[Callable[[], Any], int]:
+    """Validate, consolidate and sort the whole payload."""
+    processor = RankingProcessor()
+    return lambda: processor.process_rankings(payload, max_count=10), len(payload['players'])
+
+
+def bench_ranking_views(payload: Dict[str, Any], work_dir: str) -> Tuple[Callable[[], Any], int]:
+    """Cut the top 10, the top 50 and a filtered top 25 from one ordering."""
+    players = RankingProcessor().consolidate_players(payload['players'])
+    views = [
+        RankingView('daily', 10),
+        RankingView('pinned', 50),
+        RankingView('filtered', 25, where=lambda player: player.votes % 7 == 0),
+    ]
+    return lambda: rank_views(players, views), len(players)
+
+
+def _consolidated(payload: Dict[str, Any]) -> List[Player]:
+    """All consolidated players of a payload, as stored in a snapshot."""
+    processor = RankingProcessor()
+    return processor.process_rankings(payload, max_count=len(payload['players']))
+
+
+def bench_snapshot_save(payload: Dict[str, Any], work_dir: str) -> Tuple[Callable[[], Any], int]:
+    """Write a snapshot of every consolidated player."""
+    players = _consolidated(payload)
+    manager = SnapshotManager(work_dir)
+    return lambda: manager.save_snapshot(players, datetime(2025, 1, 5)), len(players)
+
+
+def bench_snapshot_load(payload: Dict[str, Any], work_dir: str) -> Tuple[Callable[[], Any], int]:
+    """Read a snapshot from disk (bypassing the in-memory cache)."""
+    players = _consolidated(payload)
+    SnapshotManager(work_dir).save_snapshot(players, datetime(2025, 1, 5))
+    return lambda: SnapshotManager(work_dir).load_snapshot(datetime(2025, 1, 5)), len(players)
+
+
+def bench_snapshot_diff(payload: Dict[str, Any], work_dir: str) -> Tuple[Callable[[], Any], int]:
+    """Diff the current votes against a baseline with fewer votes per player."""
+    players = _consolidated(payload)
+    baseline = {'players': {player.playername: player.votes // 2 for player in players}}
+    return lambda: SnapshotManager.diff_weekly_votes(players, baseline), len(players)
+
+
+def bench_embed(payload: Dict[str, Any], work_dir: str, cached: bool = False) -> Tuple[Callable[[], Any], int]:
+    """Render ranking embeds of the top 10 players (every one rendered from scratch)."""
+    top_players = RankingProcessor().process_rankings(payload, max_count=10)
+    webhook = DiscordWebhook('http://localhost/webhook')
+    if not cached:
+        # A cache that keeps nothing, so every iteration renders
+        webhook.renderer = Renderer(DEFAULT_LOCALE, RenderCache(size=0))
+    date = datetime(2025, 1, 31)
+
+    def render():
+        for _ in range(EMBEDS_PER_MEASUREMENT):
+            webhook.create_embed("Top Voters", "Here are the top voters!", 3447003, top_players, date)
+
+    return render, EMBEDS_PER_MEASUREMENT
+
+
+def bench_embed_cached(payload: Dict[str, Any], work_dir: str) -> Tuple[Callable[[], Any], int]:
+    """Serve ranking embeds of the top 10 players from the shared render cache."""
+    return bench_embed(payload, work_dir, cached=True)
+
+
+BENCHMARKS: Dict[str, Benchmark] = {
+    'ranking': bench_ranking,
+    'ranking_views': bench_ranking_views,
+    'snapshot_save': bench_snapshot_save,
+    'snapshot_load': bench_snapshot_load,
+    'snapshot_diff': bench_snapshot_diff,
+    'embed': bench_embed,
+    'embed_cached': bench_embed_cached,
+}
+
+
+def measure(func: Callable[[], Any], repeat: int, memory: bool) -> Tuple[float, Optional[int]]:
+    """
+    Measure the best time of several calls and the peak memory of one call.
+
+    Memory is traced in a separate call because tracemalloc slows code down.
+
+    Args:
+        func: Function to measure
+        repeat: Number of timed calls
+        memory: Whether to measure peak memory
+
+    Returns:
+        tuple: (best_seconds, peak_bytes or None)
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            func()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return best, peak
+
+
+def run_benchmarks(
+    sizes: List[int],
+    names: List[str],
+    suffix_rate: float,
+    duplicate_rate: float,
+    repeat: int = 3,
+    memory: bool = True
+) -> List[Dict[str, Any]]:
+    """
+    Run the selected benchmarks for every payload size.
+
+    Args:
+        sizes: Player counts of the generated payloads
+        names: Benchmarks to run (keys of BENCHMARKS)
+        suffix_rate: Share of ~suffixed alternate accounts
+        duplicate_rate: Share of verbatim duplicate entries
+        repeat: Timed calls per measurement (the best one counts)
+        memory: Whether to measure peak memory
+
+    Returns:
+        list: One result dictionary per benchmark and size
+    """
+    results = []
+    for size in sizes:
+        payload = generate_payload(size, suffix_rate, duplicate_rate)
+        for name in names:
+            with tempfile.TemporaryDirectory() as work_dir:
+                func, items = BENCHMARKS[name](payload, work_dir)
+                seconds, peak = measure(func, repeat, memory)
+
+            result = {
+                'benchmark': name,
+                'players': size,
+                'items': items,
+                'seconds': seconds,
+                'items_per_second': items / seconds if seconds else None,
+                'peak_memory_bytes': peak,
+            }
+            results.append(result)
+            peak_text = f", peak {peak / 1024 / 1024:.1f} MiB" if peak is not None else ''
+            print(f"  {name:<14} {size:>10,} players: {seconds * 1000:10.2f} ms "
+                  f"({result['items_per_second']:,.0f} items/s{peak_text})")
+        del payload
+
+    return results
+
+
+def get_commit() -> Optional[str]:
+    """
+    Get the current git commit of the code being benchmarked.
+
+    Returns:
+        str or None: Short commit hash, None outside a git checkout
+    """
+    try:
+        result = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        return result.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: List[Dict[str, Any]], baseline_file: str):
+    """
+    Print the change of every result against a baseline results file.
+
+    Args:
+        results: Results of this run
+        baseline_file: JSON file written by an earlier run
+    """
+    with open(baseline_file, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    previous = {(r['benchmark'], r['players']): r for r in baseline['results']}
+    print(f"\n📊 Compared with {baseline_file} (commit {baseline['meta'].get('commit') or 'unknown'}):")
+    for result in results:
+        before = previous.get((result['benchmark'], result['players']))
+        if before is None:
+            continue
+        change = (result['seconds'] / before['seconds'] - 1) * 100
+        line = f"  {result['benchmark']:<14} {result['players']:>10,} players: time {change:+6.1f}%"
+        if result['peak_memory_bytes'] and before.get('peak_memory_bytes'):
+            memory_change = (result['peak_memory_bytes'] / before['peak_memory_bytes'] - 1) * 100
+            line += f", memory {memory_change:+6.1f}%"
+        print(line)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """
+    Parse command line arguments.
+
+    Args:
+        argv: Argument list (defaults to sys.argv)
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Benchmark ranking, snapshots and embeds on synthetic payloads.")
+    parser.add_argument('--sizes', default=DEFAULT_SIZES,
+                        help=f"comma-separated player counts, k/m suffixes allowed (default: {DEFAULT_SIZES})")
+    parser.add_argument('--benchmarks', default=','.join(BENCHMARKS),
+                        help="comma-separated benchmarks to run (default: all)")
+    parser.add_argument('--suffix-rate', type=float, default=0.1,
+                        help="share of ~suffixed alternate accounts (default: 0.1)")
+    parser.add_argument('--duplicate-rate', type=float, default=0.02,
+                        help="share of verbatim duplicate entries (default: 0.02)")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="timed calls per measurement, the best one counts (default: 3)")
+    parser.add_argument('--no-memory', action='store_true',
+                        help="skip the peak memory measurement (halves the run time)")
+    parser.add_argument('--output', metavar='FILE', help="write the results as JSON")
+    parser.add_argument('--compare', metavar='FILE', help="compare with the results of an earlier run")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    """Run the benchmark suite."""
+    args = parse_args(argv)
+    # Snapshot saves log every write; keep the output readable
+    logging.basicConfig(level=logging.WARNING)
+
+    sizes = [parse_size(size) for size in args.sizes.split(',')]
+    names = [name.strip() for name in args.benchmarks.split(',')]
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        print(f"Unknown benchmarks: {', '.join(unknown)} (available: {', '.join(BENCHMARKS)})")
+        return 1
+
+    print("🏁 Running benchmarks")
+    print("=" * 50)
+    results = run_benchmarks(sizes, names, args.suffix_rate, args.duplicate_rate,
+                             max(1, args.repeat), not args.no_memory)
+
+    report = {
+        'meta': {
+            'commit': get_commit(),
+            'created_at': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'suffix_rate': args.suffix_rate,
+            'duplicate_rate': args.duplicate_rate,
+            'repeat': args.repeat,
+        },
+        'results': results,
+    }
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Results written to {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+"""
+Clock module for capturing the run time once in a configured timezone.
+
+This module makes every part of a run agree on the same "now", independent of
+the host's timezone, and lets tests and simulations inject a fixed time.
+"""
+
+from datetime import datetime, tzinfo
+from typing import Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+
+def get_timezone(name: str) -> Optional[tzinfo]:
+    """
+    Resolve an IANA timezone name.
+
+    Args:
+        name: IANA timezone name (e.g., "Europe/Berlin"); empty for host local time
+
+    Returns:
+        tzinfo or None: The timezone, or None to use host local time
+
+    Raises:
+        ValueError: If the timezone name is unknown
+    """
+    if not name:
+        return None
+
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown timezone '{name}'")
+
+
+class RunClock:
+    """The time of a single run, captured once and passed through the pipeline."""
+
+    def __init__(self, timezone: Optional[tzinfo] = None, now: Optional[datetime] = None):
+        """
+        Capture the current time.
+
+        Args:
+            timezone: Timezone deciding what counts as today (None for host local time)
+            now: Fixed time to use instead of the system clock (for tests and simulations)
+        """
+        self.timezone = timezone
+        if now is None:
+            now = datetime.now(timezone)
+        elif timezone is not None and now.tzinfo is None:
+            now = now.replace(tzinfo=timezone)
+        self.now = now
+
+    @property
+    def today(self) -> datetime:
+        """Midnight of the current local date, without timezone information."""
+        return datetime(self.now.year, self.now.month, self.now.day)
+
+    def __repr__(self) -> str:
+        return f"RunClock({self.now.isoformat()})"
@@ -5,23 +5,249 @@ This module loads and manages configuration from environment variables.
 """
 
 import os
-from dotenv import load_dotenv
+import json
+import logging
+from dataclasses import dataclass, field, fields
+from datetime import datetime
+from typing import Any, Callable, Dict, Generic, Mapping, Optional, Sequence, Tuple, TypeVar
+from clock import get_timezone
 
-# Load environment variables from .env file
-load_dotenv()
+logger = logging.getLogger(__name__)
 
+# .env file next to the code
+ENV_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env')
 
+# (mtime_ns, size) identifying one version of a file, None if it doesn't exist
+FileSignature = Optional[Tuple[int, int]]
+
+# Parsed .env values and the version of .env they were parsed from
+_env_values: Optional[Dict[str, str]] = None
+_env_signature: FileSignature = None
+
+
+def get_file_signature(path: str) -> FileSignature:
+    """
+    Get the signature telling whether a file changed.
+
+    Args:
+        path: File path
+
+    Returns:
+        tuple or None: (mtime_ns, size), None if the file doesn't exist
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _read_env_cache(cache_file: str, signature: Tuple[int, int]) -> Optional[Dict[str, str]]:
+    """
+    Read cached .env values if the cache matches the current .env file.
+
+    Args:
+        cache_file: Path to the cache file
+        signature: Current signature of the .env file
+
+    Returns:
+        dict or None: Cached values, None if the cache is missing or stale
+    """
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if (cache.get('mtime_ns'), cache.get('size')) != signature:
+        return None
+    return cache.get('values')
+
+
+def _write_env_cache(cache_file: str, signature: Tuple[int, int], values: Dict[str, str]):
+    """
+    Write parsed .env values to the cache, readable by the owner only.
+
+    Args:
+        cache_file: Path to the cache file
+        signature: Signature of the parsed .env file
+        values: Parsed values
+    """
+    import tempfile
+
+    cache = {'mtime_ns': signature[0], 'size': signature[1], 'values': values}
+    directory = os.path.dirname(os.path.abspath(cache_file))
+    temp_file = None
+    try:
+        # A fresh file is created with mode 0600, so the webhook secret never sits in
+        # a file with older, wider permissions; os.replace swaps it in whole
+        fd, temp_file = tempfile.mkstemp(prefix='.env-cache-', suffix='.tmp', dir=directory)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+        os.replace(temp_file, cache_file)
+    except OSError:
+        # The cache is only an optimisation; the next run will parse .env again
+        if temp_file is not None and os.path.exists(temp_file):
+            os.remove(temp_file)
+
+
+def load_env() -> Dict[str, str]:
+    """
+    Get the values of the .env file, parsed again only when the file changed.
+
+    When CONFIG_CACHE_FILE is set, the parsed values are also cached on disk so
+    python-dotenv is only imported when .env changed since the last run.
+
+    Returns:
+        dict: Variables set in .env (empty if there is no .env file)
+    """
+    global _env_values, _env_signature
+    signature = get_file_signature(ENV_FILE)
+    if _env_values is not None and signature == _env_signature:
+        return _env_values
+
+    values: Optional[Dict[str, str]] = {}
+    if signature is not None:
+        cache_file = os.getenv('CONFIG_CACHE_FILE', '')
+        values = _read_env_cache(cache_file, signature) if cache_file else None
+        if values is None:
+            from dotenv import dotenv_values
+            values = {key: value for key, value in dotenv_values(ENV_FILE).items() if value is not None}
+            if cache_file:
+                _write_env_cache(cache_file, signature, values)
+
+    _env_values, _env_signature = values, signature
+    return values
+
+
+def get_environ() -> Dict[str, str]:
+    """
+    Get the environment the settings are read from.
+
+    Returns:
+        dict: .env values with the real environment variables taking precedence
+    """
+    return {**load_env(), **os.environ}
+
+
+def get_setting(name: str, default: str = '') -> str:
+    """
+    Get a setting that is not part of Config (command line defaults, profiling).
+
+    Args:
+        name: Environment variable name
+        default: Value used if neither the environment nor .env sets it
+
+    Returns:
+        str: Setting value
+    """
+    return get_environ().get(name, default)
+
+
+def get_int_setting(name: str, default: int) -> int:
+    """
+    Get an integer setting that is not part of Config.
+
+    Args:
+        name: Environment variable name
+        default: Value used if neither the environment nor .env sets it
+
+    Returns:
+        int: Setting value
+
+    Raises:
+        ValueError: If the value is not an integer
+    """
+    value = get_setting(name, '')
+    if value.strip() == '':
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer, got {value!r}")
+
+
+# Environment variable of each setting, if not the upper-cased field name
+ENV_NAMES = {
+    'name': 'BOT_NAME',
+    'webhook_url': 'DISCORD_WEBHOOK_URL',
+}
+
+
+@dataclass(frozen=True)
 class Config:
-    """Configuration class to manage environment variables."""
+    """Immutable, typed bot configuration."""
+
+    # Name identifying this server in logs (tenant name in multi-tenant mode)
+    name: str = 'default'
+    api_url: str = ''
+    webhook_url: str = field(default='', repr=False)  # Contains the webhook token
+    embed_color: int = 3447003  # Discord blue by default
+    embed_title: str = 'Top Voters'
+    embed_description: str = 'Here are the top voters!'
+    max_voters: int = 10
+    snapshots_dir: str = 'snapshots'
+    # IANA timezone deciding what counts as Sunday / month end (empty = host local time)
+    timezone: str = ''
+    # Daemon mode: daily run time (HH:MM) and optional extra interval in minutes
+    daemon_run_time: str = '23:55'
+    daemon_interval_minutes: int = 0
+    # Overlapping runs: skip, wait or takeover (see run_lock.py)
+    run_lock_policy: str = 'skip'
+    run_lock_timeout: int = 60
+    run_lock_stale_after: int = 600
+    # Vote spike alerts: admin channel (empty = log only), EW half-life and threshold
+    admin_webhook_url: str = field(default='', repr=False)
+    velocity_half_life_hours: float = 72.0
+    velocity_spike_threshold: float = 4.0
+    # Post month-over-month and hall-of-fame embeds after the month-end final (1 = on)
+    monthly_recap: int = 0
+    # JSONL file malformed API player rows are appended to (empty = count them only)
+    quarantine_file: str = ''
+    # Locale pack of the posts (see render.LOCALES)
+    locale: str = 'de'
 
-    def __init__(self):
-        """Initialize configuration from environment variables."""
-        self.api_url = os.getenv('API_URL', '')
-        self.webhook_url = os.getenv('DISCORD_WEBHOOK_URL', '')
-        self.embed_color = int(os.getenv('EMBED_COLOR', '3447003'))  # Discord blue by default
-        self.embed_title = os.getenv('EMBED_TITLE', 'Top Voters')
-        self.embed_description = os.getenv('EMBED_DESCRIPTION', 'Here are the top voters!')
-        self.max_voters = int(os.getenv('MAX_VOTERS', '10'))
+    @classmethod
+    def from_env(
+        cls,
+        environ: Mapping[str, str],
+        overrides: Optional[Dict[str, Any]] = None
+    ) -> 'Config':
+        """
+        Build a configuration from environment variables.
+
+        Args:
+            environ: Environment variables (e.g. os.environ merged over .env)
+            overrides: Values replacing the environment ones, keyed by field name
+                (e.g. one tenant's entry of a tenants file)
+
+        Returns:
+            Config: New configuration (not validated yet)
+
+        Raises:
+            ValueError: If an override key is unknown or a value has the wrong type
+        """
+        types = {config_field.name: config_field.type for config_field in fields(cls)}
+        values: Dict[str, Any] = {}
+
+        for name in types:
+            env_name = ENV_NAMES.get(name, name.upper())
+            if env_name in environ:
+                values[name] = environ[env_name]
+
+        for key, value in (overrides or {}).items():
+            if key not in types:
+                raise ValueError(f"Unknown configuration key '{key}'")
+            values[key] = value
+
+        for key, value in values.items():
+            try:
+                # Keep the field's type (int settings stay int)
+                values[key] = types[key](value)
+            except (TypeError, ValueError):
+                raise ValueError(f"Invalid value for '{key}': {value!r}")
+
+        return cls(**values)
 
     def validate(self):
         """
@@ -36,23 +262,120 @@ class Config:
         if not self.webhook_url:
             return False, "DISCORD_WEBHOOK_URL is not set in environment variables"
 
+        try:
+            get_timezone(self.timezone)
+        except ValueError as e:
+            return False, f"TIMEZONE is invalid: {e}"
+
+        if self.daemon_run_time:
+            try:
+                datetime.strptime(self.daemon_run_time, '%H:%M')
+            except ValueError:
+                return False, f"DAEMON_RUN_TIME must be in HH:MM format, got '{self.daemon_run_time}'"
+
+        if self.daemon_interval_minutes < 0:
+            return False, "DAEMON_INTERVAL_MINUTES must not be negative"
+
+        if self.velocity_half_life_hours <= 0 or self.velocity_spike_threshold <= 0:
+            return False, "VELOCITY_HALF_LIFE_HOURS and VELOCITY_SPIKE_THRESHOLD must be positive"
+
+        from run_lock import POLICIES
+        if self.run_lock_policy not in POLICIES:
+            return False, f"RUN_LOCK_POLICY must be one of {', '.join(POLICIES)}, got '{self.run_lock_policy}'"
+        from render import LOCALES
+        if self.locale not in LOCALES:
+            return False, f"LOCALE must be one of {', '.join(LOCALES)}, got '{self.locale}'"
+
         return True, ""
 
 
-def get_config():
+def get_config(overrides: Optional[Dict[str, Any]] = None) -> Config:
     """
     Get and validate configuration.
 
+    Variables set in the environment take precedence over the .env file.
+
+    Args:
+        overrides: Values replacing the environment ones, keyed by field name
+
     Returns:
-        Config: Configuration object
+        Config: Validated configuration
 
     Raises:
         ValueError: If configuration is invalid
     """
-    config = Config()
+    config = Config.from_env(get_environ(), overrides)
     is_valid, error_message = config.validate()
 
     if not is_valid:
         raise ValueError(f"Configuration error: {error_message}")
 
     return config
+
+
+T = TypeVar('T')
+
+
+class ConfigStore(Generic[T]):
+    """
+    Holds the last good configuration and reloads it when its source files change.
+
+    Readers take `current` once at the start of a run and keep using that object,
+    so a reload never changes the configuration of work already in flight.
+    """
+
+    def __init__(self, loader: Callable[[], T], source_files: Sequence[str]):
+        """
+        Load the initial configuration.
+
+        Args:
+            loader: Builds and validates the configuration, raising ValueError if invalid
+            source_files: Files the configuration is read from (missing files are allowed)
+
+        Raises:
+            ValueError: If the initial configuration is invalid
+        """
+        self.loader = loader
+        self.source_files = tuple(source_files)
+        self._signatures = self._get_signatures()
+        self._current = loader()
+
+    def _get_signatures(self) -> Tuple[FileSignature, ...]:
+        """
+        Get the current signature of every source file.
+
+        Returns:
+            tuple: One signature per source file
+        """
+        return tuple(get_file_signature(path) for path in self.source_files)
+
+    @property
+    def current(self) -> T:
+        """The last good configuration."""
+        return self._current
+
+    def reload_if_changed(self) -> bool:
+        """
+        Reload the configuration if a source file changed since the last check.
+
+        An invalid new configuration is logged and rejected; the last good one
+        stays in use and the same file version isn't retried.
+
+        Returns:
+            bool: True if a new configuration was swapped in
+        """
+        signatures = self._get_signatures()
+        if signatures == self._signatures:
+            return False
+        self._signatures = signatures
+
+        try:
+            config = self.loader()
+        except ValueError as e:
+            logger.error(f"Rejected changed configuration, keeping the last good one: {e}")
+            return False
+
+        # A single reference swap: readers see either the old or the new object
+        self._current = config
+        logger.info(f"Reloaded configuration from {', '.join(self.source_files)}")
+        return True
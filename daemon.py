@@ -0,0 +1,202 @@
+"""
+Daemon module for running the bot as a long-running process.
+
+This module keeps configuration, HTTP sessions and snapshot caches warm between
+runs and fires runs from an internal scheduler instead of relying on cron.
+"""
+
+import signal
+import threading
+import logging
+from datetime import datetime, timedelta, time, tzinfo
+from typing import Callable, List, NamedTuple, Optional, Tuple
+from clock import RunClock
+from schedule_manager import ScheduleManager
+
+logger = logging.getLogger(__name__)
+
+
+class DaemonScheduler:
+    """Computes the next fire time from the interval and calendar triggers."""
+
+    def __init__(self, run_time: Optional[time] = None, interval_minutes: int = 0):
+        """
+        Initialize the scheduler.
+
+        Args:
+            run_time: Time of day for daily, weekly and month-end runs (None disables them)
+            interval_minutes: Additional run every N minutes aligned to midnight (0 disables it)
+        """
+        if run_time is None and interval_minutes <= 0:
+            raise ValueError("Daemon needs DAEMON_RUN_TIME or DAEMON_INTERVAL_MINUTES to be set")
+
+        self.run_time = run_time
+        self.interval_minutes = interval_minutes
+
+    def _next_interval_run(self, now: datetime) -> datetime:
+        """
+        Get the next interval tick, aligned to midnight like a */N cron entry.
+
+        Args:
+            now: Current date and time
+
+        Returns:
+            datetime: Next interval tick strictly after now
+        """
+        midnight = datetime.combine(now.date(), time(), tzinfo=now.tzinfo)
+        minutes_since_midnight = int((now - midnight).total_seconds() // 60)
+        next_slot = (minutes_since_midnight // self.interval_minutes + 1) * self.interval_minutes
+        candidate = midnight + timedelta(minutes=next_slot)
+
+        # Intervals that don't divide a day evenly restart at midnight
+        next_midnight = midnight + timedelta(days=1)
+        return min(candidate, next_midnight)
+
+    def next_fire(self, now: datetime) -> Tuple[datetime, str]:
+        """
+        Get the next time the daemon should run.
+
+        Args:
+            now: Current date and time
+
+        Returns:
+            tuple: (fire_time, reason) - earliest trigger and what caused it
+        """
+        candidates: List[Tuple[datetime, str]] = []
+
+        if self.interval_minutes > 0:
+            candidates.append((self._next_interval_run(now), 'interval'))
+
+        if self.run_time is not None:
+            # Listed from most to least specific so ties keep the specific reason
+            candidates.append((ScheduleManager.get_next_month_end_run(now, self.run_time), 'month_end'))
+            candidates.append((ScheduleManager.get_next_weekly_run(now, self.run_time), 'weekly'))
+            candidates.append((ScheduleManager.get_next_daily_run(now, self.run_time), 'daily'))
+
+        return min(candidates, key=lambda candidate: candidate[0])
+
+
+class ScheduledJob(NamedTuple):
+    """A run callback together with the schedule that fires it."""
+    name: str
+    scheduler: DaemonScheduler
+    run_callback: Callable[[], int]
+    timezone: Optional[tzinfo] = None   # Timezone the run times refer to (None for host local time)
+
+
+class Daemon:
+    """Runs scheduled jobs whenever their scheduler fires until asked to stop."""
+
+    def __init__(
+        self,
+        jobs: List[ScheduledJob],
+        reload: Optional[Callable[[], Optional[List[ScheduledJob]]]] = None,
+        reload_interval: float = 60.0
+    ):
+        """
+        Initialize the daemon.
+
+        Args:
+            jobs: Jobs to run, each with its own schedule and timezone
+            reload: Called between runs; returns new jobs after a configuration
+                change, None if nothing changed
+            reload_interval: Maximum seconds between two reload checks
+        """
+        if not jobs:
+            raise ValueError("Daemon needs at least one scheduled job")
+
+        self.jobs = jobs
+        self.reload = reload
+        self.reload_interval = reload_interval
+        self._stop_event = threading.Event()
+
+    def request_stop(self, signum: Optional[int] = None, frame=None):
+        """
+        Ask the daemon to stop after the current run (usable as a signal handler).
+
+        Args:
+            signum: Signal number when called as a signal handler
+            frame: Current stack frame when called as a signal handler
+        """
+        if signum is not None:
+            logger.info(f"Received signal {signal.Signals(signum).name}, shutting down...")
+        self._stop_event.set()
+
+    def install_signal_handlers(self):
+        """Stop gracefully on SIGTERM and SIGINT."""
+        signal.signal(signal.SIGTERM, self.request_stop)
+        signal.signal(signal.SIGINT, self.request_stop)
+
+    def _next_fire_times(self) -> List[Tuple[float, datetime, str, ScheduledJob]]:
+        """
+        Get the next fire time of every job.
+
+        Returns:
+            list: (timestamp, fire_time, reason, job) sorted by timestamp
+        """
+        fire_times = []
+        for job in self.jobs:
+            fire_at, reason = job.scheduler.next_fire(RunClock(job.timezone).now)
+            fire_times.append((fire_at.timestamp(), fire_at, reason, job))
+        return sorted(fire_times, key=lambda fire_time: fire_time[0])
+
+    def _reload_jobs(self):
+        """Swap in new jobs if the configuration changed (only called between runs)."""
+        if self.reload is None:
+            return
+
+        try:
+            jobs = self.reload()
+        except Exception as e:
+            logger.error(f"Configuration reload failed, keeping the current jobs: {e}")
+            return
+
+        if jobs:
+            self.jobs = jobs
+            logger.info(f"Configuration changed, now running {len(jobs)} scheduled job(s)")
+
+    def run(self) -> int:
+        """
+        Run the scheduling loop until stopped.
+
+        Returns:
+            int: Highest exit code of the last runs (0 if no run happened)
+        """
+        exit_code = 0
+        logger.info(f"Daemon started with {len(self.jobs)} scheduled job(s)")
+
+        announced = None
+
+        while not self._stop_event.is_set():
+            self._reload_jobs()
+            fire_times = self._next_fire_times()
+            next_timestamp, fire_at, reason, job = fire_times[0]
+            if announced != (next_timestamp, job.name):
+                announced = (next_timestamp, job.name)
+                logger.info(f"Next run at {fire_at.strftime('%Y-%m-%d %H:%M %Z').strip()} ({job.name}: {reason})")
+
+            # Sleep until the next trigger; returns early when a stop is requested.
+            # Timestamps give the real duration even across a DST change.
+            now_timestamp = RunClock().now.timestamp()
+            timeout = max(0.0, next_timestamp - now_timestamp)
+            if self.reload is not None:
+                # Wake up regularly to pick up configuration changes
+                timeout = min(timeout, self.reload_interval)
+            if self._stop_event.wait(timeout=timeout):
+                break
+
+            # Not due yet: early wake-up for a reload check, or wall clock adjusted backwards
+            now_timestamp = RunClock().now.timestamp()
+            if now_timestamp < next_timestamp:
+                continue
+
+            # Run every job that is due by now
+            exit_codes = [
+                due_job.run_callback()
+                for timestamp, _, _, due_job in fire_times
+                if timestamp <= now_timestamp
+            ]
+            exit_code = max(exit_codes)
+
+        logger.info("Daemon stopped")
+        return exit_code
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Export module streaming leaderboard history to CSV or JSONL.
+
+Snapshots are read one at a time and turned into rows (date, player, votes,
+weekly delta, rank) by a chain of generators, so memory stays at about one
+snapshot however long the history is. A cursor file records the last row
+written and the output size at that point; an interrupted export cuts the
+output back to that size (dropping rows written after the cursor) and
+resumes right after it:
+
+    python export.py --format csv --output history.csv
+    python export.py --format jsonl --from 2025-01-01 --to 2025-03-31 --player Alice
+    python export.py --format csv --output history.csv --cursor-file history.cursor
+"""
+
+import os
+import sys
+import csv
+import json
+import logging
+import argparse
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+from config import get_setting
+from history import normalize_name
+
+logger = logging.getLogger(__name__)
+
+# Columns of an exported row
+FIELDS = ['date', 'player', 'votes', 'weekly_delta', 'rank']
+
+# Formats and their writers (see write_rows)
+FORMATS = ('csv', 'jsonl')
+
+
+def iter_snapshots(
+    snapshots_dir: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None
+) -> Iterator[Tuple[datetime, Dict[str, int]]]:
+    """
+    Yield the snapshots of a date range, oldest first, one at a time.
+
+    The snapshot right before the range is yielded too, as the baseline of
+    the first weekly delta.
+
+    Args:
+        snapshots_dir: Directory of the snapshot files
+        start: First date (inclusive), None for the oldest snapshot
+        end: Last date (inclusive), None for the newest snapshot
+
+    Yields:
+        tuple: (snapshot_date, votes keyed by player name)
+    """
+    from snapshot_manager import SnapshotManager
+
+    manager = SnapshotManager(snapshots_dir)
+    dates = [date for date in manager.get_snapshot_dates() if end is None or date <= end]
+    first = 0
+    if start is not None:
+        first = next((i for i, date in enumerate(dates) if date >= start), len(dates))
+    for date in dates[max(0, first - 1):]:
+        snapshot = manager.load_snapshot(date, cache=False)
+        if snapshot:
+            yield date, snapshot['players']
+
+
+def iter_rows(
+    snapshots: Iterable[Tuple[datetime, Dict[str, int]]],
+    start: Optional[datetime] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Turn snapshots into ranked rows with weekly deltas.
+
+    Votes reset on the 1st, so the first snapshot of a month counts from zero.
+
+    Args:
+        snapshots: (snapshot_date, players) pairs, oldest first
+        start: Snapshots before this date only serve as the delta baseline
+
+    Yields:
+        dict: Row with date, player, votes, weekly_delta and rank
+    """
+    previous_date, previous = None, {}
+    for date, players in snapshots:
+        same_month = previous_date is not None and (previous_date.year, previous_date.month) == (date.year, date.month)
+        if start is None or date >= start:
+            day = date.strftime('%Y-%m-%d')
+            ranked = sorted(players.items(), key=lambda item: item[1], reverse=True)
+            for rank, (name, votes) in enumerate(ranked, start=1):
+                yield {
+                    'date': day,
+                    'player': name,
+                    'votes': votes,
+                    'weekly_delta': votes - previous.get(name, 0) if same_month else votes,
+                    'rank': rank,
+                }
+        previous_date, previous = date, players
+
+
+def filter_players(rows: Iterable[Dict[str, Any]], players: List[str]) -> Iterator[Dict[str, Any]]:
+    """
+    Keep the rows of some players.
+
+    Args:
+        rows: Exported rows
+        players: Player names (any case, ~suffix ignored); empty keeps every row
+
+    Yields:
+        dict: Rows of the given players
+    """
+    if not players:
+        yield from rows
+        return
+    wanted = {normalize_name(name) for name in players}
+    for row in rows:
+        if normalize_name(row['player']) in wanted:
+            yield row
+
+
+def row_cursor(row: Dict[str, Any]) -> str:
+    """
+    Get the cursor of a row.
+
+    Args:
+        row: Exported row
+
+    Returns:
+        str: Snapshot date and rank, e.g. 2025-01-05#37
+    """
+    return f"{row['date']}#{row['rank']}"
+
+
+def skip_through(rows: Iterable[Dict[str, Any]], cursor: Optional[str]) -> Iterator[Dict[str, Any]]:
+    """
+    Drop the rows up to and including a cursor.
+
+    Args:
+        rows: Exported rows, in export order
+        cursor: Cursor of the last row already written, None to keep every row
+
+    Yields:
+        dict: Rows after the cursor
+    """
+    if not cursor:
+        yield from rows
+        return
+    day, rank = cursor.split('#')
+    position = (day, int(rank))
+    for row in rows:
+        if (row['date'], row['rank']) > position:
+            yield row
+
+
+def write_cursor(cursor_file: str, cursor: str, offset: Optional[int] = None):
+    """
+    Record the last row written, replacing the old cursor in one step.
+
+    Args:
+        cursor_file: Path to the cursor file
+        cursor: Cursor of the last row written
+        offset: Output position right after that row (None if the output can't seek)
+    """
+    temp_file = f"{cursor_file}.tmp"
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        f.write(cursor if offset is None else f"{cursor} {offset}")
+    os.replace(temp_file, cursor_file)
+
+
+def read_cursor(cursor_file: str) -> Tuple[Optional[str], Optional[int]]:
+    """
+    Read a cursor file.
+
+    Args:
+        cursor_file: Path to the cursor file
+
+    Returns:
+        tuple: (cursor, output position), None for what the file doesn't hold
+    """
+    if not os.path.exists(cursor_file):
+        return None, None
+    with open(cursor_file, 'r', encoding='utf-8') as f:
+        parts = f.read().split()
+    if not parts:
+        return None, None
+    return parts[0], int(parts[1]) if len(parts) > 1 else None
+
+
+def write_rows(
+    rows: Iterable[Dict[str, Any]],
+    output: TextIO,
+    fmt: str = 'csv',
+    header: bool = True,
+    cursor_file: Optional[str] = None
+) -> int:
+    """
+    Stream rows to an output, recording the cursor after every snapshot.
+
+    The cursor is recorded with the output position after its row, so a
+    resumed export can drop the rows written after it (see main).
+
+    Args:
+        rows: Exported rows
+        output: Text stream to write to
+        fmt: csv or jsonl
+        header: Write the CSV header line
+        cursor_file: File recording the last row written (None to skip)
+
+    Returns:
+        int: Number of rows written
+    """
+    writer = csv.DictWriter(output, fieldnames=FIELDS) if fmt == 'csv' else None
+    if writer is not None and header:
+        writer.writeheader()
+
+    seekable = output.seekable()
+    count = 0
+    last = None
+    for row in rows:
+        if cursor_file and last is not None and last['date'] != row['date']:
+            # The output must hold a row before the cursor points past it
+            output.flush()
+            write_cursor(cursor_file, row_cursor(last), output.tell() if seekable else None)
+        if writer is not None:
+            writer.writerow(row)
+        else:
+            output.write(json.dumps(row, ensure_ascii=False) + '\n')
+        last = row
+        count += 1
+
+    output.flush()
+    if cursor_file and last is not None:
+        write_cursor(cursor_file, row_cursor(last), output.tell() if seekable else None)
+    return count
+
+
+def export(
+    snapshots_dir: str,
+    output: TextIO,
+    fmt: str = 'csv',
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    players: Optional[List[str]] = None,
+    cursor: Optional[str] = None,
+    cursor_file: Optional[str] = None
+) -> int:
+    """
+    Export the snapshot history of a date range.
+
+    Args:
+        snapshots_dir: Directory of the snapshot files
+        output: Text stream to write to
+        fmt: csv or jsonl
+        start: First date (inclusive)
+        end: Last date (inclusive)
+        players: Only these players (empty for all)
+        cursor: Resume after this cursor (no CSV header is written then)
+        cursor_file: File recording the last row written
+
+    Returns:
+        int: Number of rows written
+
+    Raises:
+        ValueError: If the format is unknown
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}' (use {', '.join(FORMATS)})")
+
+    rows = iter_rows(iter_snapshots(snapshots_dir, start, end), start)
+    rows = skip_through(filter_players(rows, players or []), cursor)
+    return write_rows(rows, output, fmt, header=not cursor, cursor_file=cursor_file)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """
+    Parse command line arguments.
+
+    Args:
+        argv: Argument list (defaults to sys.argv)
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Stream the snapshot history to CSV or JSONL.")
+    parser.add_argument('--format', choices=FORMATS, default='csv', help="output format (default: csv)")
+    parser.add_argument('--output', metavar='FILE', help="output file (default: stdout)")
+    parser.add_argument('--from', dest='start', type=datetime.fromisoformat, help="first date (YYYY-MM-DD)")
+    parser.add_argument('--to', dest='end', type=datetime.fromisoformat, help="last date (YYYY-MM-DD)")
+    parser.add_argument('--player', action='append', default=[], help="only this player (repeatable)")
+    parser.add_argument('--snapshots-dir', default=get_setting('SNAPSHOTS_DIR', 'snapshots'),
+                        help="snapshots directory (default: SNAPSHOTS_DIR or snapshots)")
+    parser.add_argument('--cursor', help="resume after this cursor (DATE#RANK, as printed by an earlier export)")
+    parser.add_argument('--cursor-file', metavar='FILE',
+                        help="record progress here and resume from it; the output file is appended to")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    """Run the export."""
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+
+    cursor, offset = args.cursor, None
+    if not cursor and args.cursor_file:
+        cursor, offset = read_cursor(args.cursor_file)
+
+    if args.output:
+        with open(args.output, 'a' if cursor else 'w', encoding='utf-8', newline='') as output:
+            if offset is not None:
+                # Drop rows written after the cursor by the interrupted export
+                output.seek(offset)
+                output.truncate()
+            count = export(args.snapshots_dir, output, args.format, args.start, args.end,
+                           args.player, cursor, args.cursor_file)
+        print(f"💾 Exported {count} rows to {args.output}" + (f" (resumed after {cursor})" if cursor else ''))
+    else:
+        export(args.snapshots_dir, sys.stdout, args.format, args.start, args.end,
+               args.player, cursor, args.cursor_file)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
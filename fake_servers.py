@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""
+Fake Servers module with local stand-ins for the TopGames API and Discord.
+
+FakeTopGamesAPI serves synthetic or recorded players-ranking responses with
+configurable latency, ETag support and error injection. FakeDiscordWebhook
+enforces Discord's payload limits and answers with 429 and rate-limit headers
+like the real webhook endpoint. Both run on stdlib http.server threads, so the
+bot can be tested end to end without network access:
+
+    python fake_servers.py serve --players 10000 --latency 0.05 --error-rate 0.1
+    python fake_servers.py load --requests 2000 --concurrency 32
+"""
+
+import sys
+import json
+import time
+import random
+import hashlib
+import argparse
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from synthetic_data import generate_payload
+
+logger = logging.getLogger(__name__)
+
+# Discord limits (https://discord.com/developers/docs/resources/message#embed-object-embed-limits)
+MAX_CONTENT_LENGTH = 2000
+MAX_EMBEDS = 10
+MAX_EMBED_TOTAL = 6000
+MAX_FIELDS = 25
+EMBED_TEXT_LIMITS = {'title': 256, 'description': 4096}
+FIELD_LIMITS = {'name': 256, 'value': 1024}
+FOOTER_TEXT_LIMIT = 2048
+AUTHOR_NAME_LIMIT = 256
+
+
+class FakeServer:
+    """Base class running a request handler on a local port in a background thread."""
+
+    def __init__(self, port: int = 0, host: str = '127.0.0.1'):
+        """
+        Initialize the server.
+
+        Args:
+            port: Port to listen on (0 picks a free port)
+            host: Interface to bind
+        """
+        self.host = host
+        self.port = port
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        return f"http://{self.host}:{self.port}"
+
+    def handle(self, method: str, path: str, headers: Dict[str, str], body: bytes) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        Answer a request.
+
+        Args:
+            method: HTTP method
+            path: Request path
+            headers: Request headers
+            body: Request body
+
+        Returns:
+            tuple: (status, headers, body) of the response
+        """
+        raise NotImplementedError
+
+    def start(self) -> 'FakeServer':
+        """
+        Start serving in a background thread.
+
+        Returns:
+            FakeServer: self, for chaining
+        """
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def _respond(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else b''
+                status, headers, response_body = fake.handle(self.command, self.path, dict(self.headers), body)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(response_body)))
+                self.end_headers()
+                self.wfile.write(response_body)
+
+            do_GET = do_POST = _respond
+
+            def log_message(self, format, *args):
+                logger.debug(f"{type(fake).__name__}: {format % args}")
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, name=type(self).__name__, daemon=True).start()
+        logger.info(f"{type(self).__name__} listening on {self.url}")
+        return self
+
+    def stop(self):
+        """Stop serving."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> 'FakeServer':
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+class FakeTopGamesAPI(FakeServer):
+    """Serves players-ranking responses with latency, ETags and injected errors."""
+
+    def __init__(
+        self,
+        payload: Optional[Dict[str, Any]] = None,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        timeout_rate: float = 0.0,
+        invalid_json_rate: float = 0.0,
+        port: int = 0,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize the fake API.
+
+        Args:
+            payload: Response to serve (synthetic 1000-player payload if omitted)
+            latency: Seconds added to every response
+            error_rate: Share of requests answered with 500/502/503
+            timeout_rate: Share of requests stalled for 30 seconds
+            invalid_json_rate: Share of requests answered with a truncated body
+            port: Port to listen on (0 picks a free port)
+            seed: Random seed for error injection
+        """
+        super().__init__(port)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.invalid_json_rate = invalid_json_rate
+        self.requests = 0
+        self._random = random.Random(seed)
+        self.set_payload(payload if payload is not None else generate_payload(1000))
+
+    def set_payload(self, payload: Dict[str, Any]):
+        """
+        Replace the served response (e.g. to simulate new votes).
+
+        Args:
+            payload: New API response
+        """
+        body = json.dumps(payload).encode('utf-8')
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        with self._lock:
+            self.payload, self._body, self._etag = payload, body, etag
+
+    def handle(self, method, path, headers, body):
+        with self._lock:
+            self.requests += 1
+            roll = self._random.random()
+            response_body, etag = self._body, self._etag
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        if roll < self.timeout_rate:
+            time.sleep(30)
+        roll -= self.timeout_rate
+        if roll < self.error_rate:
+            status = self._random.choice([500, 502, 503])
+            return status, {'Content-Type': 'application/json'}, json.dumps({'code': status, 'success': False}).encode()
+        roll -= self.error_rate
+        if roll < self.invalid_json_rate:
+            return 200, {'Content-Type': 'application/json'}, response_body[:len(response_body) // 2]
+
+        if headers.get('If-None-Match') == etag:
+            return 304, {'ETag': etag}, b''
+        return 200, {'Content-Type': 'application/json', 'ETag': etag}, response_body
+
+
+def validate_discord_payload(payload: Any) -> List[str]:
+    """
+    Check a webhook payload against Discord's limits.
+
+    Args:
+        payload: Decoded JSON request body
+
+    Returns:
+        list: Violations (empty if Discord would accept the payload)
+    """
+    if not isinstance(payload, dict):
+        return ["Payload must be a JSON object"]
+
+    errors = []
+    content = payload.get('content') or ''
+    embeds = payload.get('embeds') or []
+    if not content and not embeds:
+        errors.append("Cannot send an empty message")
+    if len(content) > MAX_CONTENT_LENGTH:
+        errors.append(f"content: must be {MAX_CONTENT_LENGTH} or fewer characters")
+    if len(embeds) > MAX_EMBEDS:
+        errors.append(f"embeds: must be {MAX_EMBEDS} or fewer items")
+
+    total = 0
+    for index, embed in enumerate(embeds):
+        for key, limit in EMBED_TEXT_LIMITS.items():
+            text = embed.get(key) or ''
+            total += len(text)
+            if len(text) > limit:
+                errors.append(f"embeds.{index}.{key}: must be {limit} or fewer characters")
+
+        fields = embed.get('fields') or []
+        if len(fields) > MAX_FIELDS:
+            errors.append(f"embeds.{index}.fields: must be {MAX_FIELDS} or fewer items")
+        for field_index, field in enumerate(fields):
+            for key, limit in FIELD_LIMITS.items():
+                text = str(field.get(key) or '')
+                total += len(text)
+                if not text:
+                    errors.append(f"embeds.{index}.fields.{field_index}.{key}: required")
+                elif len(text) > limit:
+                    errors.append(f"embeds.{index}.fields.{field_index}.{key}: must be {limit} or fewer characters")
+
+        footer_text = (embed.get('footer') or {}).get('text') or ''
+        author_name = (embed.get('author') or {}).get('name') or ''
+        total += len(footer_text) + len(author_name)
+        if len(footer_text) > FOOTER_TEXT_LIMIT:
+            errors.append(f"embeds.{index}.footer.text: must be {FOOTER_TEXT_LIMIT} or fewer characters")
+        if len(author_name) > AUTHOR_NAME_LIMIT:
+            errors.append(f"embeds.{index}.author.name: must be {AUTHOR_NAME_LIMIT} or fewer characters")
+
+    if total > MAX_EMBED_TOTAL:
+        errors.append(f"embeds: combined size must be {MAX_EMBED_TOTAL} or fewer characters")
+    return errors
+
+
+class FakeDiscordWebhook(FakeServer):
+    """Accepts webhook posts within Discord's limits and rate-limits like Discord."""
+
+    def __init__(self, rate_limit: int = 5, rate_window: float = 2.0, latency: float = 0.0, port: int = 0):
+        """
+        Initialize the fake webhook.
+
+        Args:
+            rate_limit: Requests allowed per window (Discord webhooks allow 5 per 2 seconds)
+            rate_window: Window length in seconds
+            latency: Seconds added to every response
+            port: Port to listen on (0 picks a free port)
+        """
+        super().__init__(port)
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.latency = latency
+        self.received: List[Dict[str, Any]] = []
+        self.rejected = 0
+        self.rate_limited = 0
+        self._window_start = time.monotonic()
+        self._window_count = 0
+
+    def handle(self, method, path, headers, body):
+        if self.latency:
+            time.sleep(self.latency)
+        if method != 'POST':
+            return 405, {'Content-Type': 'application/json'}, b'{"message": "405: Method Not Allowed", "code": 0}'
+
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_start >= self.rate_window:
+                self._window_start, self._window_count = now, 0
+            reset_after = self.rate_window - (now - self._window_start)
+            rate_headers = {
+                'X-RateLimit-Limit': str(self.rate_limit),
+                'X-RateLimit-Remaining': str(max(0, self.rate_limit - self._window_count - 1)),
+                'X-RateLimit-Reset': f"{time.time() + reset_after:.3f}",
+                'X-RateLimit-Reset-After': f"{reset_after:.3f}",
+                'X-RateLimit-Bucket': 'fake-webhook-bucket',
+            }
+            if self._window_count >= self.rate_limit:
+                self.rate_limited += 1
+                error = {'message': 'You are being rate limited.', 'retry_after': round(reset_after, 3), 'global': False}
+                rate_headers.update({'Retry-After': f"{reset_after:.3f}", 'X-RateLimit-Scope': 'user',
+                                     'Content-Type': 'application/json'})
+                return 429, rate_headers, json.dumps(error).encode()
+            self._window_count += 1
+
+        try:
+            payload = json.loads(body or b'null')
+        except ValueError:
+            payload, errors = None, ["The request body contains invalid JSON."]
+        else:
+            errors = validate_discord_payload(payload)
+
+        if errors:
+            with self._lock:
+                self.rejected += 1
+            error = {'message': 'Invalid Form Body', 'code': 50035, 'errors': errors}
+            return 400, {**rate_headers, 'Content-Type': 'application/json'}, json.dumps(error).encode()
+
+        with self._lock:
+            self.received.append(payload)
+        return 204, rate_headers, b''
+
+
+def run_load(
+    api: FakeTopGamesAPI,
+    discord: FakeDiscordWebhook,
+    total_requests: int,
+    concurrency: int
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Stress APIClient and DiscordWebhook with concurrent requests.
+
+    Args:
+        api: Running fake API
+        discord: Running fake webhook
+        total_requests: Requests sent to each server
+        concurrency: Worker threads sharing one connection pool
+
+    Returns:
+        dict: Per target: requests/s, latency percentiles and error counts
+    """
+    from api_client import APIClient
+    from ranking import get_top_rankings
+    from tenants import create_shared_session
+    from webhook import DiscordWebhook
+
+    session = create_shared_session(concurrency)
+    client = APIClient(f"{api.url}/players-ranking", session=session)
+    webhook = DiscordWebhook(f"{discord.url}/api/webhooks/1/token", session=session)
+    top_players = get_top_rankings(api.payload, 10)
+    embed = webhook.create_embed("Top Voters", "Load test", 3447003, top_players)
+
+    def timed(call):
+        started = time.perf_counter()
+        try:
+            call()
+            return time.perf_counter() - started, None
+        except Exception as e:
+            return time.perf_counter() - started, type(e).__name__
+
+    report = {}
+    try:
+        for target, call in (('api', client.fetch_voters), ('discord', lambda: webhook.send_embed(embed))):
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                outcomes = list(executor.map(lambda _: timed(call), range(total_requests)))
+            elapsed = time.perf_counter() - started
+
+            latencies = sorted(latency for latency, _ in outcomes)
+            errors: Dict[str, int] = {}
+            for _, error in outcomes:
+                if error:
+                    errors[error] = errors.get(error, 0) + 1
+            report[target] = {
+                'requests': total_requests,
+                'requests_per_second': total_requests / elapsed,
+                'p50_ms': latencies[len(latencies) // 2] * 1000,
+                'p95_ms': latencies[int(len(latencies) * 0.95)] * 1000,
+                'p99_ms': latencies[int(len(latencies) * 0.99)] * 1000,
+                'errors': errors,
+            }
+    finally:
+        session.close()
+
+    report['discord']['rate_limited'] = discord.rate_limited
+    report['discord']['rejected'] = discord.rejected
+    return report
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """
+    Parse command line arguments.
+
+    Args:
+        argv: Argument list (defaults to sys.argv)
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Run local stand-ins for the TopGames API and Discord.")
+    parser.add_argument('mode', choices=['serve', 'load'], help="serve until Ctrl+C, or run the load generator")
+    parser.add_argument('--api-port', type=int, default=8081, help="fake TopGames API port (default: 8081)")
+    parser.add_argument('--discord-port', type=int, default=8082, help="fake Discord webhook port (default: 8082)")
+    parser.add_argument('--players', type=int, default=1000, help="players in the synthetic response (default: 1000)")
+    parser.add_argument('--recorded', metavar='FILE', help="serve this recorded API response instead")
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="share of API requests failing with 5xx")
+    parser.add_argument('--timeout-rate', type=float, default=0.0, help="share of API requests stalling for 30s")
+    parser.add_argument('--invalid-json-rate', type=float, default=0.0, help="share of truncated API responses")
+    parser.add_argument('--rate-limit', type=int, default=5, help="webhook requests per window (default: 5)")
+    parser.add_argument('--rate-window', type=float, default=2.0, help="webhook rate-limit window in seconds")
+    parser.add_argument('--requests', type=int, default=1000, help="load mode: requests per server")
+    parser.add_argument('--concurrency', type=int, default=16, help="load mode: concurrent workers")
+    parser.add_argument('--seed', type=int, help="random seed for error injection")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    """Run the fake servers or the load generator."""
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if args.recorded:
+        with open(args.recorded, 'r', encoding='utf-8') as f:
+            payload = json.load(f)
+    else:
+        payload = generate_payload(args.players)
+
+    api = FakeTopGamesAPI(payload, args.latency, args.error_rate, args.timeout_rate,
+                          args.invalid_json_rate, args.api_port, args.seed)
+    discord = FakeDiscordWebhook(args.rate_limit, args.rate_window, port=args.discord_port)
+
+    with api, discord:
+        if args.mode == 'load':
+            # Consolidation details of the synthetic payload would drown the report
+            logging.getLogger('ranking').setLevel(logging.WARNING)
+            report = run_load(api, discord, args.requests, args.concurrency)
+            print(json.dumps(report, indent=2))
+            return 0
+
+        print(f"API_URL={api.url}/players-ranking")
+        print(f"DISCORD_WEBHOOK_URL={discord.url}/api/webhooks/1/token")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+History module answering how a player voted over time.
+
+Every snapshot saved by SnapshotManager is also added to an index mapping
+each normalized player name to their (snapshot date, votes, rank) entries,
+so a player's history is one dictionary lookup instead of a scan of every
+snapshot file. If the index file is missing when a snapshot is saved (e.g.
+after an upgrade), it is built from the snapshots on disk first. The index
+keeps entries of snapshots removed by the cleanup:
+
+    python history.py "Player Name"
+    python history.py "Player Name" --months 6 --json
+    python history.py --reindex
+"""
+
+import os
+import sys
+import json
+import bisect
+import logging
+import argparse
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from config import get_setting
+
+logger = logging.getLogger(__name__)
+
+# History index file name inside a snapshots directory
+HISTORY_INDEX_FILENAME = 'history_index.json'
+
+
+def normalize_name(playername: str) -> str:
+    """
+    Get the index key of a player name.
+
+    Alternate accounts (name~suffix) and case differences map to the same key.
+
+    Args:
+        playername: Player name as shown in rankings or typed by a user
+
+    Returns:
+        str: Index key
+    """
+    return playername.split('~')[0].strip().casefold()
+
+
+class HistoryIndex:
+    """Per-player vote and rank history across snapshots."""
+
+    def __init__(self, index_file: str = os.path.join("snapshots", HISTORY_INDEX_FILENAME),
+                 snapshots_dir: Optional[str] = None):
+        """
+        Initialize the index and load it.
+
+        Args:
+            index_file: Path to the JSON file storing the index
+            snapshots_dir: Snapshot directory to index if the index file doesn't
+                exist yet (e.g. the first save after an upgrade)
+        """
+        self.index_file = index_file
+        # Entries [date as YYYYMMDD, votes, rank] per normalized name, sorted by date
+        self._players: Dict[str, List[list]] = self._load()
+        self._lock = threading.Lock()
+        if snapshots_dir is not None and not os.path.exists(index_file):
+            count = self.reindex(snapshots_dir)
+            logger.info(f"Built history index from {count} existing snapshots in {snapshots_dir}")
+
+    def _load(self) -> Dict[str, List[list]]:
+        """
+        Load the index from disk.
+
+        Returns:
+            dict: Entries per normalized name (empty if missing or unreadable)
+        """
+        if not os.path.exists(self.index_file):
+            return {}
+
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"Failed to load history index {self.index_file}: {e}")
+            return {}
+
+    def _save(self):
+        """Write the index to disk, replacing the old file in one step."""
+        directory = os.path.dirname(self.index_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        temp_file = f"{self.index_file}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(self._players, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temp_file, self.index_file)
+
+    def add_snapshot(self, date: datetime, players: Dict[str, int], save: bool = True):
+        """
+        Add (or replace) the entries of one snapshot.
+
+        Args:
+            date: Date of the snapshot
+            players: Votes keyed by player name, as stored in the snapshot
+            save: Whether to write the index right away
+        """
+        key = date.strftime('%Y%m%d')
+        ranked = sorted(players.items(), key=lambda item: item[1], reverse=True)
+
+        with self._lock:
+            for rank, (name, votes) in enumerate(ranked, start=1):
+                entries = self._players.setdefault(normalize_name(name), [])
+                entry = [key, votes, rank]
+                if not entries or entries[-1][0] < key:
+                    # Snapshots are usually saved in date order
+                    entries.append(entry)
+                    continue
+                position = bisect.bisect_left(entries, [key])
+                if position < len(entries) and entries[position][0] == key:
+                    entries[position] = entry
+                else:
+                    entries.insert(position, entry)
+            if save:
+                self._save()
+
+    def save(self):
+        """Write the index to disk."""
+        with self._lock:
+            self._save()
+
+    def lookup(self, playername: str, since: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        Get a player's history.
+
+        Weekly deltas are the votes gained since the previous snapshot; votes
+        reset on the 1st, so the first snapshot of a month counts from zero.
+
+        Args:
+            playername: Player name (any case, with or without ~suffix)
+            since: Ignore snapshots before this date
+
+        Returns:
+            list: Entries with date, votes, rank and weekly_delta, oldest first
+        """
+        entries = self._players.get(normalize_name(playername), [])
+        start = 0
+        if since is not None:
+            start = bisect.bisect_left(entries, [since.strftime('%Y%m%d')])
+
+        history = []
+        previous = entries[start - 1] if start > 0 else None
+        for key, votes, rank in entries[start:]:
+            same_month = previous is not None and previous[0][:6] == key[:6]
+            history.append({
+                'date': f"{key[:4]}-{key[4:6]}-{key[6:]}",
+                'votes': votes,
+                'rank': rank,
+                'weekly_delta': votes - previous[1] if same_month else votes,
+            })
+            previous = (key, votes)
+        return history
+
+    def reindex(self, snapshots_dir: str) -> int:
+        """
+        Add every snapshot on disk to the index (e.g. snapshots saved before it existed).
+
+        Args:
+            snapshots_dir: Directory of the snapshot files
+
+        Returns:
+            int: Number of snapshots indexed
+        """
+        from snapshot_manager import SnapshotManager
+
+        manager = SnapshotManager(snapshots_dir)
+        count = 0
+        for date in manager.get_snapshot_dates():
+            snapshot = manager.load_snapshot(date)
+            if snapshot:
+                self.add_snapshot(date, snapshot['players'], save=False)
+                count += 1
+        self.save()
+        return count
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """
+    Parse command line arguments.
+
+    Args:
+        argv: Argument list (defaults to sys.argv)
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Show a player's votes, rank and weekly deltas over time.")
+    parser.add_argument('player', nargs='?', help="player name (any case, ~suffix ignored)")
+    parser.add_argument('--months', type=int, default=0, help="only the last N months (default: all)")
+    parser.add_argument('--snapshots-dir', default=get_setting('SNAPSHOTS_DIR', 'snapshots'),
+                        help="snapshots directory (default: SNAPSHOTS_DIR or snapshots)")
+    parser.add_argument('--reindex', action='store_true', help="add every snapshot on disk to the index first")
+    parser.add_argument('--json', action='store_true', help="print the history as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    """Look up a player's history."""
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+
+    index_file = os.path.join(args.snapshots_dir, HISTORY_INDEX_FILENAME)
+    build = args.reindex or not os.path.exists(index_file)
+    index = HistoryIndex(index_file)
+    if build:
+        print(f"🗂️ Indexed {index.reindex(args.snapshots_dir)} snapshots from {args.snapshots_dir}")
+    if not args.player:
+        return 0
+
+    since = None
+    if args.months > 0:
+        today = datetime.now()
+        month = today.year * 12 + today.month - 1 - (args.months - 1)
+        since = datetime(month // 12, month % 12 + 1, 1)
+
+    history = index.lookup(args.player, since)
+    if args.json:
+        print(json.dumps(history, indent=2))
+        return 0 if history else 1
+
+    if not history:
+        print(f"❌ No history for {args.player}")
+        return 1
+
+    print(f"📈 History of {args.player}")
+    print("=" * 50)
+    print(f"  {'Date':<12}{'Votes':>8}{'Rank':>7}{'Week':>8}")
+    for entry in history:
+        print(f"  {entry['date']:<12}{entry['votes']:>8}{'#' + str(entry['rank']):>7}{entry['weekly_delta']:>+8}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""
+Job Ledger module for tracking which periodic jobs have already run.
+
+This module persists the last completed period of each weekly and monthly job
+so every job runs exactly once per period, even if the bot runs several times
+a day or misses a day.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Any, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Ledger file name inside a snapshots directory
+LEDGER_FILENAME = 'job_ledger.json'
+
+# Jobs that must run exactly once per period
+WEEKLY_SNAPSHOT = 'weekly_snapshot'
+WEEKLY_ANALYSIS = 'weekly_analysis'
+MONTHLY_FINAL = 'monthly_final'
+
+
+class JobLedger:
+    """Persists the last completed period for each periodic job."""
+
+    def __init__(self, ledger_file: str = os.path.join("snapshots", LEDGER_FILENAME), read_only: bool = False):
+        """
+        Initialize the job ledger and load its state.
+
+        Args:
+            ledger_file: Path to the JSON file storing the ledger
+            read_only: Keep completed jobs in memory only (dry runs)
+        """
+        self.ledger_file = ledger_file
+        self.read_only = read_only
+        self._entries: Dict[str, Dict[str, Any]] = self._load()
+        # Jobs of one run may complete concurrently
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Load ledger entries from disk.
+
+        Returns:
+            dict: Ledger entries keyed by job name (empty if missing or unreadable)
+        """
+        if not os.path.exists(self.ledger_file):
+            return {}
+
+        try:
+            with open(self.ledger_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"Failed to load job ledger {self.ledger_file}: {e}")
+            return {}
+
+    def _save(self):
+        """Write ledger entries to disk, replacing the old file in one step."""
+        directory = os.path.dirname(self.ledger_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        temp_file = f"{self.ledger_file}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(self._entries, f, indent=2)
+        os.replace(temp_file, self.ledger_file)
+
+    @staticmethod
+    def period_key(period_end: datetime) -> str:
+        """
+        Get the ledger key for a period.
+
+        Args:
+            period_end: Last day of the period (Sunday or last day of month)
+
+        Returns:
+            str: ISO date string that sorts chronologically
+        """
+        return period_end.strftime('%Y-%m-%d')
+
+    def last_period(self, job: str) -> Optional[str]:
+        """
+        Get the last completed period of a job.
+
+        Args:
+            job: Job name
+
+        Returns:
+            str or None: Period key of the last completed run, None if never run
+        """
+        entry = self._entries.get(job)
+        return entry['period'] if entry else None
+
+    def has_run(self, job: str, period_end: datetime) -> bool:
+        """
+        Check whether a job already ran for the given period (or a later one).
+
+        Args:
+            job: Job name
+            period_end: Last day of the period
+
+        Returns:
+            bool: True if the job is done for this period
+        """
+        last = self.last_period(job)
+        return last is not None and last >= self.period_key(period_end)
+
+    def mark_run(self, job: str, period_end: datetime):
+        """
+        Record that a job completed for the given period.
+
+        Args:
+            job: Job name
+            period_end: Last day of the period
+        """
+        with self._lock:
+            self._entries[job] = {
+                'period': self.period_key(period_end),
+                'completed_at': datetime.now().isoformat()
+            }
+            if self.read_only:
+                return
+            try:
+                self._save()
+                logger.info(f"Job ledger: {job} done for period ending {self.period_key(period_end)}")
+            except Exception as e:
+                logger.error(f"Failed to save job ledger {self.ledger_file}: {e}")
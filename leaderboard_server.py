@@ -0,0 +1,173 @@
+"""
+Leaderboard Server module serving the latest results read-only over HTTP.
+
+Tools that want the current leaderboard read it from the daemon instead of
+each scraping the TopGames API. Every run publishes its results once as
+ready-to-send JSON bodies with a weak ETag of its data (the body's
+updated_at changes on every run, the data only when votes do); requests
+only pick a body, and a reader that already has the data gets 304 Not
+Modified.
+
+    GET /                      servers and resources
+    GET /<server>/ranking      latest ranking (with rank movement)
+    GET /<server>/weekly       votes gained since last Sunday (players in its snapshot)
+    GET /<server>/newcomers    top players voting in their first month
+    GET /<server>/history      top players of every snapshot
+    GET /ranking               same, when the daemon runs a single server
+"""
+
+import json
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Resources a server publishes
+RESOURCES = ('ranking', 'weekly', 'newcomers', 'history')
+
+# Players per published ranking, weekly list, newcomers list and snapshot
+MAX_ROWS = 100
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag (weak comparison).
+
+    Args:
+        if_none_match: Header value: *, or a comma-separated list of entity tags
+        etag: Current entity tag of the resource
+
+    Returns:
+        bool: True if the reader already has the current representation
+    """
+    if if_none_match.strip() == '*':
+        return True
+    opaque = etag[2:] if etag.startswith('W/') else etag
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+class LeaderboardCache:
+    """Precomputed response bodies per server and resource."""
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        # (server, resource) -> (body, etag); entries are replaced, never mutated
+        self._bodies: Dict[Tuple[str, str], Tuple[bytes, str]] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, server: str, resource: str, data: Any, updated_at: Optional[datetime] = None):
+        """
+        Encode a resource once for all readers.
+
+        Args:
+            server: Server (tenant) name
+            resource: One of RESOURCES
+            data: JSON-serializable content
+            updated_at: Time of the run that produced it
+        """
+        document = {
+            'server': server,
+            'updated_at': (updated_at or datetime.now()).isoformat(),
+            resource: data,
+        }
+        body = json.dumps(document, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        etag = 'W/"' + hashlib.sha1(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()[:20] + '"'
+        with self._lock:
+            self._bodies[(server, resource)] = (body, etag)
+
+    def get(self, server: str, resource: str) -> Optional[Tuple[bytes, str]]:
+        """
+        Get a published body.
+
+        Args:
+            server: Server (tenant) name
+            resource: One of RESOURCES
+
+        Returns:
+            tuple or None: (body, etag), None if nothing was published yet
+        """
+        return self._bodies.get((server, resource))
+
+    def retain(self, servers):
+        """
+        Drop the bodies of servers that are no longer configured.
+
+        Args:
+            servers: Names of the servers to keep
+        """
+        keep = set(servers)
+        with self._lock:
+            self._bodies = {key: entry for key, entry in self._bodies.items() if key[0] in keep}
+
+    def servers(self) -> list:
+        """
+        Get the servers that published something.
+
+        Returns:
+            list: Server names, sorted
+        """
+        with self._lock:
+            return sorted({server for server, _ in self._bodies})
+
+    def serve(self, port: int, host: str = '127.0.0.1'):
+        """
+        Serve the published bodies over HTTP from a background thread.
+
+        Args:
+            port: Local port to listen on
+            host: Interface to bind (localhost by default)
+
+        Returns:
+            ThreadingHTTPServer: The running server (call shutdown() to stop it)
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        cache = self
+
+        class LeaderboardHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parts = [part for part in self.path.split('?')[0].split('/') if part]
+                if not parts:
+                    body = json.dumps({'servers': cache.servers(), 'resources': list(RESOURCES)}).encode('utf-8')
+                    return self._send(200, body)
+
+                if len(parts) == 1:
+                    servers = cache.servers()
+                    parts = [servers[0] if len(servers) == 1 else '', parts[0]]
+                entry = cache.get(parts[0], parts[1]) if len(parts) == 2 else None
+                if entry is None:
+                    return self._send(404, b'{"error":"not found"}')
+
+                body, etag = entry
+                if etag_matches(self.headers.get('If-None-Match', ''), etag):
+                    return self._send(304, b'', etag)
+                self._send(200, body, etag)
+
+            def _send(self, status: int, body: bytes, etag: Optional[str] = None):
+                self.send_response(status)
+                if etag:
+                    self.send_header('ETag', etag)
+                self.send_header('Cache-Control', 'no-cache')
+                if status != 304:
+                    self.send_header('Content-Type', 'application/json; charset=utf-8')
+                    self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if body:
+                    self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(f"Leaderboard request: {format % args}")
+
+        server = ThreadingHTTPServer((host, port), LeaderboardHandler)
+        threading.Thread(target=server.serve_forever, name='leaderboard', daemon=True).start()
+        logger.info(f"Serving the leaderboard on http://{host}:{port}/")
+        return server
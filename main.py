@@ -6,15 +6,33 @@ This script fetches top voters from TopGames API and posts them to Discord.
 Supports daily rankings, weekly analysis, and month-end highlights.
 """
 
+import os
 import sys
+import argparse
+import time
 import logging
 from datetime import datetime
-from config import get_config
-from api_client import fetch_top_voters
-from ranking import get_top_rankings
-from webhook import DiscordWebhook
+from typing import Any, Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+import metrics
+import profiling
+from clock import RunClock, get_timezone
+from config import Config, ConfigStore, ENV_FILE, get_config, get_setting, get_int_setting
+from pipeline import Pipeline
+from ranking import RankingProcessor, RankingView
 from schedule_manager import ScheduleManager
-from snapshot_manager import SnapshotManager
+from job_ledger import JobLedger, LEDGER_FILENAME, WEEKLY_SNAPSHOT, WEEKLY_ANALYSIS, MONTHLY_FINAL
+
+# HTTP and snapshot modules are imported by the stages that need them, keeping
+# cron cold starts cheap (see test_import_time.py)
+if TYPE_CHECKING:
+    from api_client import APIClient
+    from webhook import DiscordWebhook
+    from snapshot_manager import SnapshotManager
+    from rank_tracker import RankTracker
+    from velocity import VelocityTracker
+    from aggregates import AggregateStore
+    from leaderboard_server import LeaderboardCache
+    from models import Player
 
 # Configure logging
 logging.basicConfig(
@@ -24,117 +42,359 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def main():
-    """Main function to orchestrate the workflow."""
+def run_once(
+    config: Config,
+    api_client: Optional['APIClient'] = None,
+    webhook: Optional['DiscordWebhook'] = None,
+    snapshot_manager: Optional['SnapshotManager'] = None,
+    ledger: Optional[JobLedger] = None,
+    clock: Optional[RunClock] = None,
+    pipeline_workers: int = 4,
+    rank_tracker: Optional['RankTracker'] = None,
+    velocity_tracker: Optional['VelocityTracker'] = None,
+    aggregate_store: Optional['AggregateStore'] = None,
+    leaderboard: Optional['LeaderboardCache'] = None,
+    admin_webhook: Optional['DiscordWebhook'] = None
+) -> int:
+    """
+    Perform a single run: fetch, rank, snapshot and post.
+
+    Collaborators that are not passed in are created when a stage first needs
+    them, so a cron run only imports what it actually uses.
+
+    Args:
+        config: Validated configuration
+        api_client: Client for the TopGames API
+        webhook: Discord webhook sender
+        snapshot_manager: Snapshot manager for weekly tracking
+        ledger: Job ledger making weekly and monthly jobs run exactly once
+        clock: Time of this run (captured now in the configured timezone if omitted)
+        pipeline_workers: Stages running at the same time (1 runs them inline,
+            cheaper when no stage waits on the network)
+        rank_tracker: Previous ranking for the movement indicators
+        velocity_tracker: Vote rate state for the spike alerts
+        aggregate_store: Monthly and all-time leaderboard rows
+        leaderboard: Cache the results are published to for the leaderboard endpoint
+        admin_webhook: Sender of the vote spike alerts (created from ADMIN_WEBHOOK_URL
+            if omitted; without either, spikes are only logged)
+
+    Returns:
+        int: Exit code (0 on success, 1 on failure)
+    """
+    started = time.perf_counter()
+    exit_code = _run_once(config, api_client, webhook, snapshot_manager, ledger, clock, pipeline_workers,
+                          rank_tracker, velocity_tracker, aggregate_store, leaderboard, admin_webhook)
+    metrics.observe_run(config.name, exit_code, time.perf_counter() - started)
+    return exit_code
+
+
+def _run_once(
+    config: Config,
+    api_client: Optional['APIClient'],
+    webhook: Optional['DiscordWebhook'],
+    snapshot_manager: Optional['SnapshotManager'],
+    ledger: Optional[JobLedger],
+    clock: Optional[RunClock],
+    pipeline_workers: int,
+    rank_tracker: Optional['RankTracker'],
+    velocity_tracker: Optional['VelocityTracker'],
+    aggregate_store: Optional['AggregateStore'],
+    leaderboard: Optional['LeaderboardCache'],
+    admin_webhook: Optional['DiscordWebhook']
+) -> int:
+    """Perform a single run (see run_once) without recording its metrics."""
     try:
         logger.info("=" * 50)
-        logger.info("Starting TopGames TopVoter Bot")
+        if config.name != 'default':
+            logger.info(f"Starting TopGames TopVoter Bot for {config.name}")
+        else:
+            logger.info("Starting TopGames TopVoter Bot")
         logger.info("=" * 50)
 
-        # Load and validate configuration
-        logger.info("Loading configuration...")
-        config = get_config()
-        logger.info("Configuration loaded successfully")
+        # Capture the time once so every step agrees on the date
+        if clock is None:
+            clock = RunClock(get_timezone(config.timezone))
+        today = clock.now
+
+        if ledger is None:
+            ledger = JobLedger(os.path.join(config.snapshots_dir, LEDGER_FILENAME))
 
-        # Initialize managers
-        snapshot_manager = SnapshotManager()
-        
         # Log current schedule information
-        ScheduleManager.log_schedule_info()
+        ScheduleManager.log_schedule_info(today, ledger)
         
-        # Determine what type of post to make
-        post_type = ScheduleManager.get_post_type()
+        # Determine what type of post to make and which periodic jobs are due
+        post_type = ScheduleManager.get_post_type(today, ledger)
         embed_config = ScheduleManager.get_embed_config(post_type)
-        
-        # Fetch data from API
-        logger.info(f"Fetching voter data from API: {config.api_url}")
-        api_data = fetch_top_voters(config.api_url)
-        logger.info(f"API response received with code: {api_data.get('code', 'N/A')}")
-
-        # Process and rank players
-        logger.info("Processing and ranking players...")
-        top_players = get_top_rankings(api_data, config.max_voters)
-        logger.info(f"Found {len(top_players)} top voters")
-
-        if not top_players:
-            logger.warning("No valid players found in API response")
-        else:
-            # Log top players for verification
-            for player in top_players[:3]:  # Show top 3 in logs
-                logger.info(
-                    f"  {player['rank']}. {player['playername']}: {player['votes']} votes"
-                )
-
-        # Save snapshot if it's Sunday
-        if ScheduleManager.should_save_snapshot():
+        snapshot_period = ScheduleManager.get_due_period(WEEKLY_SNAPSHOT, today, ledger)
+        weekly_period = ScheduleManager.get_due_period(WEEKLY_ANALYSIS, today, ledger)
+        monthly_period = ScheduleManager.get_due_period(MONTHLY_FINAL, today, ledger)
+        monthly_catch_up = monthly_period is not None and monthly_period.date() != today.date()
+
+        if snapshot_period is not None and snapshot_period.date() != today.date():
+            # Today's totals include votes cast after that Sunday (or were reset with
+            # the month); saved under its date they would falsify next week's baseline.
+            # The baseline lookup falls back to the nearest real snapshot instead.
+            logger.warning(f"Missed snapshot for {snapshot_period.strftime('%Y-%m-%d')} can't be taken "
+                           f"from today's data, skipping it")
+            ledger.mark_run(WEEKLY_SNAPSHOT, snapshot_period)
+            snapshot_period = None
+
+        if api_client is None:
+            from api_client import APIClient
+            api_client = APIClient(config.api_url, server=config.name)
+        if webhook is None:
+            from webhook import DiscordWebhook
+            webhook = DiscordWebhook(config.webhook_url, locale=config.locale, server=config.name)
+        if admin_webhook is None and config.admin_webhook_url:
+            from webhook import DiscordWebhook
+            admin_webhook = DiscordWebhook(config.admin_webhook_url, locale=config.locale, server=config.name)
+        if rank_tracker is None:
+            from rank_tracker import RankTracker, RANK_INDEX_FILENAME
+            rank_tracker = RankTracker(os.path.join(config.snapshots_dir, RANK_INDEX_FILENAME))
+        if velocity_tracker is None:
+            velocity_tracker = create_velocity_tracker(config)
+        if aggregate_store is None:
+            from aggregates import AggregateStore, AGGREGATES_FILENAME
+            aggregate_store = AggregateStore(os.path.join(config.snapshots_dir, AGGREGATES_FILENAME))
+        if snapshot_manager is None and (snapshot_period or weekly_period or monthly_period or leaderboard):
+            from snapshot_manager import SnapshotManager
+            snapshot_manager = SnapshotManager(config.snapshots_dir)
+
+        # Full ranking, newcomers and overtakes found by the rank stage
+        ranked_players: List['Player'] = []
+        newcomers: List['Player'] = []
+        overtakes: List[Dict[str, Any]] = []
+
+        def fetch():
+            logger.info(f"Fetching voter data from API: {config.api_url}")
+            api_data = api_client.fetch_voters()
+            logger.info(f"API response received with code: {api_data.get('code', 'N/A')}")
+            return api_data
+
+        def rank(api_data):
+            logger.info("Processing and ranking players...")
+            # Every board of the run comes from one consolidation and one sort
+            views = [RankingView('all', None), RankingView('top', config.max_voters)]
+            if leaderboard is not None:
+                from leaderboard_server import MAX_ROWS
+                views.append(RankingView('newcomers', MAX_ROWS, where=aggregate_store.newcomer_filter(today)))
+            boards = RankingProcessor(config.quarantine_file or None, config.name).process_views(api_data, views)
+            ranked_players[:] = boards['all']
+            newcomers[:] = boards.get('newcomers', [])
+            top_players = boards['top']
+            logger.info(f"Found {len(top_players)} top voters")
+            overtakes[:] = rank_tracker.diff(ranked_players, today, config.max_voters)
+
+            if not top_players:
+                logger.warning("No valid players found in API response")
+            else:
+                # Log top players for verification
+                for player in top_players[:3]:  # Show top 3 in logs
+                    logger.info(
+                        f"  {player.rank}. {player.playername}: {player.votes} votes"
+                    )
+            return top_players
+
+        def save_snapshot(top_players):
             logger.info("Saving weekly snapshot...")
-            if snapshot_manager.save_snapshot(top_players):
-                logger.info("Snapshot saved successfully")
+            # One directory fsync for the new snapshot and the removed old ones,
+            # done before the ledger records the snapshot as taken
+            with snapshot_manager.batch():
+                if not snapshot_manager.save_snapshot(top_players, snapshot_period):
+                    logger.warning("Failed to save snapshot")
+                    return False
                 # Cleanup old snapshots
-                snapshot_manager.cleanup_old_snapshots()
-            else:
-                logger.warning("Failed to save snapshot")
+                snapshot_manager.cleanup_old_snapshots(today=today)
 
-        # Initialize webhook
-        webhook = DiscordWebhook(config.webhook_url)
-        success_count = 0
-        
-        # Send daily/monthly ranking
-        logger.info(f"Sending {post_type} rankings to Discord...")
-        
-        # Prepare title and description
-        title = config.embed_title + embed_config['title_suffix']
-        description = embed_config['description_prefix'] + config.embed_description
-        color = embed_config.get('color', config.embed_color)
-        
-        success = webhook.send_rankings(
-            top_players,
-            title,
-            description,
-            color
-        )
+            logger.info("Snapshot saved successfully")
+            ledger.mark_run(WEEKLY_SNAPSHOT, snapshot_period)
+            return True
+
+        def post_rankings(top_players):
+            logger.info(f"Sending {post_type} rankings to Discord...")
+
+            # Prepare title and description
+            title = config.embed_title + embed_config['title_suffix']
+            description = embed_config['description_prefix'] + config.embed_description
+            color = embed_config.get('color', config.embed_color)
+
+            if not webhook.send_rankings(top_players, title, description, color, today, overtakes):
+                logger.error("Failed to send rankings to Discord")
+                return False
 
-        if success:
             logger.info("Successfully sent rankings to Discord!")
-            success_count += 1
-        else:
-            logger.error("Failed to send rankings to Discord")
+            # Movement of the next post is relative to this one
+            rank_tracker.commit()
+            if embed_config['highlight'] and monthly_period is not None:
+                ledger.mark_run(MONTHLY_FINAL, monthly_period)
+            return True
+
+        def load_weekly_snapshots():
+            # For a missed week, the week's own end snapshot replaces the live data
+            week_end_snapshot = None
+            if weekly_period.date() != today.date():
+                logger.info(f"Catching up missed weekly analysis for week ending {weekly_period.strftime('%Y-%m-%d')}...")
+                nearest = snapshot_manager.find_nearest_snapshot(weekly_period)
+                if nearest:
+                    week_end_snapshot = nearest[1]
+            return snapshot_manager.load_weekly_baseline(weekly_period, today), week_end_snapshot
+
+        def calculate_weekly(top_players, weekly_snapshots):
+            baseline, week_end_snapshot = weekly_snapshots
+            if not baseline:
+                return None
+
+            week_players = top_players
+            if week_end_snapshot:
+                week_players = snapshot_manager.snapshot_to_players(week_end_snapshot)
+            weekly_players = snapshot_manager.diff_weekly_votes(week_players, baseline)
 
-        # Send weekly analysis if it's Sunday
-        if ScheduleManager.should_post_weekly_analysis():
-            logger.info("Calculating and sending weekly analysis...")
-            
-            # Calculate weekly votes
-            weekly_players = snapshot_manager.calculate_weekly_votes(top_players)
-            
             if weekly_players:
                 logger.info(f"Found {len(weekly_players)} active weekly voters")
                 # Log top weekly voters
                 for player in weekly_players[:3]:
                     logger.info(
-                        f"  Weekly #{player['rank']}. {player['playername']}: "
-                        f"+{player['weekly_votes']} votes this week"
+                        f"  Weekly #{player.rank}. {player.playername}: "
+                        f"+{player.weekly_votes} votes this week"
                     )
-                
-                # Get week date range
-                week_range_dict = ScheduleManager.get_week_date_range()
-                week_range = f"{week_range_dict['start']} - {week_range_dict['end']}"
-                
-                # Send weekly analysis
-                weekly_success = webhook.send_weekly_analysis(weekly_players, week_range)
-                
-                if weekly_success:
-                    logger.info("Successfully sent weekly analysis to Discord!")
-                    success_count += 1
-                else:
-                    logger.error("Failed to send weekly analysis to Discord")
-            else:
+            return weekly_players
+
+        def post_weekly(weekly_players):
+            if weekly_players is None:
+                # Left due, so the analysis is retried until the next week replaces it
+                logger.warning(f"No baseline snapshot for the week ending {weekly_period.strftime('%Y-%m-%d')}, "
+                               f"weekly analysis will be retried on the next run")
+                return None
+            if not weekly_players:
                 logger.info("No weekly voting activity found, skipping weekly analysis")
+                ledger.mark_run(WEEKLY_ANALYSIS, weekly_period)
+                return None
+
+            logger.info("Sending weekly analysis to Discord...")
 
-        # Determine overall success
-        expected_posts = 1  # Always expect daily post
-        if ScheduleManager.should_post_weekly_analysis():
-            expected_posts += 1  # Add weekly post if Sunday
+            # Get week date range
+            week_range_dict = ScheduleManager.get_week_date_range(weekly_period)
+            week_range = f"{week_range_dict['start']} - {week_range_dict['end']}"
+
+            if not webhook.send_weekly_analysis(weekly_players, week_range):
+                logger.error("Failed to send weekly analysis to Discord")
+                return False
+
+            logger.info("Successfully sent weekly analysis to Discord!")
+            ledger.mark_run(WEEKLY_ANALYSIS, weekly_period)
+            return True
+
+        def load_monthly_snapshot():
+            return snapshot_manager.find_nearest_snapshot(
+                monthly_period,
+                max_days=monthly_period.day,
+                earliest=monthly_period.replace(day=1),
+                latest=monthly_period
+            )
+
+        def track_velocity(top_players):
+            flags = velocity_tracker.update(ranked_players, today)
+            if not flags or admin_webhook is None:
+                return None
+            logger.info(f"Sending {len(flags)} vote spike flag(s) to the admin channel...")
+            return admin_webhook.send_spike_alert(flags)
+
+        def update_aggregates(top_players):
+            aggregate_store.update(ranked_players, today)
+
+        def post_monthly_recap(_, caught_up=True):
+            if not caught_up:
+                # Posted with the final ranking once the catch-up succeeds
+                return None
+            logger.info("Sending month-over-month and hall-of-fame recap to Discord...")
+            recap_month = monthly_period if monthly_catch_up else today
+            month = recap_month.strftime('%Y-%m')
+            if not webhook.send_month_over_month(aggregate_store.month_over_month(month, config.max_voters), recap_month):
+                return False
+            return webhook.send_hall_of_fame(aggregate_store.hall_of_fame(config.max_voters))
+
+        def publish_leaderboard(*_):
+            from leaderboard_server import MAX_ROWS
+            leaderboard.publish(config.name, 'ranking', [player.to_dict() for player in ranked_players[:MAX_ROWS]], today)
+            leaderboard.publish(config.name, 'newcomers', [player.to_dict() for player in newcomers], today)
+            baseline = snapshot_manager.load_weekly_baseline(today=today)
+            weekly_players = []
+            if baseline:
+                # Snapshots hold the top max_voters only; anyone else has no baseline to diff
+                tracked = [player for player in ranked_players if player.playername in baseline['players']]
+                weekly_players = snapshot_manager.diff_weekly_votes(tracked, baseline)
+            leaderboard.publish(config.name, 'weekly', [player.to_dict() for player in weekly_players[:MAX_ROWS]], today)
+            # Snapshots only change on snapshot days
+            if snapshot_period is not None or leaderboard.get(config.name, 'history') is None:
+                history = []
+                for snapshot_date in snapshot_manager.get_snapshot_dates():
+                    snapshot = snapshot_manager.load_snapshot(snapshot_date)
+                    if snapshot:
+                        history.append({
+                            'date': snapshot_date.strftime('%Y-%m-%d'),
+                            'players': [player.to_dict() for player in snapshot_manager.snapshot_to_players(snapshot)[:MAX_ROWS]],
+                        })
+                leaderboard.publish(config.name, 'history', history, today)
+
+        def post_monthly_catch_up(nearest):
+            if nearest:
+                # The month's last runs were missed; its last snapshot completes its aggregates
+                aggregate_store.update(snapshot_manager.snapshot_to_players(nearest[1]), monthly_period)
+            if send_monthly_catch_up(config, webhook, monthly_period, nearest):
+                ledger.mark_run(MONTHLY_FINAL, monthly_period)
+                return True
+            return False
+
+        # Independent I/O (API fetch, snapshot loads) runs concurrently; posts keep
+        # their channel order (ranking, then month-end catch-up, then weekly analysis)
+        pipeline = Pipeline(pipeline_workers)
+        pipeline.add('fetch', fetch)
+        pipeline.add('rank', rank, depends=['fetch'])
+        pipeline.add('post_rankings', post_rankings, depends=['rank'])
+        post_stages = ['post_rankings']
+
+        # Not a post of the run: a failed alert is logged but doesn't fail the run
+        pipeline.add('track_velocity', track_velocity, depends=['rank'])
+        pipeline.add('update_aggregates', update_aggregates, depends=['rank'])
+
+        if snapshot_period is not None:
+            pipeline.add('save_snapshot', save_snapshot, depends=['rank'])
+
+        if leaderboard is not None:
+            depends = ['rank', 'save_snapshot'] if snapshot_period is not None else ['rank']
+            pipeline.add('publish_leaderboard', publish_leaderboard, depends=depends)
+
+        if monthly_catch_up:
+            pipeline.add('load_monthly_snapshot', load_monthly_snapshot)
+            pipeline.add('post_monthly_catch_up', post_monthly_catch_up, depends=['load_monthly_snapshot'], after=['post_rankings'])
+            post_stages.append('post_monthly_catch_up')
+
+        if weekly_period is not None:
+            logger.info("Calculating and sending weekly analysis...")
+            pipeline.add('load_weekly_snapshots', load_weekly_snapshots)
+            pipeline.add('calculate_weekly', calculate_weekly, depends=['rank', 'load_weekly_snapshots'])
+            pipeline.add('post_weekly', post_weekly, depends=['calculate_weekly'], after=post_stages[-1:])
+            post_stages.append('post_weekly')
+
+        if config.monthly_recap and embed_config['highlight']:
+            pipeline.add('post_monthly_recap', post_monthly_recap, depends=['update_aggregates'], after=post_stages[-1:])
+            post_stages.append('post_monthly_recap')
+        elif config.monthly_recap and monthly_catch_up:
+            pipeline.add('post_monthly_recap', post_monthly_recap, depends=['update_aggregates', 'post_monthly_catch_up'],
+                         after=post_stages[-1:])
+            post_stages.append('post_monthly_recap')
+
+        result = pipeline.run()
+        for stage, duration in result.durations.items():
+            metrics.STAGE_SECONDS.observe(duration, server=config.name, stage=stage)
+
+        if 'fetch' in result.errors or 'rank' in result.errors:
+            return 1
+
+        # Determine overall success; a skipped weekly analysis is not a post
+        outcomes = [result.get(stage, False) for stage in post_stages]
+        expected_posts = sum(1 for outcome in outcomes if outcome is not None)
+        success_count = sum(1 for outcome in outcomes if outcome is True)
 
         if success_count == expected_posts:
             logger.info(f"All posts sent successfully! ({success_count}/{expected_posts})")
@@ -143,9 +403,6 @@ def main():
             logger.error(f"Some posts failed! ({success_count}/{expected_posts})")
             return 1
 
-    except ValueError as e:
-        logger.error(f"Configuration error: {e}")
-        return 1
     except Exception as e:
         logger.error(f"Unexpected error: {e}", exc_info=True)
         return 1
@@ -154,5 +411,502 @@ def main():
         logger.info("=" * 50)
 
 
+def send_monthly_catch_up(
+    config,
+    webhook: 'DiscordWebhook',
+    month_end: datetime,
+    nearest: Optional[Tuple[datetime, Dict[str, Any]]]
+) -> bool:
+    """
+    Post a missed month-end final ranking from the last snapshot of that month.
+
+    Args:
+        config: Validated configuration
+        webhook: Discord webhook sender
+        month_end: Last day of the missed month
+        nearest: (snapshot_date, snapshot) of the month's last snapshot, if any
+
+    Returns:
+        bool: True if the final ranking was posted
+    """
+    from snapshot_manager import SnapshotManager
+
+    logger.info(f"Catching up missed final ranking for {month_end.strftime('%Y-%m')}...")
+
+    if not nearest:
+        logger.warning("No snapshot found for the missed month, cannot post final ranking")
+        return False
+
+    snapshot_date, snapshot = nearest
+    logger.info(f"Using snapshot from {snapshot_date.strftime('%Y-%m-%d')} for the final ranking")
+    players = SnapshotManager.snapshot_to_players(snapshot)[:config.max_voters]
+
+    embed_config = ScheduleManager.get_embed_config('monthly_final')
+    title = config.embed_title + embed_config['title_suffix']
+    description = embed_config['description_prefix'] + config.embed_description
+
+    if webhook.send_rankings(players, title, description, embed_config['color'], month_end):
+        logger.info("Successfully sent missed final ranking to Discord!")
+        return True
+
+    logger.error("Failed to send missed final ranking to Discord")
+    return False
+
+
+def create_runner(config, session=None, leaderboard: Optional['LeaderboardCache'] = None) -> Callable[[], int]:
+    """
+    Create warm collaborators for one server and return a function performing one run.
+
+    Args:
+        config: Validated configuration of the server
+        session: Optional requests session shared for connection reuse
+        leaderboard: Cache the results are published to (daemon leaderboard endpoint)
+
+    Returns:
+        callable: Function performing a run and returning its exit code
+    """
+    from api_client import APIClient
+    from snapshot_manager import SnapshotManager
+    from webhook import DiscordWebhook
+    from rank_tracker import RankTracker, RANK_INDEX_FILENAME
+    from aggregates import AggregateStore, AGGREGATES_FILENAME
+
+    api_client = APIClient(config.api_url, session=session, server=config.name)
+    webhook = DiscordWebhook(config.webhook_url, session=session, locale=config.locale, server=config.name)
+    admin_webhook = None
+    if config.admin_webhook_url:
+        admin_webhook = DiscordWebhook(config.admin_webhook_url, session=session, locale=config.locale, server=config.name)
+    snapshot_manager = SnapshotManager(config.snapshots_dir)
+    ledger = JobLedger(os.path.join(config.snapshots_dir, LEDGER_FILENAME))
+    rank_tracker = RankTracker(os.path.join(config.snapshots_dir, RANK_INDEX_FILENAME))
+    velocity_tracker = create_velocity_tracker(config)
+    aggregate_store = AggregateStore(os.path.join(config.snapshots_dir, AGGREGATES_FILENAME))
+    timezone = get_timezone(config.timezone)
+
+    return lambda: run_locked(
+        config, lambda: run_once(
+            config, api_client, webhook, snapshot_manager, ledger, RunClock(timezone),
+            rank_tracker=rank_tracker, velocity_tracker=velocity_tracker, aggregate_store=aggregate_store,
+            leaderboard=leaderboard, admin_webhook=admin_webhook
+        )
+    )
+
+
+def create_velocity_tracker(config: Config) -> 'VelocityTracker':
+    """
+    Create the vote velocity tracker of a server.
+
+    Args:
+        config: Validated configuration of the server
+
+    Returns:
+        VelocityTracker: Tracker with its state in the snapshots directory
+    """
+    from velocity import VelocityTracker, VELOCITY_FILENAME
+
+    return VelocityTracker(
+        os.path.join(config.snapshots_dir, VELOCITY_FILENAME),
+        config.velocity_half_life_hours,
+        config.velocity_spike_threshold
+    )
+
+
+def run_locked(config: Config, run: Callable[[], int], stoppable: bool = False) -> int:
+    """
+    Perform a run while holding the server's run lock.
+
+    Cron can start the next run while a slow one still waits on the API or
+    Discord; the lock policy decides whether the new run skips, waits or
+    takes over (see run_lock.py). A skipped run is not an error.
+
+    Args:
+        config: Validated configuration of the server
+        run: Function performing the run
+        stoppable: The process only runs this server once (cron), so a
+            takeover may stop it; daemons and tenant runners are never stopped
+
+    Returns:
+        int: Exit code of the run, 0 if it was skipped
+    """
+    from run_lock import RunLock, LOCK_FILENAME
+
+    lock = RunLock(
+        os.path.join(config.snapshots_dir, LOCK_FILENAME),
+        config.run_lock_policy,
+        config.run_lock_timeout,
+        config.run_lock_stale_after,
+        stoppable
+    )
+    if not lock.acquire():
+        logger.warning(f"Skipping run of {config.name}: a previous run is still in progress")
+        return 0
+    try:
+        return run()
+    finally:
+        lock.release()
+
+
+def export_metrics(metrics_file: str, merge: bool = False):
+    """
+    Write the collected metrics for the Prometheus textfile collector.
+
+    Args:
+        metrics_file: Target .prom file (empty to skip)
+        merge: Continue the counters of the previous file (cron runs, whose
+            process starts from zero every time)
+    """
+    if metrics_file:
+        metrics.REGISTRY.write_textfile(metrics_file, merge)
+
+
+def run_profiled(run: Callable[[], int], name: str) -> int:
+    """
+    Perform a run under the profilers switched on by PROFILE_CPU / PROFILE_MEMORY.
+
+    Args:
+        run: Function performing the run
+        name: Name used in the profiling report file names
+
+    Returns:
+        int: Exit code of the run
+    """
+    with profiling.profile_run(name):
+        return run()
+
+
+def run_render(
+    config: Config,
+    render_dir: str,
+    inputs: Optional[List[str]] = None,
+    now: Optional[datetime] = None
+) -> int:
+    """
+    Run the pipeline without posting, writing the Discord payloads to disk instead.
+
+    Every state file of the snapshots directory (snapshots, rank index, vote
+    velocity, aggregates) is used from a scratch copy and the job ledger is
+    kept in memory, so a dry run never changes the real state.
+    Every recorded input is rendered as its own run against that state.
+
+    Args:
+        config: Validated configuration
+        render_dir: Directory receiving one JSON file per payload
+        inputs: Recorded API responses (files or directories of .json files);
+            the live API is fetched if omitted
+        now: Time to render for (defaults to now in the configured timezone)
+
+    Returns:
+        int: 0 if every input rendered, 1 otherwise
+    """
+    import shutil
+    import tempfile
+    from dataclasses import replace
+    from api_client import APIClient, RecordedAPIClient
+    from snapshot_manager import SnapshotManager
+    from webhook import RecordingWebhook
+
+    files: List[Optional[str]] = []
+    for path in inputs or []:
+        if os.path.isdir(path):
+            files.extend(sorted(os.path.join(path, name) for name in os.listdir(path) if name.endswith('.json')))
+        else:
+            files.append(path)
+    if not inputs:
+        files.append(None)
+
+    timezone = get_timezone(config.timezone)
+    ledger_file = os.path.join(config.snapshots_dir, LEDGER_FILENAME)
+    webhook = RecordingWebhook(render_dir, config.locale)
+    exit_code = 0
+    started = time.perf_counter()
+
+    # Batches would spend most of their time logging every run
+    root_logger = logging.getLogger()
+    log_level = root_logger.level
+    if len(files) > 1:
+        root_logger.setLevel(logging.WARNING)
+
+    try:
+        with tempfile.TemporaryDirectory() as scratch_dir:
+            if os.path.isdir(config.snapshots_dir):
+                shutil.copytree(config.snapshots_dir, scratch_dir, dirs_exist_ok=True)
+            # Collaborators created by the run find their state files in the copy,
+            # and rejected rows are quarantined there too
+            scratch_config = replace(
+                config, snapshots_dir=scratch_dir,
+                quarantine_file=os.path.join(scratch_dir, os.path.basename(config.quarantine_file))
+                if config.quarantine_file else ''
+            )
+            snapshot_manager = SnapshotManager(scratch_dir)
+
+            for path in files:
+                if path is None:
+                    api_client, webhook.prefix = APIClient(config.api_url, server=config.name), 'live'
+                else:
+                    api_client = RecordedAPIClient(path)
+                    webhook.prefix = os.path.splitext(os.path.basename(path))[0]
+                # Recorded inputs need no I/O overlap; inline stages render faster.
+                # Spike alerts are rendered next to the posts instead of sent
+                exit_code = max(exit_code, run_once(
+                    scratch_config, api_client, webhook, snapshot_manager,
+                    JobLedger(ledger_file, read_only=True), RunClock(timezone, now),
+                    pipeline_workers=1 if path else 4,
+                    admin_webhook=webhook if config.admin_webhook_url else None
+                ))
+                webhook.payloads.clear()
+    finally:
+        root_logger.setLevel(log_level)
+
+    elapsed = time.perf_counter() - started
+    logger.info(f"Rendered {len(files)} run(s) to {render_dir} in {elapsed:.2f}s "
+                f"({len(files) / elapsed:.0f} runs/s)")
+    return exit_code
+
+
+def run_tenants(configs: List, max_workers: int) -> int:
+    """
+    Run every tenant once on a bounded worker pool.
+
+    Args:
+        configs: Validated configuration per tenant
+        max_workers: Maximum number of tenants processed at the same time
+
+    Returns:
+        int: 0 if every tenant succeeded, 1 otherwise
+    """
+    from tenants import TenantRunner, create_shared_session
+
+    session = create_shared_session(max_workers * 2)
+    try:
+        runs = {config.name: create_runner(config, session) for config in configs}
+        return TenantRunner(max_workers).run(runs)
+    finally:
+        session.close()
+
+
+def run_daemon(
+    store: ConfigStore,
+    max_workers: int = 1,
+    metrics_file: str = '',
+    metrics_port: int = 0,
+    leaderboard_port: int = 0
+) -> int:
+    """
+    Run the bot as a long-running process with an internal scheduler.
+
+    Servers sharing a schedule (run time, interval and timezone) are fired
+    together and processed on a bounded worker pool. When the configuration
+    changes on disk, the jobs are rebuilt between runs; servers whose
+    configuration didn't change keep their warm collaborators.
+
+    Args:
+        store: Store holding the validated configuration per server
+        max_workers: Maximum number of servers processed at the same time
+        metrics_file: Prometheus textfile rewritten after every run (empty to skip)
+        metrics_port: Local port serving the metrics (0 to skip)
+        leaderboard_port: Local port serving the latest results as JSON (0 to skip)
+
+    Returns:
+        int: Exit code of the last run
+    """
+    from daemon import Daemon, DaemonScheduler, ScheduledJob
+    from tenants import TenantRunner, create_shared_session
+
+    # Shared across runs so connections and loaded snapshots stay warm
+    session = create_shared_session(max_workers * 2)
+    runners: Dict[str, Tuple[Config, Callable[[], int]]] = {}
+    tenant_runner = TenantRunner(max_workers)
+    leaderboard = None
+    if leaderboard_port:
+        from leaderboard_server import LeaderboardCache
+        leaderboard = LeaderboardCache()
+
+    def run_and_export(run: Callable[[], int]) -> int:
+        try:
+            return run()
+        finally:
+            export_metrics(metrics_file)
+
+    def build_jobs(configs: List[Config]) -> List[ScheduledJob]:
+        names = {config.name for config in configs}
+        for name in list(runners):
+            if name not in names:
+                del runners[name]
+        if leaderboard is not None:
+            leaderboard.retain(names)
+        for config in configs:
+            if config.name not in runners or runners[config.name][0] != config:
+                runners[config.name] = (config, create_runner(config, session, leaderboard))
+
+        groups: Dict[Tuple[str, int, str], List[Config]] = {}
+        for config in configs:
+            key = (config.daemon_run_time, config.daemon_interval_minutes, config.timezone)
+            groups.setdefault(key, []).append(config)
+
+        jobs = []
+        for (run_time_value, interval_minutes, timezone_name), group in groups.items():
+            run_time = ScheduleManager.parse_run_time(run_time_value) if run_time_value else None
+            scheduler = DaemonScheduler(run_time, interval_minutes)
+            if len(group) == 1:
+                name, callback = group[0].name, runners[group[0].name][1]
+            else:
+                group_runs = {config.name: runners[config.name][1] for config in group}
+                name = f"{len(group)} tenants"
+                callback = lambda runs=group_runs: tenant_runner.run(runs)
+            if profiling.is_enabled():
+                callback = lambda run=callback, name=name: run_profiled(run, name)
+            if metrics_file:
+                callback = lambda run=callback: run_and_export(run)
+            jobs.append(ScheduledJob(name, scheduler, callback, get_timezone(timezone_name)))
+        return jobs
+
+    def reload_jobs() -> Optional[List[ScheduledJob]]:
+        return build_jobs(store.current) if store.reload_if_changed() else None
+
+    daemon = Daemon(build_jobs(store.current), reload=reload_jobs)
+    daemon.install_signal_handlers()
+    metrics_server = metrics.REGISTRY.serve(metrics_port) if metrics_port else None
+    leaderboard_server = leaderboard.serve(leaderboard_port) if leaderboard is not None else None
+    try:
+        return daemon.run()
+    finally:
+        if metrics_server is not None:
+            metrics_server.shutdown()
+        if leaderboard_server is not None:
+            leaderboard_server.shutdown()
+        session.close()
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """
+    Parse command line arguments.
+
+    Args:
+        argv: Argument list (defaults to sys.argv)
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Post TopGames top voters to Discord.")
+    # Defaults come from the environment or .env, like the Config settings
+    try:
+        tenants_file = get_setting('TENANTS_FILE')
+        tenant_workers = get_int_setting('TENANT_WORKERS', 8)
+        metrics_file = get_setting('METRICS_FILE')
+        metrics_port = get_int_setting('METRICS_PORT', 0)
+        leaderboard_port = get_int_setting('LEADERBOARD_PORT', 0)
+    except ValueError as e:
+        parser.error(str(e))
+
+    parser.add_argument(
+        '--daemon',
+        action='store_true',
+        help="run continuously and schedule runs internally instead of exiting after one run"
+    )
+    parser.add_argument(
+        '--tenants',
+        metavar='FILE',
+        default=tenants_file,
+        help="JSON file listing several servers to process from this one process"
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=tenant_workers,
+        help="maximum number of tenants processed at the same time (default: 8)"
+    )
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help="don't post to Discord; write the payloads to --render-to instead"
+    )
+    parser.add_argument(
+        '--render-to',
+        metavar='DIR',
+        help="write the Discord payloads to DIR instead of posting them (implies --dry-run)"
+    )
+    parser.add_argument(
+        '--input',
+        metavar='PATH',
+        nargs='+',
+        help="dry run: recorded API responses (files or directories of .json files) to render"
+    )
+    parser.add_argument(
+        '--date',
+        type=lambda value: datetime.fromisoformat(value),
+        help="dry run: render as of this date/time (YYYY-MM-DD[THH:MM]), e.g. a month end"
+    )
+    parser.add_argument(
+        '--metrics-file',
+        metavar='FILE',
+        default=metrics_file,
+        help="write run metrics to this Prometheus textfile-collector file (.prom)"
+    )
+    parser.add_argument(
+        '--metrics-port',
+        type=int,
+        default=metrics_port,
+        help="serve run metrics on this local port in daemon mode (default: off)"
+    )
+    parser.add_argument(
+        '--leaderboard-port',
+        type=int,
+        default=leaderboard_port,
+        help="serve the latest ranking, weekly votes and snapshot history as JSON on this local port in daemon mode"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Main function to orchestrate the workflow."""
+    args = parse_args(argv)
+    if (args.dry_run or args.render_to) and (args.tenants or args.daemon):
+        logger.error("--dry-run renders a single server once; it can't be combined with --tenants or --daemon")
+        return 1
+
+    if args.tenants:
+        from tenants import load_tenants
+        loader = lambda: load_tenants(args.tenants)
+        source_files = [args.tenants, ENV_FILE]
+    elif args.dry_run or args.render_to:
+        # Nothing is posted, and recorded inputs replace the API
+        overrides = {'webhook_url': 'dry-run'}
+        if args.input:
+            overrides['api_url'] = 'recorded'
+        loader = lambda: [get_config(overrides)]
+        source_files = [ENV_FILE]
+    else:
+        loader = lambda: [get_config()]
+        source_files = [ENV_FILE]
+
+    try:
+        # Load and validate configuration
+        logger.info("Loading configuration...")
+        store = ConfigStore(loader, source_files)
+        configs = store.current
+        if args.tenants:
+            logger.info(f"Configuration loaded successfully for {len(configs)} tenants")
+        else:
+            logger.info("Configuration loaded successfully")
+
+        if args.daemon:
+            return run_daemon(store, max(1, args.workers), args.metrics_file, args.metrics_port, args.leaderboard_port)
+    except ValueError as e:
+        logger.error(f"Configuration error: {e}")
+        return 1
+
+    if args.dry_run or args.render_to:
+        return run_render(configs[0], args.render_to or 'rendered', args.input, args.date)
+
+    with profiling.profile_run('tenants' if args.tenants else configs[0].name):
+        if args.tenants:
+            exit_code = run_tenants(configs, max(1, args.workers))
+        else:
+            exit_code = run_locked(configs[0], lambda: run_once(configs[0]), stoppable=True)
+
+    export_metrics(args.metrics_file, merge=True)
+    return exit_code
+
+
 if __name__ == "__main__":
     sys.exit(main())
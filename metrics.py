@@ -0,0 +1,475 @@
+"""
+Metrics module for timing and sizing the stages of a run.
+
+This module keeps counters, gauges and histograms in memory and exports them
+in the Prometheus text format, either to a textfile-collector file after each
+run or over HTTP on a local port in daemon mode. Only the standard library is
+used, so importing it costs nothing on a cron cold start.
+"""
+
+import os
+import time
+import threading
+import logging
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) for duration histograms
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Upper bounds (bytes) for payload size histograms
+SIZE_BUCKETS = (1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000)
+
+# Upper bounds for player count histograms
+COUNT_BUCKETS = (10, 100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the Prometheus text format."""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    """
+    Format a label set like {stage="fetch",le="0.5"}.
+
+    Args:
+        names: Label names
+        values: Label values, in the same order
+        extra: Already formatted extra label (e.g. the bucket bound)
+
+    Returns:
+        str: Formatted labels, empty if there are none
+    """
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value the way Prometheus expects it."""
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric:
+    """Base class holding the samples of one metric, keyed by label values."""
+
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """
+        Initialize the metric.
+
+        Args:
+            name: Metric name (e.g. topvoter_run_seconds)
+            documentation: Help text
+            labelnames: Names of the labels every sample must provide
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _label_values(self, labels: Dict[str, str]) -> LabelValues:
+        """
+        Get the label values of a sample in label name order.
+
+        Args:
+            labels: Label values keyed by name
+
+        Returns:
+            tuple: Label values
+
+        Raises:
+            ValueError: If the labels don't match the metric's label names
+        """
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"Metric {self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> List[str]:
+        """
+        Render the sample lines of this metric.
+
+        Returns:
+            list: Lines in Prometheus text format
+        """
+        raise NotImplementedError
+
+    def render(self) -> str:
+        """
+        Render the metric with its HELP and TYPE lines.
+
+        Returns:
+            str: Metric in Prometheus text format
+        """
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return '\n'.join(lines)
+
+
+class Counter(Metric):
+    """Monotonically increasing count (e.g. HTTP responses by status)."""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str):
+        """
+        Increase the counter.
+
+        Args:
+            amount: Amount to add
+            **labels: Label values
+        """
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            return [
+                f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                for key, value in sorted(self._values.items())
+            ]
+
+
+class Gauge(Metric):
+    """Value that can go up and down (e.g. players in the last response)."""
+
+    kind = 'gauge'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: str):
+        """
+        Set the gauge.
+
+        Args:
+            value: New value
+            **labels: Label values
+        """
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            return [
+                f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                for key, value in sorted(self._values.items())
+            ]
+
+
+class Histogram(Metric):
+    """Distribution of observed values in cumulative buckets."""
+
+    kind = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DURATION_BUCKETS
+    ):
+        """
+        Initialize the histogram.
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Names of the labels every sample must provide
+            buckets: Sorted upper bounds of the buckets (+Inf is added automatically)
+        """
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        # Per label set: (bucket counts, sum, count)
+        self._values: Dict[LabelValues, Tuple[List[int], float, int]] = {}
+
+    def observe(self, value: float, **labels: str):
+        """
+        Record an observation.
+
+        Args:
+            value: Observed value (seconds, bytes, players, ...)
+            **labels: Label values
+        """
+        key = self._label_values(labels)
+        with self._lock:
+            counts, total, count = self._values.get(key) or ([0] * len(self.buckets), 0.0, 0)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            self._values[key] = (counts, total + value, count + 1)
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """
+        Observe the duration of a block in seconds, even if it raises.
+
+        Args:
+            **labels: Label values
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def samples(self) -> List[str]:
+        lines = []
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    bound_label = f'le="{_format_value(bound)}"'
+                    lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, bound_label)} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+                lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        """
+        Add a metric to the registry.
+
+        Args:
+            metric: Metric to add
+
+        Returns:
+            Metric: The metric, for assignment
+
+        Raises:
+            ValueError: If a metric with the same name is registered
+        """
+        if metric.name in self._metrics:
+            raise ValueError(f"Duplicate metric: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """
+        Render all metrics.
+
+        Returns:
+            str: Metrics in Prometheus text format
+        """
+        return '\n'.join(metric.render() for metric in self._metrics.values()) + '\n'
+
+    def render_merged(self, previous: Dict[str, Dict[str, float]]) -> str:
+        """
+        Render all metrics on top of the samples of an earlier process.
+
+        Counters and histograms continue from the previous values, so they stay
+        monotonic across cron runs; gauges take this process's value. Series
+        only the earlier process recorded (e.g. another tenant) are kept.
+
+        Args:
+            previous: Sample values keyed by metric name, then series (see read_textfile)
+
+        Returns:
+            str: Metrics in Prometheus text format
+        """
+        blocks = []
+        for metric in self._metrics.values():
+            earlier = previous.get(metric.name, {})
+            accumulate = metric.kind in ('counter', 'histogram')
+            lines = [f"# HELP {metric.name} {metric.documentation}", f"# TYPE {metric.name} {metric.kind}"]
+            current = set()
+            for line in metric.samples():
+                series, value = line.rsplit(' ', 1)
+                current.add(series)
+                if accumulate and series in earlier:
+                    value = _format_value(float(value) + earlier[series])
+                lines.append(f"{series} {value}")
+            lines.extend(f"{series} {_format_value(value)}" for series, value in earlier.items() if series not in current)
+            blocks.append('\n'.join(lines))
+        return '\n'.join(blocks) + '\n'
+
+    def write_textfile(self, path: str, merge: bool = False) -> bool:
+        """
+        Write all metrics for the node_exporter textfile collector.
+
+        The file is replaced in one step so the collector never reads half a file.
+        A cron run is a fresh process whose counters start at zero, so it merges
+        its metrics into the file's previous samples (under a lock, as tenants'
+        processes may finish at the same time). The daemon keeps its metrics in
+        memory for its whole life and writes them as they are.
+
+        Args:
+            path: Target file (should end in .prom)
+            merge: Continue the counters and histograms of the existing file
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        temp_file = f"{path}.{os.getpid()}.tmp"
+        lock = None
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            if merge:
+                from run_lock import RunLock, WAIT
+                lock = RunLock(f"{path}.lock", WAIT, timeout=30)
+                if not lock.acquire():
+                    logger.error(f"Failed to write metrics file {path}: another process kept it locked")
+                    return False
+                text = self.render_merged(read_textfile(path))
+            else:
+                text = self.render()
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(temp_file, path)
+            return True
+        except OSError as e:
+            logger.error(f"Failed to write metrics file {path}: {e}")
+            return False
+        finally:
+            if lock is not None:
+                lock.release()
+
+    def serve(self, port: int, host: str = '127.0.0.1'):
+        """
+        Serve the metrics over HTTP from a background thread.
+
+        Args:
+            port: Local port to listen on
+            host: Interface to bind (localhost by default)
+
+        Returns:
+            ThreadingHTTPServer: The running server (call shutdown() to stop it)
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = registry.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(f"Metrics request: {format % args}")
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=server.serve_forever, name='metrics', daemon=True).start()
+        logger.info(f"Serving metrics on http://{host}:{port}/metrics")
+        return server
+
+
+def read_textfile(path: str) -> Dict[str, Dict[str, float]]:
+    """
+    Read the samples of a textfile written by write_textfile.
+
+    Args:
+        path: Metrics file
+
+    Returns:
+        dict: Sample values keyed by metric name, then series (name and labels);
+            empty if the file is missing or unreadable
+    """
+    samples: Dict[str, Dict[str, float]] = {}
+    family: Optional[Dict[str, float]] = None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.rstrip('\n')
+                if line.startswith('# TYPE '):
+                    family = samples.setdefault(line.split(' ')[2], {})
+                elif line and not line.startswith('#') and family is not None:
+                    series, value = line.rsplit(' ', 1)
+                    family[series] = float(value)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring previous metrics file {path}: {e}")
+        return {}
+    return samples
+
+
+# Registry exported by the bot
+REGISTRY = MetricsRegistry()
+
+RUN_SECONDS = REGISTRY.register(Histogram(
+    'topvoter_run_seconds', "Duration of a whole run.", ['server', 'result']))
+LAST_RUN_TIMESTAMP = REGISTRY.register(Gauge(
+    'topvoter_last_run_timestamp_seconds', "Unix time the last run finished.", ['server', 'result']))
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    'topvoter_stage_seconds', "Duration of a pipeline stage of a run.", ['server', 'stage']))
+HTTP_REQUEST_SECONDS = REGISTRY.register(Histogram(
+    'topvoter_http_request_seconds', "Duration of HTTP requests.", ['server', 'target']))
+HTTP_PAYLOAD_BYTES = REGISTRY.register(Histogram(
+    'topvoter_http_payload_bytes', "Size of the API response or Discord request body.",
+    ['server', 'target'], SIZE_BUCKETS))
+HTTP_RESPONSES = REGISTRY.register(Counter(
+    'topvoter_http_responses_total', "HTTP responses by status code ('error' if none was received).",
+    ['server', 'target', 'status']))
+RANKING_SECONDS = REGISTRY.register(Histogram(
+    'topvoter_ranking_seconds', "Duration of validating, consolidating and sorting players.", ['server']))
+PLAYERS = REGISTRY.register(Histogram(
+    'topvoter_players', "Players per ranking step (received, valid, consolidated).",
+    ['server', 'step'], COUNT_BUCKETS))
+REJECTED_PLAYERS = REGISTRY.register(Counter(
+    'topvoter_rejected_players_total', "Player rows dropped by validation, by reason.", ['server', 'reason']))
+RENDER_CACHE = REGISTRY.register(Counter(
+    'topvoter_render_cache_total', "Embed renders served from the render cache (hit) or rendered (miss).", ['result']))
+SNAPSHOT_SECONDS = REGISTRY.register(Histogram(
+    'topvoter_snapshot_seconds', "Duration of snapshot file I/O.", ['operation']))
+SNAPSHOT_BYTES = REGISTRY.register(Histogram(
+    'topvoter_snapshot_bytes', "Size of snapshot files read or written.", ['operation'], SIZE_BUCKETS))
+
+
+def observe_response(server: str, target: str, response, started: float, payload_bytes: Optional[int] = None):
+    """
+    Record the duration, payload size and status of an HTTP response.
+
+    Args:
+        server: Server (tenant) name the request was made for
+        target: What was called ('api' or 'discord')
+        response: requests.Response, None if the request failed without a response
+        started: time.perf_counter() value taken before the request
+        payload_bytes: Size of the payload to record, if known
+    """
+    HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, server=server, target=target)
+    HTTP_RESPONSES.inc(server=server, target=target, status=str(response.status_code) if response is not None else 'error')
+    if payload_bytes is not None:
+        HTTP_PAYLOAD_BYTES.observe(payload_bytes, server=server, target=target)
+
+
+def observe_run(server: str, exit_code: int, seconds: float):
+    """
+    Record the duration and outcome of a whole run.
+
+    Args:
+        server: Server (tenant) name
+        exit_code: Exit code of the run
+        seconds: Duration of the run
+    """
+    result = 'success' if exit_code == 0 else 'failure'
+    RUN_SECONDS.observe(seconds, server=server, result=result)
+    LAST_RUN_TIMESTAMP.set(time.time(), server=server, result=result)
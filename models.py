@@ -0,0 +1,125 @@
+"""
+Models module with the player records passed through a run.
+
+Players travel from the ranking through snapshots, trackers and embeds as
+slotted objects instead of dicts: a large roster takes a fraction of the
+memory, attribute access skips the key hashing, and a misspelled field
+raises AttributeError instead of silently reading nothing. Names are
+interned, so a name held by the ranking, the rank index and the snapshots
+is one string. Dicts only appear at the JSON edges (from_dict/to_dict).
+"""
+
+import sys
+from typing import Any, Dict, Optional
+
+# previous_rank of a player whose movement is not tracked (rank movement starts at #1)
+UNTRACKED = 0
+
+
+class Player:
+    """A ranked player of the current month."""
+
+    __slots__ = ('playername', 'votes', 'rank', 'previous_rank')
+
+    def __init__(self, playername: str, votes: int, rank: int = 0, previous_rank: Optional[int] = UNTRACKED):
+        """
+        Initialize a player.
+
+        Args:
+            playername: Consolidated player name
+            votes: Votes this month
+            rank: Rank in the ranking (0 until ranked)
+            previous_rank: Rank in the last post, None if new to it, UNTRACKED if not compared
+        """
+        self.playername = sys.intern(playername)
+        self.votes = votes
+        self.rank = rank
+        self.previous_rank = previous_rank
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Player':
+        """
+        Create a player from its JSON form.
+
+        Args:
+            data: Dictionary with playername and votes (rank and previous_rank optional)
+
+        Returns:
+            Player: The player
+        """
+        return cls(data['playername'], int(data['votes']), data.get('rank', 0), data.get('previous_rank', UNTRACKED))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get the JSON form of the player.
+
+        Returns:
+            dict: playername, votes and rank (and previous_rank when tracked)
+        """
+        data = {'playername': self.playername, 'votes': self.votes, 'rank': self.rank}
+        if self.previous_rank != UNTRACKED:
+            data['previous_rank'] = self.previous_rank
+        return data
+
+    def __eq__(self, other):
+        if not isinstance(other, Player):
+            return NotImplemented
+        return (self.playername, self.votes, self.rank, self.previous_rank) == \
+            (other.playername, other.votes, other.rank, other.previous_rank)
+
+    # Records are compared by value but mutated during a run (rank, votes,
+    # previous_rank), so they are deliberately unhashable like the dicts they
+    # replace; key sets and dicts by playername instead
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Player({self.playername!r}, votes={self.votes}, rank={self.rank})"
+
+
+class WeeklyPlayer:
+    """A player's votes over one week."""
+
+    __slots__ = ('playername', 'weekly_votes', 'total_votes', 'last_week_votes', 'rank')
+
+    def __init__(self, playername: str, weekly_votes: int, total_votes: int, last_week_votes: int, rank: int = 0):
+        """
+        Initialize a weekly entry.
+
+        Args:
+            playername: Consolidated player name
+            weekly_votes: Votes gained during the week
+            total_votes: Votes at the end of the week
+            last_week_votes: Votes at the start of the week
+            rank: Rank by weekly votes (0 until ranked)
+        """
+        self.playername = sys.intern(playername)
+        self.weekly_votes = weekly_votes
+        self.total_votes = total_votes
+        self.last_week_votes = last_week_votes
+        self.rank = rank
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get the JSON form of the weekly entry.
+
+        Returns:
+            dict: playername, weekly_votes, total_votes, last_week_votes and rank
+        """
+        return {
+            'playername': self.playername,
+            'weekly_votes': self.weekly_votes,
+            'total_votes': self.total_votes,
+            'last_week_votes': self.last_week_votes,
+            'rank': self.rank,
+        }
+
+    def __eq__(self, other):
+        if not isinstance(other, WeeklyPlayer):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    # Unhashable on purpose, like Player
+    __hash__ = None
+
+    def __repr__(self):
+        return f"WeeklyPlayer({self.playername!r}, weekly_votes={self.weekly_votes}, rank={self.rank})"
@@ -0,0 +1,244 @@
+"""
+Pipeline module for running the stages of a run as a small dependency graph.
+
+Stages whose inputs are ready run concurrently on a thread pool, so independent
+I/O (API fetch, snapshot loads, webhook POSTs) overlaps instead of queueing.
+"""
+
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, List, Sequence
+import profiling
+
+logger = logging.getLogger(__name__)
+
+
+class Stage:
+    """A named unit of work with data dependencies and ordering constraints."""
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        depends: Sequence[str] = (),
+        after: Sequence[str] = ()
+    ):
+        """
+        Initialize a stage.
+
+        Args:
+            name: Unique stage name
+            func: Called with the results of `depends`, in order
+            depends: Stages whose results this stage consumes; if one fails, this
+                stage is skipped
+            after: Stages that must finish first, successfully or not, without
+                passing a result (e.g. post order)
+        """
+        self.name = name
+        self.func = func
+        self.depends = tuple(depends)
+        self.after = tuple(after)
+
+    @property
+    def prerequisites(self) -> tuple:
+        """All stages that must finish before this one runs."""
+        return self.depends + self.after
+
+
+class PipelineResult:
+    """Results, errors and timings of a pipeline run."""
+
+    def __init__(self):
+        """Initialize an empty result."""
+        self.results: Dict[str, Any] = {}
+        self.errors: Dict[str, BaseException] = {}
+        self.skipped: List[str] = []
+        self.durations: Dict[str, float] = {}
+
+    def succeeded(self, name: str) -> bool:
+        """
+        Check whether a stage ran without raising.
+
+        Args:
+            name: Stage name
+
+        Returns:
+            bool: True if the stage completed
+        """
+        return name in self.results
+
+    def finished(self, name: str) -> bool:
+        """
+        Check whether a stage is done, whether it succeeded, failed or was skipped.
+
+        Args:
+            name: Stage name
+
+        Returns:
+            bool: True if the stage will not run anymore
+        """
+        return name in self.results or name in self.errors or name in self.skipped
+
+    def blocked(self, stage: 'Stage') -> bool:
+        """
+        Check whether a stage can't run because a stage it consumes failed or was skipped.
+
+        Args:
+            stage: Stage to check
+
+        Returns:
+            bool: True if the stage has to be skipped
+        """
+        return any(name in self.errors or name in self.skipped for name in stage.depends)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """
+        Get the result of a stage.
+
+        Args:
+            name: Stage name
+            default: Value returned if the stage did not complete
+
+        Returns:
+            Any: Stage result or default
+        """
+        return self.results.get(name, default)
+
+
+class Pipeline:
+    """Runs stages concurrently as soon as their prerequisites have completed."""
+
+    def __init__(self, max_workers: int = 4):
+        """
+        Initialize the pipeline.
+
+        Args:
+            max_workers: Maximum number of stages running at the same time
+                (1 runs the stages inline, in the order they were added)
+        """
+        self.max_workers = max_workers
+        self.stages: Dict[str, Stage] = {}
+
+    def add(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        depends: Sequence[str] = (),
+        after: Sequence[str] = ()
+    ) -> 'Pipeline':
+        """
+        Add a stage to the pipeline.
+
+        Args:
+            name: Unique stage name
+            func: Called with the results of `depends`, in order
+            depends: Stages whose results this stage consumes
+            after: Stages that must finish first, successfully or not, without passing a result
+
+        Returns:
+            Pipeline: self, for chaining
+
+        Raises:
+            ValueError: If the name is taken or a prerequisite is unknown
+        """
+        if name in self.stages:
+            raise ValueError(f"Duplicate pipeline stage: {name}")
+
+        stage = Stage(name, func, depends, after)
+        for prerequisite in stage.prerequisites:
+            if prerequisite not in self.stages:
+                raise ValueError(f"Stage '{name}' depends on unknown stage '{prerequisite}'")
+
+        self.stages[name] = stage
+        return self
+
+    def _run_stage(self, stage: Stage, result: PipelineResult) -> Any:
+        """
+        Run a single stage and record its duration.
+
+        Args:
+            stage: Stage to run
+            result: Pipeline result holding the dependency results
+
+        Returns:
+            Any: The stage's return value
+        """
+        started = time.perf_counter()
+        try:
+            with profiling.profile_thread():
+                return stage.func(*(result.results[name] for name in stage.depends))
+        finally:
+            result.durations[stage.name] = time.perf_counter() - started
+
+    def _run_inline(self, result: PipelineResult):
+        """
+        Run all stages one after another in the calling thread.
+
+        Stages are added after their prerequisites, so insertion order is a valid order.
+
+        Args:
+            result: Pipeline result to fill in
+        """
+        for name, stage in self.stages.items():
+            if result.blocked(stage):
+                logger.warning(f"Skipping stage '{name}' because a dependency failed")
+                result.skipped.append(name)
+                continue
+            try:
+                result.results[name] = self._run_stage(stage, result)
+            except Exception as e:
+                logger.error(f"Stage '{name}' failed: {e}")
+                result.errors[name] = e
+
+    def run(self) -> PipelineResult:
+        """
+        Run all stages, in parallel where the dependency graph allows it.
+
+        A failed stage is logged and every stage depending on it is skipped;
+        stages only ordered after it, and unrelated stages, still run.
+
+        Returns:
+            PipelineResult: Results, errors and timings of all stages
+        """
+        result = PipelineResult()
+        if self.max_workers <= 1:
+            # Nothing to overlap: skip the thread pool (rendering, simulations)
+            self._run_inline(result)
+            return result
+
+        pending = dict(self.stages)
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='stage') as executor:
+            while pending or running:
+                # Skip stages whose dependencies failed or were skipped
+                for name, stage in list(pending.items()):
+                    if result.blocked(stage):
+                        logger.warning(f"Skipping stage '{name}' because a dependency failed")
+                        result.skipped.append(name)
+                        del pending[name]
+
+                # Start every stage whose dependencies succeeded and whose ordering
+                # prerequisites finished
+                for name, stage in list(pending.items()):
+                    if (all(p in result.results for p in stage.depends)
+                            and all(result.finished(p) for p in stage.after)):
+                        running[executor.submit(self._run_stage, stage, result)] = name
+                        del pending[name]
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        result.results[name] = future.result()
+                        logger.debug(f"Stage '{name}' finished in {result.durations[name] * 1000:.1f} ms")
+                    except Exception as e:
+                        logger.error(f"Stage '{name}' failed: {e}")
+                        result.errors[name] = e
+
+        return result
+
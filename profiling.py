@@ -0,0 +1,202 @@
+"""
+Profiling module for opt-in CPU and memory profiling of runs.
+
+Set PROFILE_CPU=1 to record a run with cProfile and/or PROFILE_MEMORY=1 to
+trace its allocations with tracemalloc. Each profiled run writes a pstats dump
+and a text report (top functions, top allocation sites, peak memory) to a
+timestamped file under PROFILE_DIR, keeping only the newest PROFILE_KEEP runs.
+The flags are read from the environment or .env; with both off, profile_run()
+only looks up two settings.
+"""
+
+import os
+import re
+import io
+import threading
+import logging
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterator, List, Optional
+from config import get_setting, get_int_setting
+
+logger = logging.getLogger(__name__)
+
+# Number of functions and allocation sites listed in the text report
+REPORT_LIMIT = 30
+
+# Profilers of the CPU-profiled run in progress (one per thread), None when inactive
+_profiles: Optional[List] = None
+_profiles_lock = threading.Lock()
+
+
+def _env_flag(name: str) -> bool:
+    """
+    Check whether an environment flag is switched on.
+
+    Args:
+        name: Environment variable name
+
+    Returns:
+        bool: True for 1/true/yes/on
+    """
+    return get_setting(name).strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def is_enabled() -> bool:
+    """
+    Check whether any profiling flag is switched on.
+
+    Returns:
+        bool: True if PROFILE_CPU or PROFILE_MEMORY is set
+    """
+    return _env_flag('PROFILE_CPU') or _env_flag('PROFILE_MEMORY')
+
+
+@contextmanager
+def profile_thread() -> Iterator[None]:
+    """
+    Profile the calling worker thread while a CPU-profiled run is active.
+
+    cProfile only sees the thread that enabled it, so pipeline stages and
+    tenant workers wrap their work in this to be part of the run's profile.
+    """
+    profiles = _profiles
+    if profiles is None:
+        yield
+        return
+
+    import cProfile
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        with _profiles_lock:
+            profiles.append(profiler)
+
+
+@contextmanager
+def profile_run(name: str = 'run') -> Iterator[None]:
+    """
+    Profile the enclosed run if PROFILE_CPU and/or PROFILE_MEMORY is set.
+
+    Only one run is profiled at a time; nested or concurrent calls are not profiled.
+
+    Args:
+        name: Name used in the report file names (e.g. the server name)
+    """
+    global _profiles
+    cpu = _env_flag('PROFILE_CPU')
+    memory = _env_flag('PROFILE_MEMORY')
+    if not (cpu or memory) or _profiles is not None:
+        yield
+        return
+
+    profile_dir = get_setting('PROFILE_DIR', 'profiling')
+    keep = get_int_setting('PROFILE_KEEP', 20)
+    started = datetime.now()
+
+    if memory:
+        import tracemalloc
+        tracemalloc.start()
+
+    profiles: List = []
+    if cpu:
+        import cProfile
+        profiler = cProfile.Profile()
+        _profiles = profiles
+        profiler.enable()
+
+    try:
+        yield
+    finally:
+        if cpu:
+            profiler.disable()
+            _profiles = None
+            profiles.append(profiler)
+
+        snapshot = peak = None
+        if memory:
+            snapshot = tracemalloc.take_snapshot()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+        try:
+            write_report(profile_dir, name, started, profiles, snapshot, peak)
+            rotate_reports(profile_dir, keep)
+        except OSError as e:
+            logger.error(f"Failed to write profiling report to {profile_dir}: {e}")
+
+
+def write_report(
+    profile_dir: str,
+    name: str,
+    started: datetime,
+    profiles: List,
+    snapshot=None,
+    peak: Optional[int] = None
+) -> str:
+    """
+    Write the profiling results of a run.
+
+    Args:
+        profile_dir: Directory for the reports
+        name: Run name
+        started: Start time of the run (used in the file names)
+        profiles: cProfile profilers of the run (empty if CPU profiling was off)
+        snapshot: tracemalloc snapshot taken at the end of the run (None if off)
+        peak: Peak traced memory in bytes (None if off)
+
+    Returns:
+        str: Path of the text report (the pstats dump sits next to it as .prof)
+    """
+    import pstats
+
+    os.makedirs(profile_dir, exist_ok=True)
+    safe_name = re.sub(r'[^A-Za-z0-9_-]+', '-', name).strip('-') or 'run'
+    stem = os.path.join(profile_dir, f"{started.strftime('%Y%m%d_%H%M%S_%f')}_{safe_name}")
+    report = io.StringIO()
+    report.write(f"Profile of {name} started at {started.isoformat()}\n")
+
+    if profiles:
+        stats = pstats.Stats(profiles[0], stream=report)
+        for profile in profiles[1:]:
+            stats.add(profile)
+        stats.dump_stats(f"{stem}.prof")
+        report.write(f"\n=== CPU: top {REPORT_LIMIT} functions by cumulative time ({len(profiles)} thread(s)) ===\n")
+        stats.sort_stats('cumulative').print_stats(REPORT_LIMIT)
+
+    if snapshot is not None:
+        report.write(f"\n=== Memory: peak {peak / 1024 / 1024:.2f} MiB ===\n")
+        report.write(f"Top {REPORT_LIMIT} allocation sites still held at the end of the run:\n")
+        for statistic in snapshot.statistics('lineno')[:REPORT_LIMIT]:
+            report.write(f"{statistic}\n")
+
+    with open(f"{stem}.txt", 'w', encoding='utf-8') as f:
+        f.write(report.getvalue())
+
+    logger.info(f"Profiling report written: {stem}.txt")
+    return f"{stem}.txt"
+
+
+def rotate_reports(profile_dir: str, keep: int):
+    """
+    Delete all but the newest profiled runs.
+
+    Args:
+        profile_dir: Directory holding the reports
+        keep: Number of runs to keep
+    """
+    runs = sorted({
+        os.path.splitext(filename)[0]
+        for filename in os.listdir(profile_dir)
+        if filename.endswith(('.prof', '.txt'))
+    })
+
+    for stem in runs[:max(0, len(runs) - keep)]:
+        for extension in ('.prof', '.txt'):
+            path = os.path.join(profile_dir, stem + extension)
+            if os.path.exists(path):
+                os.remove(path)
+        logger.info(f"Deleted old profiling report: {stem}")
@@ -0,0 +1,127 @@
+"""
+Rank Tracker module for rank movement between consecutive runs.
+
+The last posted ranking is kept as a compact list of player names in rank
+order. The next run diffs its ranking against it in one pass, so the embed
+can show who moved up or down without loading any snapshot.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import logging
+from models import Player
+
+logger = logging.getLogger(__name__)
+
+# Rank index file name inside a snapshots directory
+RANK_INDEX_FILENAME = 'rank_index.json'
+
+
+class RankTracker:
+    """Remembers the last posted ranking and annotates rank movement."""
+
+    def __init__(self, index_file: str = os.path.join("snapshots", RANK_INDEX_FILENAME)):
+        """
+        Initialize the tracker and load the previous ranking.
+
+        Args:
+            index_file: Path to the JSON file storing the ranking
+        """
+        self.index_file = index_file
+        self._month, self._ranks = self._load()
+        # Ranking diffed by the current run, saved once it was posted
+        self._pending: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        """
+        Load the previous ranking from disk.
+
+        Returns:
+            tuple: (month as YYYY-MM or None, rank keyed by player name)
+        """
+        if not os.path.exists(self.index_file):
+            return None, {}
+
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            return index['month'], {name: rank for rank, name in enumerate(index['names'], start=1)}
+        except Exception as e:
+            logger.error(f"Failed to load rank index {self.index_file}: {e}")
+            return None, {}
+
+    def diff(
+        self,
+        ranked_players: List[Player],
+        today: datetime,
+        max_count: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Compare a ranking with the previous one.
+
+        Sets previous_rank (None for players new to the ranking) on the top
+        players and finds the overtakes: one for every player of the previous
+        top that a shown player climbed past, so a jump from #5 to #2 passes
+        three players. Votes reset on the 1st, so the first ranking of a month
+        is not compared with the last month's.
+
+        Args:
+            ranked_players: Full ranking of this run, sorted by rank
+            today: Date of the run
+            max_count: Number of top players that are shown
+
+        Returns:
+            list: Overtake events ({'playername', 'overtaken', 'rank'}), best rank first,
+                then by the overtaken player's previous rank
+        """
+        month = today.strftime('%Y-%m')
+        self._pending = {'month': month, 'names': [player.playername for player in ranked_players]}
+
+        if month != self._month:
+            return []
+
+        current_ranks = {player.playername: player.rank for player in ranked_players}
+        # Names of the previous top, best rank first
+        previous_top = [name for rank, name in sorted(
+            (rank, name) for name, rank in self._ranks.items() if rank <= max_count)]
+
+        overtakes = []
+        for player in ranked_players[:max_count]:
+            player.previous_rank = self._ranks.get(player.playername)
+            if player.previous_rank is None:
+                continue
+            # Everyone of the previous top that was ahead and is behind now was passed
+            for overtaken in previous_top[:player.previous_rank - 1]:
+                if current_ranks.get(overtaken, 0) > player.rank:
+                    overtakes.append({
+                        'playername': player.playername,
+                        'overtaken': overtaken,
+                        'rank': player.rank,
+                    })
+
+        for event in overtakes:
+            logger.info(f"Overtake: {event['playername']} passed {event['overtaken']} for #{event['rank']}")
+        return overtakes
+
+    def commit(self):
+        """Save the ranking diffed by this run as the one the next run compares with."""
+        with self._lock:
+            if self._pending is None:
+                return
+            index, self._pending = self._pending, None
+
+            directory = os.path.dirname(self.index_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            temp_file = f"{self.index_file}.tmp"
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(temp_file, self.index_file)
+
+            self._month = index['month']
+            self._ranks = {name: rank for rank, name in enumerate(index['names'], start=1)}
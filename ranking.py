@@ -4,12 +4,137 @@ Ranking module for validating and sorting player voting data.
 This module processes raw API data and prepares it for display.
 """
 
-from typing import List, Dict, Any
+import heapq
+import logging
+from collections import Counter
+from operator import attrgetter
+from typing import Callable, List, Dict, Any, Optional, Sequence, Tuple
+import metrics
+from models import Player
+from validation import PLAYER_VALIDATOR, quarantine
+
+logger = logging.getLogger(__name__)
+
+
+class RankingView:
+    """A leaderboard cut from a ranking (e.g. top 10, top 50, newcomers)."""
+
+    __slots__ = ('name', 'size', 'where', 'key')
+
+    def __init__(
+        self,
+        name: str,
+        size: Optional[int] = 10,
+        where: Optional[Callable[[Player], bool]] = None,
+        key: Optional[Callable[[Player], Any]] = None
+    ):
+        """
+        Define a view.
+
+        Args:
+            name: Name the view's players are returned under
+            size: Maximum number of players (None for all)
+            where: Only players this returns True for (None for all)
+            key: Sort key, highest first (None for votes, which also sets the ranks)
+        """
+        self.name = name
+        self.size = size
+        self.where = where
+        self.key = key
+
+
+def _fill(
+    ordered: List[Player],
+    views: List[RankingView],
+    results: Dict[str, List[Player]],
+    set_ranks: bool
+) -> List[RankingView]:
+    """
+    Fill views from the front of an ordering.
+
+    Args:
+        ordered: Players, highest key first
+        views: Views sharing that ordering
+        results: Players of each view, filled in place
+        set_ranks: Set each player's rank to its position
+
+    Returns:
+        list: Views still short of players when the ordering ran out
+    """
+    pending = views
+    for rank, player in enumerate(ordered, start=1):
+        if set_ranks:
+            player.rank = rank
+        remaining = []
+        for view in pending:
+            selected = results[view.name]
+            if view.where is None or view.where(player):
+                selected.append(player)
+            if view.size is None or len(selected) < view.size:
+                remaining.append(view)
+        pending = remaining
+        if not pending:
+            break
+    return pending
+
+
+def rank_views(players: List[Player], views: Sequence[RankingView]) -> Dict[str, List[Player]]:
+    """
+    Fill several views from one ordering of the players.
+
+    Views with the same sort key share one ordering, cut only as deep as
+    the largest of them: a bounded set of views costs one heapq.nlargest
+    pass (deepened only if a filtered view runs short), and a view of every
+    player one full sort. The player objects are shared between the views;
+    ranks are positions in the votes order.
+
+    Args:
+        players: Consolidated players
+        views: Views to fill
+
+    Returns:
+        dict: Players of each view keyed by view name, in view order
+    """
+    results: Dict[str, List[Player]] = {view.name: [] for view in views}
+    groups: Dict[Any, List[RankingView]] = {}
+    for view in views:
+        if view.size is None or view.size > 0:
+            groups.setdefault(view.key, []).append(view)
+
+    for key, group in groups.items():
+        sort_key = key or attrgetter('votes')
+        if any(view.size is None for view in group):
+            _fill(sorted(players, key=sort_key, reverse=True), group, results, key is None)
+            continue
+
+        depth = max(view.size for view in group)
+        while True:
+            ordered = heapq.nlargest(depth, players, key=sort_key)
+            if not _fill(ordered, group, results, key is None) or depth >= len(players):
+                break
+            # A filtered view ran short: start over with a deeper cut
+            for view in group:
+                results[view.name] = []
+            depth *= 4
+    return results
 
 
 class RankingProcessor:
     """Processes and validates ranking data from API responses."""
 
+    def __init__(self, quarantine_file: Optional[str] = None, server: str = 'default'):
+        """
+        Initialize the processor.
+
+        Args:
+            quarantine_file: JSONL file rejected player rows are appended to (None to skip)
+            server: Server (tenant) name the ranking metrics are recorded under
+        """
+        self.quarantine_file = quarantine_file
+        self.server = server
+        # Rejected player rows of the last processed response, by reason
+        self.rejections: Counter = Counter()
+
     @staticmethod
     def validate_response(data: Dict[str, Any]) -> bool:
         """
@@ -43,20 +168,7 @@ class RankingProcessor:
         Returns:
             bool: True if valid, False otherwise
         """
-        if not isinstance(player, dict):
-            return False
-
-        if 'playername' not in player or not player.get('playername'):
-            return False
-
-        if 'votes' not in player:
-            return False
-
-        try:
-            int(player['votes'])
-            return True
-        except (ValueError, TypeError):
-            return False
+        return PLAYER_VALIDATOR.reason(player) is None
 
     def normalize_player_name(self, playername: str) -> str:
         """
@@ -72,112 +184,124 @@ class RankingProcessor:
             return playername.split('~')[0]
         return playername
 
-    def consolidate_players(self, players: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def consolidate_players(self, players: List[Dict[str, Any]]) -> List[Player]:
         """
         Consolidate players with same normalized names by combining their votes.
         
         Args:
-            players: List of player dictionaries
+            players: List of player dictionaries from the API response
             
         Returns:
-            list: List of consolidated players with combined votes
+            list: Consolidated players with combined votes
         """
-        consolidated = {}
+        return self._consolidate(PLAYER_VALIDATOR.validate(players).rows)
+
+    def _consolidate(self, rows: List[Tuple[str, int]]) -> List[Player]:
+        """
+        Consolidate validated rows by normalized name.
+
+        Args:
+            rows: (playername, votes) rows as coerced by the validator
+
+        Returns:
+            list: Consolidated players with combined votes
+        """
+        consolidated: Dict[str, Player] = {}
+        # Original names merged into each player, for logging
+        original_names: Dict[str, List[str]] = {}
         
-        for player in players:
-            if not self.validate_player(player):
-                continue
-                
-            original_name = player['playername']
+        for original_name, votes in rows:
             normalized_name = self.normalize_player_name(original_name)
-            votes = int(player['votes'])
             
             if normalized_name in consolidated:
                 # Add votes to existing normalized player
-                consolidated[normalized_name]['votes'] += votes
-                # Keep track of all original names for logging
-                if consolidated[normalized_name]['original_names'] is None:
-                    consolidated[normalized_name]['original_names'] = [consolidated[normalized_name]['playername']]
-                consolidated[normalized_name]['original_names'].append(original_name)
+                consolidated[normalized_name].votes += votes
+                original_names[normalized_name].append(original_name)
             else:
                 # Create new entry with normalized name
-                consolidated[normalized_name] = {
-                    'playername': normalized_name,
-                    'votes': votes,
-                    'original_names': [original_name] if original_name != normalized_name else []
-                }
+                consolidated[normalized_name] = Player(normalized_name, votes)
+                original_names[normalized_name] = [original_name] if original_name != normalized_name else []
         
-        # Convert back to list format
-        consolidated_list = []
-        for normalized_name, player_data in consolidated.items():
-            consolidated_list.append({
-                'playername': player_data['playername'],
-                'votes': player_data['votes']
-            })
-            
-            # Log consolidation if multiple names were merged
-            if player_data.get('original_names') and len(player_data['original_names']) > 1:
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.info(f"Consolidated '{normalized_name}': {player_data['original_names']} -> {player_data['votes']} total votes")
+        # Log consolidation if multiple names were merged
+        for normalized_name, names in original_names.items():
+            if len(names) > 1:
+                logger.info(f"Consolidated '{normalized_name}': {names} -> {consolidated[normalized_name].votes} total votes")
         
-        return consolidated_list
+        return list(consolidated.values())
 
-    def process_rankings(self, data: Dict[str, Any], max_count: int = 10) -> List[Dict[str, Any]]:
+    def process_rankings(self, data: Dict[str, Any], max_count: Optional[int] = 10) -> List[Player]:
         """
         Process and sort player rankings with name normalization and vote consolidation.
 
         Args:
             data: Raw API response data
-            max_count: Maximum number of players to return
+            max_count: Maximum number of players to return (None for all)
 
         Returns:
-            list: Sorted list of player dictionaries with rank added
+            list: Sorted players with rank set
 
         Raises:
             ValueError: If the data is invalid
         """
-        if not self.validate_response(data):
-            raise ValueError("Invalid API response structure")
-
-        players = data.get('players', [])
+        return self.process_views(data, [RankingView('top', max_count)])['top']
 
-        # Filter out invalid players first
-        valid_players = [p for p in players if self.validate_player(p)]
-
-        if not valid_players:
-            return []
-
-        # Consolidate players with similar names (remove ~ suffixes)
-        consolidated_players = self.consolidate_players(valid_players)
-
-        # Sort players by votes (descending)
-        sorted_players = sorted(
-            consolidated_players,
-            key=lambda x: int(x['votes']),
-            reverse=True
-        )
-
-        # Limit to max_count
-        top_players = sorted_players[:max_count]
-
-        # Add rank to each player
-        for index, player in enumerate(top_players, start=1):
-            player['rank'] = index
+    def process_views(self, data: Dict[str, Any], views: Sequence[RankingView]) -> Dict[str, List[Player]]:
+        """
+        Consolidate the players once and fill several leaderboard views from them.
 
-        return top_players
+        Args:
+            data: Raw API response data
+            views: Views to fill (see RankingView)
 
+        Returns:
+            dict: Players of each view keyed by view name
 
-def get_top_rankings(data: Dict[str, Any], max_count: int = 10) -> List[Dict[str, Any]]:
+        Raises:
+            ValueError: If the data is invalid
+        """
+        with metrics.RANKING_SECONDS.time(server=self.server):
+            if not self.validate_response(data):
+                raise ValueError("Invalid API response structure")
+
+            players = data.get('players', [])
+
+            # Check and coerce every row once, keeping track of the rejected ones
+            result = PLAYER_VALIDATOR.validate(players)
+            metrics.PLAYERS.observe(len(players), server=self.server, step='received')
+            metrics.PLAYERS.observe(len(result.rows), server=self.server, step='valid')
+            self.rejections = result.rejections
+            if result.rejections:
+                logger.warning(f"Rejected {sum(result.rejections.values())} of {len(players)} player rows: {result.summary()}")
+                for reason, count in result.rejections.items():
+                    metrics.REJECTED_PLAYERS.inc(count, server=self.server, reason=reason)
+                if self.quarantine_file:
+                    quarantine(self.quarantine_file, result.rejected)
+
+            # Consolidate players with similar names (remove ~ suffixes)
+            consolidated_players = self._consolidate(result.rows)
+            metrics.PLAYERS.observe(len(consolidated_players), server=self.server, step='consolidated')
+
+            # One (partial) sort shared by every view
+            return rank_views(consolidated_players, views)
+
+
+def get_top_rankings(
+    data: Dict[str, Any],
+    max_count: Optional[int] = 10,
+    quarantine_file: Optional[str] = None,
+    server: str = 'default'
+) -> List[Player]:
     """
     Convenience function to get top rankings.
 
     Args:
         data: Raw API response data
-        max_count: Maximum number of players to return
+        max_count: Maximum number of players to return (None for all)
+        quarantine_file: JSONL file rejected player rows are appended to (None to skip)
+        server: Server (tenant) name the ranking metrics are recorded under
 
     Returns:
-        list: Sorted list of top players with ranks
+        list: Sorted top players with ranks
     """
-    processor = RankingProcessor()
+    processor = RankingProcessor(quarantine_file, server)
     return processor.process_rankings(data, max_count)
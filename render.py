@@ -0,0 +1,510 @@
+"""
+Render module turning rankings into Discord embeds.
+
+Every user-facing string comes from a locale pack, and each pack's line
+templates are compiled once into bound str.format methods. Rendered embeds
+are cached by a fingerprint of their content (players, overtakes, title,
+description, color), month and locale, so fanning one ranking out to
+several webhooks, or re-running with unchanged votes, reuses the rendered
+embed. Only the timestamp is stamped fresh on every use.
+"""
+
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, List, Optional
+import metrics
+from models import Player, WeeklyPlayer, UNTRACKED
+
+# Locale packs; 'de' is the bot's original wording (German months and
+# weekly analysis, English ranking fields), German throughout for the
+# monthly recap and spike alerts
+LOCALES: Dict[str, Dict[str, Any]] = {
+    'de': {
+        'months': ["Januar", "Februar", "März", "April", "Mai", "Juni",
+                   "Juli", "August", "September", "Oktober", "November", "Dezember"],
+        'title': "{title}: {month}",
+        'names_field': "Rank & Player",
+        'votes_field': "Votes",
+        'vote_line': "**{votes}** votes",
+        'overtakes_field': "Overtakes",
+        'overtake_line': "**{playername}** passed {overtaken} for #{rank}",
+        'moved_up': "▲{change}",
+        'moved_down': "▼{change}",
+        'new_entry': "NEU",
+        'footer': "TopGames Top Voters",
+        'no_voters': "No voters to display at this time.",
+        'weekly_title': "📊 Wöchentliche Voting-Analyse",
+        'weekly_description': "**Woche: {week_range}**\n\nHier sind die aktivsten Voter dieser Woche!",
+        'weekly_empty': "**Woche: {week_range}**\n\nKeine Aktivitäten in dieser Woche gefunden.",
+        'weekly_names_field': "🏃‍♂️ Aktivste Voter",
+        'weekly_votes_field': "📈 Wöchentliche Votes",
+        'weekly_vote_line': "**+{weekly_votes}** Votes",
+        'weekly_footer': "TopGames Weekly Analysis",
+        'recap_title': "📅 Monatsvergleich: {month} vs {previous}",
+        'recap_description': "Votes dieses Monats im Vergleich zum {previous}",
+        'recap_names_field': "Rang & Spieler",
+        'recap_votes_field': "Votes (Änderung)",
+        'recap_vote_line': "**{votes}** ({change:+d})",
+        'recap_new_line': "**{votes}** (NEU)",
+        'recap_footer': "TopGames Monatsrückblick",
+        'fame_title': "🏛️ Ruhmeshalle",
+        'fame_description': "Die aktivsten Voter aller Zeiten",
+        'fame_names_field': "Rang & Spieler",
+        'fame_votes_field': "Gesamt",
+        'fame_vote_line': "**{votes}** Votes · {months_active} Mon. · bester Rang #{best_rank}",
+        'fame_footer': "TopGames Ruhmeshalle",
+        'spike_title': "⚠️ Auffällig viele Votes",
+        'spike_line': "**{playername}**: {rate:.1f} Votes/h (sonst {usual_rate:.1f}, {votes} Votes diesen Monat)",
+        'spike_footer': "TopGames Vote-Überwachung",
+    },
+    'en': {
+        'months': ["January", "February", "March", "April", "May", "June",
+                   "July", "August", "September", "October", "November", "December"],
+        'title': "{title}: {month}",
+        'names_field': "Rank & Player",
+        'votes_field': "Votes",
+        'vote_line': "**{votes}** votes",
+        'overtakes_field': "Overtakes",
+        'overtake_line': "**{playername}** passed {overtaken} for #{rank}",
+        'moved_up': "▲{change}",
+        'moved_down': "▼{change}",
+        'new_entry': "NEW",
+        'footer': "TopGames Top Voters",
+        'no_voters': "No voters to display at this time.",
+        'weekly_title': "📊 Weekly Voting Analysis",
+        'weekly_description': "**Week: {week_range}**\n\nHere are this week's most active voters!",
+        'weekly_empty': "**Week: {week_range}**\n\nNo activity found this week.",
+        'weekly_names_field': "🏃‍♂️ Most Active Voters",
+        'weekly_votes_field': "📈 Weekly Votes",
+        'weekly_vote_line': "**+{weekly_votes}** votes",
+        'weekly_footer': "TopGames Weekly Analysis",
+        'recap_title': "📅 Month over Month: {month} vs {previous}",
+        'recap_description': "This month's votes compared with {previous}",
+        'recap_names_field': "Rank & Player",
+        'recap_votes_field': "Votes (change)",
+        'recap_vote_line': "**{votes}** ({change:+d})",
+        'recap_new_line': "**{votes}** (NEW)",
+        'recap_footer': "TopGames Monthly Recap",
+        'fame_title': "🏛️ Hall of Fame",
+        'fame_description': "All-time top voters",
+        'fame_names_field': "Rank & Player",
+        'fame_votes_field': "All-time",
+        'fame_vote_line': "**{votes}** votes · {months_active} mo · best #{best_rank}",
+        'fame_footer': "TopGames Hall of Fame",
+        'spike_title': "⚠️ Vote spike detected",
+        'spike_line': "**{playername}**: {rate:.1f} votes/h (usually {usual_rate:.1f}, {votes} votes this month)",
+        'spike_footer': "TopGames Vote Monitor",
+    },
+}
+
+DEFAULT_LOCALE = 'de'
+
+# Rank markers of the ranking and the weekly analysis
+MEDALS = {1: "🥇", 2: "🥈", 3: "🥉"}
+WEEKLY_MEDALS = {1: "🔥", 2: "⚡", 3: "🌟"}  # Fire, lightning, star for the most active
+
+# Rendered embeds kept across runs
+CACHE_SIZE = 64
+
+# Players shown in a weekly analysis
+WEEKLY_ROWS = 10
+
+# Players listed in one spike alert
+SPIKE_ROWS = 20
+
+
+def rank_display(rank: int) -> str:
+    """
+    Get display string for rank with medals for top 3.
+
+    Args:
+        rank: Player rank
+
+    Returns:
+        str: Medal or #rank
+    """
+    return MEDALS.get(rank) or f"#{rank}"
+
+
+def weekly_rank_display(rank: int) -> str:
+    """
+    Get display string for weekly rankings with different emojis.
+
+    Args:
+        rank: Player rank
+
+    Returns:
+        str: Weekly medal or #rank
+    """
+    return WEEKLY_MEDALS.get(rank) or f"#{rank}"
+
+
+class RenderCache:
+    """Bounded least-recently-used cache of rendered embeds."""
+
+    def __init__(self, size: int = CACHE_SIZE):
+        """
+        Initialize an empty cache.
+
+        Args:
+            size: Maximum number of embeds kept
+        """
+        self.size = size
+        self._entries: 'OrderedDict[Hashable, Dict[str, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, render: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Get a rendered embed, rendering it on a miss.
+
+        Args:
+            key: Content fingerprint, post kind, month and locale
+            render: Renders the embed (without timestamp)
+
+        Returns:
+            dict: Rendered embed, shared between callers (don't mutate it)
+        """
+        with self._lock:
+            embed = self._entries.get(key)
+            if embed is not None:
+                self._entries.move_to_end(key)
+                metrics.RENDER_CACHE.inc(result='hit')
+                return embed
+
+        embed = render()
+        metrics.RENDER_CACHE.inc(result='miss')
+        with self._lock:
+            self._entries[key] = embed
+            if len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+        return embed
+
+    def clear(self):
+        """Forget every rendered embed."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Embeds rendered by any webhook of the process
+CACHE = RenderCache()
+
+
+class Renderer:
+    """Embed renderer of one locale with precompiled line templates."""
+
+    def __init__(self, locale: str = DEFAULT_LOCALE, cache: RenderCache = CACHE):
+        """
+        Compile a locale pack.
+
+        Args:
+            locale: Key of LOCALES
+            cache: Cache of rendered embeds (shared by default)
+
+        Raises:
+            ValueError: If the locale has no pack
+        """
+        if locale not in LOCALES:
+            raise ValueError(f"Unknown locale '{locale}' (use {', '.join(LOCALES)})")
+        self.locale = locale
+        self.strings = LOCALES[locale]
+        self.cache = cache
+        self.months = self.strings['months']
+        self._title = self.strings['title'].format
+        self._vote_line = self.strings['vote_line'].format
+        self._overtake_line = self.strings['overtake_line'].format
+        self._moved_up = self.strings['moved_up'].format
+        self._moved_down = self.strings['moved_down'].format
+        self._weekly_description = self.strings['weekly_description'].format
+        self._weekly_empty = self.strings['weekly_empty'].format
+        self._weekly_vote_line = self.strings['weekly_vote_line'].format
+        self._recap_title = self.strings['recap_title'].format
+        self._recap_description = self.strings['recap_description'].format
+        self._recap_vote_line = self.strings['recap_vote_line'].format
+        self._recap_new_line = self.strings['recap_new_line'].format
+        self._fame_vote_line = self.strings['fame_vote_line'].format
+        self._spike_line = self.strings['spike_line'].format
+
+    def month_name(self, month: int) -> str:
+        """
+        Get the name of a month.
+
+        Args:
+            month: Month number (1-12)
+
+        Returns:
+            str: Month name in this locale
+        """
+        return self.months[month - 1]
+
+    def movement(self, player: Player) -> str:
+        """
+        Get the rank movement indicator of a player since the last post.
+
+        Args:
+            player: Player, with previous_rank set if movement is tracked
+
+        Returns:
+            str: ▲n, ▼n or the new-entry marker (NEU/NEW); empty if the rank is
+                unchanged or not tracked
+        """
+        previous_rank = player.previous_rank
+        if previous_rank == UNTRACKED:
+            return ""
+        if previous_rank is None:
+            return self.strings['new_entry']
+        change = previous_rank - player.rank
+        if change > 0:
+            return self._moved_up(change=change)
+        if change < 0:
+            return self._moved_down(change=-change)
+        return ""
+
+    @staticmethod
+    def stamp(embed: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Copy a cached embed with the current time in its timestamp slot.
+
+        Args:
+            embed: Rendered embed
+
+        Returns:
+            dict: Embed ready to send
+        """
+        return {**embed, "timestamp": datetime.utcnow().isoformat()}
+
+    def ranking(
+        self,
+        title: str,
+        description: str,
+        color: int,
+        players: List[Player],
+        date: Optional[datetime] = None,
+        overtakes: Optional[List[Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Render a ranking embed.
+
+        Args:
+            title: Embed title (the month is appended)
+            description: Embed description
+            color: Embed color (decimal format)
+            players: Ranked players (with previous_rank when rank movement is tracked)
+            date: Date whose month is shown in the title (defaults to today)
+            overtakes: Overtake events since the last post (see RankTracker.diff)
+
+        Returns:
+            dict: Discord embed structure
+        """
+        month = (date or datetime.now()).month
+        shown_overtakes = (overtakes or [])[:3]
+        key = (
+            'ranking', self.locale, month, title, description, color,
+            tuple((player.rank, player.playername, player.votes, player.previous_rank) for player in players),
+            tuple((event['playername'], event['overtaken'], event['rank']) for event in shown_overtakes),
+        )
+
+        def render() -> Dict[str, Any]:
+            names_list = []
+            votes_list = []
+            for player in players:
+                movement = self.movement(player)
+                name_line = f"{rank_display(player.rank)} {player.playername}"
+                names_list.append(f"{name_line} {movement}" if movement else name_line)
+                votes_list.append(self._vote_line(votes=player.votes))
+
+            fields = []
+            if names_list:
+                fields.append({"name": self.strings['names_field'], "value": "\n".join(names_list), "inline": True})
+                fields.append({"name": self.strings['votes_field'], "value": "\n".join(votes_list), "inline": True})
+            if shown_overtakes:
+                fields.append({
+                    "name": self.strings['overtakes_field'],
+                    "value": "\n".join(self._overtake_line(**event) for event in shown_overtakes),
+                    "inline": False
+                })
+
+            return {
+                "title": self._title(title=title, month=self.month_name(month)),
+                "description": description,
+                "color": color,
+                "fields": fields,
+                "timestamp": None,
+                "footer": {"text": self.strings['footer']},
+            }
+
+        return self.stamp(self.cache.get(key, render))
+
+    def empty_ranking(self, title: str, color: int) -> Dict[str, Any]:
+        """
+        Render the embed posted when there are no voters.
+
+        Args:
+            title: Embed title
+            color: Embed color
+
+        Returns:
+            dict: Discord embed structure
+        """
+        return self.stamp({"title": title, "description": self.strings['no_voters'], "color": color, "timestamp": None})
+
+    def weekly(self, weekly_players: List[WeeklyPlayer], week_range: str, color: int) -> Dict[str, Any]:
+        """
+        Render a weekly analysis embed.
+
+        Args:
+            weekly_players: Players ranked by weekly votes
+            week_range: Date range string (e.g., "17.11 - 23.11.2025")
+            color: Embed color
+
+        Returns:
+            dict: Discord embed structure
+        """
+        shown = weekly_players[:WEEKLY_ROWS]
+        key = (
+            'weekly', self.locale, week_range, color,
+            tuple((player.rank, player.playername, player.weekly_votes) for player in shown),
+        )
+
+        def render() -> Dict[str, Any]:
+            embed = {"title": self.strings['weekly_title']}
+            if not shown:
+                embed["description"] = self._weekly_empty(week_range=week_range)
+                embed["color"] = color
+            else:
+                names_list = [f"{weekly_rank_display(player.rank)} {player.playername}" for player in shown]
+                votes_list = [self._weekly_vote_line(weekly_votes=player.weekly_votes) for player in shown]
+                embed["description"] = self._weekly_description(week_range=week_range)
+                embed["color"] = color
+                embed["fields"] = [
+                    {"name": self.strings['weekly_names_field'], "value": "\n".join(names_list), "inline": True},
+                    {"name": self.strings['weekly_votes_field'], "value": "\n".join(votes_list), "inline": True},
+                ]
+            embed["timestamp"] = None
+            embed["footer"] = {"text": self.strings['weekly_footer']}
+            return embed
+
+        return self.stamp(self.cache.get(key, render))
+
+    def month_over_month(self, rows: List[Dict[str, Any]], month: datetime, color: int) -> Dict[str, Any]:
+        """
+        Render a month's top players compared with the month before.
+
+        Args:
+            rows: Rows from AggregateStore.month_over_month
+            month: Any date in the month
+            color: Embed color
+
+        Returns:
+            dict: Discord embed structure
+        """
+        key = (
+            'month_over_month', self.locale, month.month, color,
+            tuple((row['rank'], row['playername'], row['votes'], row['change']) for row in rows),
+        )
+
+        def render() -> Dict[str, Any]:
+            previous = self.month_name(12 if month.month == 1 else month.month - 1)
+            names_list = [f"{rank_display(row['rank'])} {row['playername']}" for row in rows]
+            change_list = [
+                self._recap_new_line(**row) if row['change'] is None else self._recap_vote_line(**row)
+                for row in rows
+            ]
+            return {
+                "title": self._recap_title(month=self.month_name(month.month), previous=previous),
+                "description": self._recap_description(previous=previous),
+                "color": color,
+                "fields": [
+                    {"name": self.strings['recap_names_field'], "value": "\n".join(names_list) or "-", "inline": True},
+                    {"name": self.strings['recap_votes_field'], "value": "\n".join(change_list) or "-", "inline": True},
+                ],
+                "timestamp": None,
+                "footer": {"text": self.strings['recap_footer']},
+            }
+
+        return self.stamp(self.cache.get(key, render))
+
+    def hall_of_fame(self, rows: List[Dict[str, Any]], color: int) -> Dict[str, Any]:
+        """
+        Render the all-time top players.
+
+        Args:
+            rows: Rows from AggregateStore.hall_of_fame
+            color: Embed color
+
+        Returns:
+            dict: Discord embed structure
+        """
+        key = (
+            'hall_of_fame', self.locale, color,
+            tuple((row['rank'], row['playername'], row['votes'], row['months_active'], row['best_rank'])
+                  for row in rows),
+        )
+
+        def render() -> Dict[str, Any]:
+            names_list = [f"{rank_display(row['rank'])} {row['playername']}" for row in rows]
+            votes_list = [self._fame_vote_line(**row) for row in rows]
+            return {
+                "title": self.strings['fame_title'],
+                "description": self.strings['fame_description'],
+                "color": color,
+                "fields": [
+                    {"name": self.strings['fame_names_field'], "value": "\n".join(names_list) or "-", "inline": True},
+                    {"name": self.strings['fame_votes_field'], "value": "\n".join(votes_list) or "-", "inline": True},
+                ],
+                "timestamp": None,
+                "footer": {"text": self.strings['fame_footer']},
+            }
+
+        return self.stamp(self.cache.get(key, render))
+
+    def spike_alert(self, flags: List[Dict[str, Any]], color: int) -> Dict[str, Any]:
+        """
+        Render vote spike flags for the admin channel.
+
+        Args:
+            flags: Players voting far faster than usual (see VelocityTracker.update)
+            color: Embed color
+
+        Returns:
+            dict: Discord embed structure
+        """
+        shown = flags[:SPIKE_ROWS]
+        key = (
+            'spike_alert', self.locale, color,
+            tuple((flag['playername'], flag['rate'], flag['usual_rate'], flag['votes']) for flag in shown),
+        )
+
+        def render() -> Dict[str, Any]:
+            return {
+                "title": self.strings['spike_title'],
+                "description": "\n".join(self._spike_line(**flag) for flag in shown),
+                "color": color,
+                "timestamp": None,
+                "footer": {"text": self.strings['spike_footer']},
+            }
+
+        return self.stamp(self.cache.get(key, render))
+
+
+# Compiled renderers by locale
+_renderers: Dict[str, Renderer] = {}
+
+
+def get_renderer(locale: str = DEFAULT_LOCALE) -> Renderer:
+    """
+    Get the shared renderer of a locale.
+
+    Args:
+        locale: Key of LOCALES
+
+    Returns:
+        Renderer: Renderer compiled once per locale
+
+    Raises:
+        ValueError: If the locale has no pack
+    """
+    renderer = _renderers.get(locale)
+    if renderer is None:
+        renderer = _renderers[locale] = Renderer(locale)
+    return renderer
@@ -0,0 +1,216 @@
+"""
+Run Lock module keeping runs of the same server from overlapping.
+
+A slow run (API or Discord close to their timeouts) can still be busy when
+the next cron tick starts another process. RunLock holds an advisory lock on
+a file in the snapshots directory for the whole run and records the holder's
+PID and start time in it while it holds the lock. A second run then skips,
+waits, or takes over a lock whose holder has been running for too long.
+Only one-shot cron runs of a single server can be taken over; stopping a
+daemon or a multi-tenant process would stop every other server with it.
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import socket
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Lock file name inside a snapshots directory
+LOCK_FILENAME = '.run.lock'
+
+# What a run does when another run holds the lock
+SKIP = 'skip'           # Exit right away; the running process does the work
+WAIT = 'wait'           # Wait up to the timeout for the other run to finish
+TAKEOVER = 'takeover'   # Stop a holder running longer than stale_after, then run
+POLICIES = (SKIP, WAIT, TAKEOVER)
+
+# Seconds between two lock attempts while waiting
+POLL_INTERVAL = 0.5
+
+if sys.platform == 'win32':
+    import msvcrt
+
+    def _try_lock(fd: int) -> bool:
+        try:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+
+    def _unlock(fd: int):
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _try_lock(fd: int) -> bool:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            return False
+
+    def _unlock(fd: int):
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+class RunLock:
+    """Advisory single-flight lock around a run."""
+
+    def __init__(
+        self,
+        lock_file: str,
+        policy: str = SKIP,
+        timeout: float = 60.0,
+        stale_after: float = 600.0,
+        stoppable: bool = False
+    ):
+        """
+        Initialize the lock.
+
+        Args:
+            lock_file: Path to the lock file
+            policy: skip, wait or takeover (see POLICIES)
+            timeout: Seconds to wait for the lock (wait and takeover policies)
+            stale_after: Seconds after which a holder counts as hung (takeover policy)
+            stoppable: This process runs a single server once (cron), so a later
+                run may stop it once it is stale
+
+        Raises:
+            ValueError: If the policy is unknown
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown run lock policy '{policy}' (use {', '.join(POLICIES)})")
+
+        self.lock_file = lock_file
+        self.policy = policy
+        self.timeout = timeout
+        self.stale_after = stale_after
+        self.stoppable = stoppable
+        self._fd: Optional[int] = None
+
+    def read_holder(self) -> Optional[Dict[str, Any]]:
+        """
+        Read who holds the lock.
+
+        Returns:
+            dict or None: pid, host, started_at and stoppable of the holder,
+                None if unknown or the lock is free
+        """
+        try:
+            with open(self.lock_file, 'r', encoding='utf-8') as f:
+                return json.loads(f.read() or 'null')
+        except (OSError, ValueError):
+            return None
+
+    def _is_stale(self, holder: Optional[Dict[str, Any]]) -> bool:
+        """
+        Check whether the holder has been running longer than stale_after.
+
+        Args:
+            holder: Holder information from the lock file
+
+        Returns:
+            bool: True if the holder is a stoppable process on this host that looks hung
+        """
+        if not holder or holder.get('host') != socket.gethostname() or not holder.get('stoppable'):
+            return False
+        try:
+            age = datetime.now(timezone.utc) - datetime.fromisoformat(holder['started_at'])
+        except (KeyError, TypeError, ValueError):
+            # Unreadable or without a UTC offset (written by an older version)
+            return False
+        return age.total_seconds() > self.stale_after
+
+    def _take_over(self, holder: Dict[str, Any]):
+        """
+        Stop a hung holder so its lock is released.
+
+        Args:
+            holder: Holder information from the lock file
+        """
+        pid = holder.get('pid')
+        logger.warning(f"Run lock held by PID {pid} since {holder.get('started_at')}, "
+                       f"longer than {self.stale_after:.0f}s; stopping it")
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except (OSError, TypeError) as e:
+            logger.warning(f"Could not stop PID {pid}: {e}")
+
+    def _write_holder(self):
+        """Record this process as the holder (only ever called while holding the lock)."""
+        holder = {
+            'pid': os.getpid(),
+            'host': socket.gethostname(),
+            'started_at': datetime.now(timezone.utc).isoformat(),
+            'stoppable': self.stoppable,
+        }
+        data = json.dumps(holder).encode('utf-8')
+        os.ftruncate(self._fd, 0)
+        os.lseek(self._fd, 0, os.SEEK_SET)
+        os.write(self._fd, data)
+
+    def acquire(self) -> bool:
+        """
+        Acquire the lock according to the policy.
+
+        Returns:
+            bool: True if this process now holds the lock, False if the run must not start
+        """
+        directory = os.path.dirname(self.lock_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        fd = os.open(self.lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+        deadline = time.monotonic() + (self.timeout if self.policy != SKIP else 0)
+        took_over = False
+        previous_holder = None
+
+        while not _try_lock(fd):
+            holder = self.read_holder() or {}
+            # A new holder writes its record right after locking; only a record seen
+            # unchanged on two polls while the lock stays held belongs to the holder
+            if (self.policy == TAKEOVER and not took_over and holder == previous_holder
+                    and self._is_stale(holder)):
+                self._take_over(holder)
+                took_over = True
+            elif time.monotonic() >= deadline:
+                os.close(fd)
+                logger.warning(f"Another run holds {self.lock_file} (PID {holder.get('pid', '?')}, "
+                               f"started {holder.get('started_at', '?')}); not starting this run")
+                return False
+            previous_holder = holder
+            time.sleep(POLL_INTERVAL)
+
+        self._fd = fd
+        self._write_holder()
+        return True
+
+    def release(self):
+        """Release the lock, clearing the holder information first."""
+        if self._fd is None:
+            return
+        try:
+            # A later run must never read this process as the holder of a free lock
+            os.ftruncate(self._fd, 0)
+        except OSError as e:
+            logger.warning(f"Could not clear holder of {self.lock_file}: {e}")
+        try:
+            _unlock(self._fd)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self) -> bool:
+        return self.acquire()
+
+    def __exit__(self, *exc_info):
+        self.release()
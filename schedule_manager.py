@@ -4,14 +4,69 @@ Schedule Manager module for determining post types and timing.
 This module handles scheduling logic for daily posts and weekly analysis.
 """
 
-from datetime import datetime, timedelta
-from typing import Dict, Any
-import calendar
+from datetime import date as date_type, datetime, timedelta, time
+from typing import Dict, Any, NamedTuple, Optional
 import logging
+from job_ledger import JobLedger, WEEKLY_SNAPSHOT, WEEKLY_ANALYSIS, MONTHLY_FINAL
 
 logger = logging.getLogger(__name__)
 
 
+class CalendarDay(NamedTuple):
+    """Precomputed period information for a single day."""
+    is_sunday: bool
+    is_month_end: bool
+    week_end: date_type        # Most recent Sunday on or before the day
+    month_end: date_type       # Most recent month end on or before the day
+
+
+class PeriodCalendar:
+    """Precomputed week-end and month-end boundaries, answering lookups in O(1)."""
+
+    _days: Dict[date_type, CalendarDay] = {}
+    _years = set()
+
+    @classmethod
+    def _build_year(cls, year: int):
+        """
+        Precompute all days of a year.
+
+        Args:
+            year: Year to precompute
+        """
+        day = date_type(year, 1, 1)
+        week_end = day - timedelta(days=(day.weekday() + 1) % 7)
+        month_end = day - timedelta(days=1)
+
+        while day.year == year:
+            is_sunday = day.weekday() == 6
+            is_month_end = (day + timedelta(days=1)).day == 1
+            if is_sunday:
+                week_end = day
+            if is_month_end:
+                month_end = day
+            cls._days[day] = CalendarDay(is_sunday, is_month_end, week_end, month_end)
+            day += timedelta(days=1)
+
+        cls._years.add(year)
+
+    @classmethod
+    def get_day(cls, date: datetime) -> CalendarDay:
+        """
+        Look up the period information for a date.
+
+        Args:
+            date: Date (or datetime) to look up
+
+        Returns:
+            CalendarDay: Boundaries for that day
+        """
+        day = date.date() if isinstance(date, datetime) else date
+        if day.year not in cls._years:
+            cls._build_year(day.year)
+        return cls._days[day]
+
+
 class ScheduleManager:
     """Manages scheduling logic for different types of posts."""
 
@@ -29,10 +84,7 @@ class ScheduleManager:
         if date is None:
             date = datetime.now()
 
-        # Get the last day of the current month
-        last_day = calendar.monthrange(date.year, date.month)[1]
-        
-        return date.day == last_day
+        return PeriodCalendar.get_day(date).is_month_end
 
     @staticmethod
     def is_sunday(date: datetime = None) -> bool:
@@ -48,15 +100,71 @@ class ScheduleManager:
         if date is None:
             date = datetime.now()
 
-        return date.weekday() == 6  # Sunday = 6
+        return PeriodCalendar.get_day(date).is_sunday
+
+    @staticmethod
+    def get_period_end(job: str, date: datetime = None) -> datetime:
+        """
+        Get the end of the most recent period of a job, up to and including the given date.
+
+        Args:
+            job: Job name from job_ledger
+            date: Date to check (defaults to today)
+
+        Returns:
+            datetime: Midnight of the last Sunday (weekly jobs) or the last month end (monthly jobs)
+        """
+        if date is None:
+            date = datetime.now()
+
+        calendar_day = PeriodCalendar.get_day(date)
+        period_end = calendar_day.month_end if job == MONTHLY_FINAL else calendar_day.week_end
+        return datetime(period_end.year, period_end.month, period_end.day)
+
+    @staticmethod
+    def get_due_period(job: str, date: datetime = None, ledger: Optional[JobLedger] = None) -> Optional[datetime]:
+        """
+        Get the period a job still has to run for, including missed periods.
+
+        A job is due on its boundary day (Sunday or month end) unless the ledger shows it
+        already ran. A missed boundary is caught up on later days, but only for the most
+        recent period and only once the job has run at least once before.
+
+        Args:
+            job: Job name from job_ledger
+            date: Date to check (defaults to today)
+            ledger: Job ledger (without one, jobs are due on every boundary day run)
+
+        Returns:
+            datetime or None: End of the due period, None if nothing is due
+        """
+        if date is None:
+            date = datetime.now()
+
+        period_end = ScheduleManager.get_period_end(job, date)
+        is_boundary_day = period_end.date() == date.date()
+
+        if ledger is None:
+            return period_end if is_boundary_day else None
+
+        if ledger.has_run(job, period_end):
+            return None
+
+        last_period = ledger.last_period(job)
+        if not is_boundary_day and last_period is None:
+            # Never ran before: nothing to catch up on
+            return None
+
+        return period_end
 
     @staticmethod
-    def get_post_type(date: datetime = None) -> str:
+    def get_post_type(date: datetime = None, ledger: Optional[JobLedger] = None) -> str:
         """
         Determine what type of post should be made today.
 
         Args:
             date: Date to check (defaults to today)
+            ledger: Job ledger; month-end and Sunday types are only returned while still due
 
         Returns:
             str: Post type - 'monthly_final', 'weekly', 'daily', or 'weekly_and_daily'
@@ -67,6 +175,10 @@ class ScheduleManager:
         is_last_day = ScheduleManager.is_last_day_of_month(date)
         is_sunday_today = ScheduleManager.is_sunday(date)
 
+        if ledger is not None:
+            is_last_day = is_last_day and not ledger.has_run(MONTHLY_FINAL, date)
+            is_sunday_today = is_sunday_today and not ledger.has_run(WEEKLY_ANALYSIS, date)
+
         if is_last_day and is_sunday_today:
             return 'weekly_and_monthly_final'
         elif is_last_day:
@@ -117,40 +229,45 @@ class ScheduleManager:
         return configs.get(post_type, configs['daily'])
 
     @staticmethod
-    def should_save_snapshot(date: datetime = None) -> bool:
+    def should_save_snapshot(date: datetime = None, ledger: Optional[JobLedger] = None) -> bool:
         """
         Determine if a snapshot should be saved today.
 
         Args:
             date: Date to check (defaults to today)
+            ledger: Job ledger for exactly-once and catch-up checks
 
         Returns:
-            bool: True if snapshot should be saved (Sundays)
+            bool: True if snapshot should be saved (Sundays, or a missed Sunday)
         """
-        return ScheduleManager.is_sunday(date)
+        return ScheduleManager.get_due_period(WEEKLY_SNAPSHOT, date, ledger) is not None
 
     @staticmethod
-    def should_post_weekly_analysis(date: datetime = None) -> bool:
+    def should_post_weekly_analysis(date: datetime = None, ledger: Optional[JobLedger] = None) -> bool:
         """
         Determine if weekly analysis should be posted today.
 
         Args:
             date: Date to check (defaults to today)
+            ledger: Job ledger for exactly-once and catch-up checks
 
         Returns:
-            bool: True if weekly analysis should be posted (Sundays)
+            bool: True if weekly analysis should be posted (Sundays, or a missed Sunday)
         """
-        return ScheduleManager.is_sunday(date)
+        return ScheduleManager.get_due_period(WEEKLY_ANALYSIS, date, ledger) is not None
 
     @staticmethod
-    def get_week_date_range() -> Dict[str, str]:
+    def get_week_date_range(date: datetime = None) -> Dict[str, str]:
         """
-        Get the date range for the current week (Monday to Sunday).
+        Get the date range for the week containing the given date (Monday to Sunday).
+
+        Args:
+            date: Date within the week (defaults to today)
 
         Returns:
             dict: Dictionary with 'start' and 'end' date strings
         """
-        today = datetime.now()
+        today = date if date is not None else datetime.now()
         
         # Calculate Monday of this week
         days_since_monday = today.weekday()
@@ -165,25 +282,112 @@ class ScheduleManager:
         }
 
     @staticmethod
-    def log_schedule_info(date: datetime = None):
+    def parse_run_time(value: str) -> time:
+        """
+        Parse a run time string in HH:MM format.
+
+        Args:
+            value: Time string (e.g., "23:55")
+
+        Returns:
+            time: Parsed time of day
+
+        Raises:
+            ValueError: If the string is not in HH:MM format
+        """
+        return datetime.strptime(value, '%H:%M').time()
+
+    @staticmethod
+    def get_next_daily_run(now: datetime, run_time: time) -> datetime:
+        """
+        Get the next daily run at the given time of day.
+
+        Args:
+            now: Current date and time
+            run_time: Time of day for the daily run
+
+        Returns:
+            datetime: Next daily run strictly after now
+        """
+        candidate = datetime.combine(now.date(), run_time, tzinfo=now.tzinfo)
+        if candidate <= now:
+            # Combine again instead of adding a day so DST changes keep the wall-clock time
+            candidate = datetime.combine(now.date() + timedelta(days=1), run_time, tzinfo=now.tzinfo)
+        return candidate
+
+    @staticmethod
+    def get_next_weekly_run(now: datetime, run_time: time) -> datetime:
+        """
+        Get the next Sunday run (snapshot and weekly analysis).
+
+        Args:
+            now: Current date and time
+            run_time: Time of day for the run
+
+        Returns:
+            datetime: Next Sunday run strictly after now
+        """
+        candidate = ScheduleManager.get_next_daily_run(now, run_time)
+        days_until_sunday = (6 - candidate.weekday()) % 7
+        return datetime.combine(candidate.date() + timedelta(days=days_until_sunday), run_time, tzinfo=now.tzinfo)
+
+    @staticmethod
+    def get_next_month_end_run(now: datetime, run_time: time) -> datetime:
+        """
+        Get the next last-day-of-month run (final ranking).
+
+        Args:
+            now: Current date and time
+            run_time: Time of day for the run
+
+        Returns:
+            datetime: Next month-end run strictly after now
+        """
+        month_end = ScheduleManager._get_month_end(now.date())
+        candidate = datetime.combine(month_end, run_time, tzinfo=now.tzinfo)
+        if candidate <= now:
+            # Jump into next month and take its last day
+            month_end = ScheduleManager._get_month_end(month_end + timedelta(days=1))
+            candidate = datetime.combine(month_end, run_time, tzinfo=now.tzinfo)
+        return candidate
+
+    @staticmethod
+    def _get_month_end(day: date_type) -> date_type:
+        """
+        Get the last day of the month containing the given day.
+
+        Args:
+            day: Any day of the month
+
+        Returns:
+            date: Last day of that month
+        """
+        first_of_next = (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+        return first_of_next - timedelta(days=1)
+
+    @staticmethod
+    def log_schedule_info(date: datetime = None, ledger: Optional[JobLedger] = None):
         """
         Log current schedule information for debugging.
 
         Args:
             date: Date to check (defaults to today)
+            ledger: Job ledger for exactly-once and catch-up checks
         """
         if date is None:
             date = datetime.now()
 
-        post_type = ScheduleManager.get_post_type(date)
+        post_type = ScheduleManager.get_post_type(date, ledger)
         is_last_day = ScheduleManager.is_last_day_of_month(date)
         is_sunday_today = ScheduleManager.is_sunday(date)
-        should_snapshot = ScheduleManager.should_save_snapshot(date)
-        should_weekly = ScheduleManager.should_post_weekly_analysis(date)
+        should_snapshot = ScheduleManager.should_save_snapshot(date, ledger)
+        should_weekly = ScheduleManager.should_post_weekly_analysis(date, ledger)
+        should_monthly = ScheduleManager.get_due_period(MONTHLY_FINAL, date, ledger) is not None
 
         logger.info(f"Schedule info for {date.strftime('%Y-%m-%d')}:")
         logger.info(f"  Post type: {post_type}")
         logger.info(f"  Last day of month: {is_last_day}")
         logger.info(f"  Is Sunday: {is_sunday_today}")
         logger.info(f"  Should save snapshot: {should_snapshot}")
-        logger.info(f"  Should post weekly analysis: {should_weekly}")
\ No newline at end of file
+        logger.info(f"  Should post weekly analysis: {should_weekly}")
+        logger.info(f"  Should post monthly final: {should_monthly}")
\ No newline at end of file
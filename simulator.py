@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Simulator module replaying months of runs against an accelerated clock.
+
+Every cron tick between a start and end date performs a full run_once() with
+an injected RunClock, an in-process API returning synthetic or recorded
+responses and a webhook recording the payloads instead of posting them. The
+report lists every post that would have been sent, flags schedule anomalies
+(e.g. two month-end finals in one month) and doubles as a throughput
+benchmark of the whole pipeline:
+
+    python simulator.py --start 2025-01-01 --days 120 --players 1000
+    python simulator.py --start 2025-01-01 --days 60 --miss-rate 0.2 --output report.json
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from clock import RunClock, get_timezone
+from config import get_config
+from job_ledger import JobLedger, LEDGER_FILENAME, MONTHLY_FINAL, WEEKLY_ANALYSIS
+from main import run_once
+from schedule_manager import ScheduleManager
+from snapshot_manager import SnapshotManager
+from synthetic_data import generate_players
+from webhook import RecordingWebhook
+
+logger = logging.getLogger(__name__)
+
+# Votes a player can cast per day on TopGames
+MAX_DAILY_VOTES = 12
+
+# Post kinds by embed color (see ScheduleManager.get_embed_config and the webhook send_* methods)
+POST_KINDS = {3447003: 'daily', 16766720: 'monthly_final', 7506394: 'weekly_analysis',
+              1752220: 'monthly_recap', 12745742: 'hall_of_fame'}
+
+
+class SimulatedAPI:
+    """In-process stand-in for APIClient whose responses follow the simulated clock."""
+
+    def __init__(self, players: int = 1000, recorded_dir: Optional[str] = None, seed: int = 42):
+        """
+        Initialize the API.
+
+        Args:
+            players: Number of synthetic player entries (ignored with recorded_dir)
+            recorded_dir: Directory of recorded responses named YYYY-MM-DD*.json;
+                each tick is answered with the latest one recorded on or before it
+            seed: Random seed for the synthetic players
+        """
+        self.now = datetime.min
+        self.recorded = []
+        self.rates = []
+
+        if recorded_dir:
+            for filename in sorted(os.listdir(recorded_dir)):
+                if filename.endswith('.json'):
+                    recorded_date = datetime.strptime(filename[:10], '%Y-%m-%d')
+                    self.recorded.append((recorded_date, os.path.join(recorded_dir, filename)))
+            if not self.recorded:
+                raise ValueError(f"No recorded responses (YYYY-MM-DD*.json) in {recorded_dir}")
+        else:
+            # Long-tail activity: a few players vote nearly every slot, most rarely
+            rng = random.Random(seed)
+            for player in generate_players(players, seed=seed):
+                share = min(1.0, player['votes'] / 100)
+                self.rates.append((player['playername'], share * MAX_DAILY_VOTES * rng.uniform(0.5, 1.0)))
+
+    def fetch_voters(self) -> Dict[str, Any]:
+        """
+        Get the API response at the simulated time.
+
+        Votes grow steadily during the month and reset on the 1st, like on TopGames.
+
+        Returns:
+            dict: players-ranking response
+        """
+        if self.recorded:
+            path = self.recorded[0][1]
+            for recorded_date, recorded_path in self.recorded:
+                if recorded_date > self.now:
+                    break
+                path = recorded_path
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+
+        month_start = self.now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        days = (self.now - month_start).total_seconds() / 86400
+        return {
+            'code': 200,
+            'success': True,
+            'players': [{'playername': name, 'votes': int(rate * days)} for name, rate in self.rates],
+        }
+
+
+def get_ticks(
+    start: datetime,
+    end: datetime,
+    run_time: Optional[str],
+    interval_minutes: int = 0
+) -> List[datetime]:
+    """
+    Get the cron ticks between two dates.
+
+    Args:
+        start: First day
+        end: Day after the last day
+        run_time: Daily run time (HH:MM), None for no daily run
+        interval_minutes: Additional run every N minutes (0 for none)
+
+    Returns:
+        list: Sorted tick times
+    """
+    ticks = set()
+    day = start
+    daily = ScheduleManager.parse_run_time(run_time) if run_time else None
+    while day < end:
+        if daily is not None:
+            ticks.add(datetime.combine(day.date(), daily))
+        if interval_minutes > 0:
+            for minute in range(0, 24 * 60, interval_minutes):
+                ticks.add(day + timedelta(minutes=minute))
+        day += timedelta(days=1)
+    return sorted(ticks)
+
+
+def classify_post(payload: Dict[str, Any]) -> str:
+    """
+    Get the kind of a recorded post.
+
+    Args:
+        payload: Recorded webhook payload
+
+    Returns:
+        str: daily, weekly_analysis, monthly_final or unknown
+    """
+    return POST_KINDS.get(payload['embeds'][0].get('color'), 'unknown')
+
+
+def find_anomalies(posts: List[Dict[str, Any]], failed_runs: List[str]) -> List[str]:
+    """
+    Check the posts against the schedule rules.
+
+    Args:
+        posts: Recorded posts with time, kind and the period they were posted for
+        failed_runs: Tick times of runs that returned a non-zero exit code
+
+    Returns:
+        list: Human readable problems (empty if the schedule held)
+    """
+    problems = [f"Run at {tick} failed" for tick in failed_runs]
+    finals: Dict[str, int] = {}
+    weeklies: Dict[str, int] = {}
+
+    for post in posts:
+        if post['kind'] == 'monthly_final':
+            month = post['period'][:7]
+            finals[month] = finals.get(month, 0) + 1
+        elif post['kind'] == 'weekly_analysis':
+            weeklies[post['period']] = weeklies.get(post['period'], 0) + 1
+
+    problems.extend(f"{count} monthly finals for {month}" for month, count in finals.items() if count > 1)
+    problems.extend(f"{count} weekly analyses for week {week}" for week, count in weeklies.items() if count > 1)
+    return problems
+
+
+def simulate(
+    start: datetime,
+    days: int,
+    players: int = 1000,
+    recorded_dir: Optional[str] = None,
+    run_time: Optional[str] = '23:55',
+    interval_minutes: int = 0,
+    timezone: str = '',
+    miss_rate: float = 0.0,
+    seed: int = 42
+) -> Dict[str, Any]:
+    """
+    Replay every cron tick of a period through the full pipeline.
+
+    Args:
+        start: First simulated day
+        days: Number of simulated days
+        players: Synthetic player entries
+        recorded_dir: Directory of recorded API responses (instead of synthetic ones)
+        run_time: Daily run time (HH:MM)
+        interval_minutes: Additional run every N minutes
+        timezone: IANA timezone of the run times
+        miss_rate: Share of ticks skipped, simulating downtime (exercises catch-up)
+        seed: Random seed for players and missed ticks
+
+    Returns:
+        dict: Report with posts, anomalies and throughput
+    """
+    rng = random.Random(seed)
+    tz = get_timezone(timezone)
+    ticks = get_ticks(start, start + timedelta(days=days), run_time, interval_minutes)
+    api = SimulatedAPI(players, recorded_dir, seed)
+    webhook = RecordingWebhook()
+    posts: List[Dict[str, Any]] = []
+    failed_runs: List[str] = []
+    runs = 0
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config = get_config({
+            'api_url': 'simulated://topgames',
+            'webhook_url': 'simulated://discord',
+            'snapshots_dir': temp_dir,
+            'timezone': timezone,
+        })
+        snapshot_manager = SnapshotManager(temp_dir)
+        ledger = JobLedger(os.path.join(temp_dir, LEDGER_FILENAME))
+
+        started = time.perf_counter()
+        for tick in ticks:
+            if miss_rate and rng.random() < miss_rate:
+                continue
+
+            api.now = tick
+            exit_code = run_once(config, api, webhook, snapshot_manager, ledger, RunClock(tz, tick), pipeline_workers=1)
+            runs += 1
+            if exit_code != 0:
+                failed_runs.append(tick.isoformat())
+
+            # The ledger knows which period a weekly or monthly post was for
+            periods = {'weekly_analysis': ledger.last_period(WEEKLY_ANALYSIS),
+                       'monthly_final': ledger.last_period(MONTHLY_FINAL)}
+            for payload in webhook.payloads:
+                kind = classify_post(payload)
+                posts.append({
+                    'time': tick.isoformat(),
+                    'kind': kind,
+                    'period': periods.get(kind) or tick.strftime('%Y-%m-%d'),
+                    'title': payload['embeds'][0].get('title', ''),
+                    'payload': payload,
+                })
+            webhook.payloads.clear()
+        elapsed = time.perf_counter() - started
+
+    summary: Dict[str, int] = {}
+    for post in posts:
+        summary[post['kind']] = summary.get(post['kind'], 0) + 1
+
+    return {
+        'start': start.isoformat(),
+        'days': days,
+        'ticks': len(ticks),
+        'runs': runs,
+        'seconds': elapsed,
+        'runs_per_second': runs / elapsed if elapsed else None,
+        'summary': summary,
+        'anomalies': find_anomalies(posts, failed_runs),
+        'posts': posts,
+    }
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """
+    Parse command line arguments.
+
+    Args:
+        argv: Argument list (defaults to sys.argv)
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Replay cron ticks through the full pipeline on a fake clock.")
+    parser.add_argument('--start', default=datetime.now().strftime('%Y-%m-01'), help="first day (YYYY-MM-DD)")
+    parser.add_argument('--days', type=int, default=90, help="number of simulated days (default: 90)")
+    parser.add_argument('--players', type=int, default=1000, help="synthetic players (default: 1000)")
+    parser.add_argument('--recorded', metavar='DIR', help="replay recorded responses named YYYY-MM-DD*.json")
+    parser.add_argument('--run-time', default='23:55', help="daily cron time (default: 23:55)")
+    parser.add_argument('--interval-minutes', type=int, default=0, help="additional run every N minutes")
+    parser.add_argument('--timezone', default='', help="IANA timezone of the run times")
+    parser.add_argument('--miss-rate', type=float, default=0.0, help="share of ticks skipped to simulate downtime")
+    parser.add_argument('--seed', type=int, default=42, help="random seed")
+    parser.add_argument('--output', metavar='FILE', help="write the full report (with payloads) as JSON")
+    parser.add_argument('--verbose', action='store_true', help="show the log of every run")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    """Run the simulator and print the posts it recorded."""
+    args = parse_args(argv)
+    # main configures INFO logging on import; every run would print its full log
+    logging.getLogger().setLevel(logging.INFO if args.verbose else logging.WARNING)
+
+    report = simulate(
+        datetime.strptime(args.start, '%Y-%m-%d'), args.days, args.players, args.recorded,
+        args.run_time or None, args.interval_minutes, args.timezone, args.miss_rate, args.seed
+    )
+
+    print(f"🕰️ Simulated {report['days']} days: {report['runs']}/{report['ticks']} ticks run "
+          f"in {report['seconds']:.2f}s ({report['runs_per_second']:.1f} runs/s)")
+    print("=" * 50)
+    for post in report['posts']:
+        if post['kind'] != 'daily':
+            print(f"  {post['time'][:16]}  {post['kind']:<16} {post['title']}")
+    print(f"\n📊 Posts: {', '.join(f'{kind}={count}' for kind, count in sorted(report['summary'].items()))}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"💾 Report written to {args.output}")
+
+    if report['anomalies']:
+        print("\n❌ Anomalies:")
+        for problem in report['anomalies']:
+            print(f"  - {problem}")
+        return 1
+
+    print("✅ No schedule anomalies")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
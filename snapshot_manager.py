@@ -6,13 +6,50 @@ This module handles saving snapshots and calculating weekly vote differences.
 
 import json
 import os
+import hashlib
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from operator import attrgetter
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 import logging
+import metrics
+from history import HistoryIndex, HISTORY_INDEX_FILENAME
+from models import Player, WeeklyPlayer
 
 logger = logging.getLogger(__name__)
 
 
+def compute_checksum(players: Dict[str, int]) -> str:
+    """
+    Compute the checksum stored in a snapshot.
+
+    Args:
+        players: Votes keyed by player name
+
+    Returns:
+        str: sha256 of the canonical JSON encoding of the players
+    """
+    canonical = json.dumps(players, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return 'sha256:' + hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def fsync_directory(directory: str):
+    """
+    Make renames and removals in a directory durable.
+
+    Args:
+        directory: Directory whose entries changed
+    """
+    if os.name == 'nt':
+        # Windows can't open directories; NTFS journals the rename itself
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
 class SnapshotManager:
     """Manages vote snapshots and weekly analysis."""
 
@@ -24,6 +61,13 @@ class SnapshotManager:
             snapshots_dir: Directory to store snapshot files
         """
         self.snapshots_dir = snapshots_dir
+        # Loaded snapshots keyed by filename; kept warm across runs in daemon mode
+        self._cache: Dict[str, Dict[str, Any]] = {}
+        # Open batches, and whether the directory changed since the last fsync
+        self._batch_depth = 0
+        self._dir_dirty = False
+        # Per-player history, loaded on the first save
+        self._history: Optional[HistoryIndex] = None
         self._ensure_snapshots_dir()
 
     def _ensure_snapshots_dir(self):
@@ -32,6 +76,13 @@ class SnapshotManager:
             os.makedirs(self.snapshots_dir)
             logger.info(f"Created snapshots directory: {self.snapshots_dir}")
 
+    @property
+    def history(self) -> HistoryIndex:
+        """History index of the snapshots in this directory."""
+        if self._history is None:
+            self._history = HistoryIndex(os.path.join(self.snapshots_dir, HISTORY_INDEX_FILENAME), self.snapshots_dir)
+        return self._history
+
     def get_snapshot_filename(self, date: datetime) -> str:
         """
         Get snapshot filename for a given date.
@@ -44,12 +95,41 @@ class SnapshotManager:
         """
         return f"snapshot_{date.strftime('%Y%m%d')}.json"
 
-    def save_snapshot(self, players_data: List[Dict[str, Any]], date: Optional[datetime] = None) -> bool:
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Group snapshot writes and removals under a single directory fsync.
+
+        Each file's data is fsynced before it is renamed into place; the
+        directory entry only becomes durable once the outermost batch ends.
+        Writes outside a batch fsync the directory themselves.
+        """
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._dir_dirty:
+                self._dir_dirty = False
+                fsync_directory(self.snapshots_dir)
+
+    def _directory_changed(self):
+        """Fsync the directory now, or when the current batch ends."""
+        if self._batch_depth:
+            self._dir_dirty = True
+        else:
+            fsync_directory(self.snapshots_dir)
+
+    def save_snapshot(self, players_data: List[Player], date: Optional[datetime] = None) -> bool:
         """
         Save a snapshot of current voting data.
 
+        The snapshot is written to a temporary file and renamed into place, so
+        a crash or a concurrent reader never sees a half-written file. Its
+        players are also added to the history index (see history.py).
+
         Args:
-            players_data: Current players voting data
+            players_data: Current players
             date: Date for the snapshot (defaults to today)
 
         Returns:
@@ -68,15 +148,24 @@ class SnapshotManager:
 
             # Store player data with votes
             for player in players_data:
-                if 'playername' in player and 'votes' in player:
-                    snapshot["players"][player['playername']] = int(player['votes'])
+                snapshot["players"][player.playername] = player.votes
+            snapshot["checksum"] = compute_checksum(snapshot["players"])
 
             filename = self.get_snapshot_filename(date)
             filepath = os.path.join(self.snapshots_dir, filename)
-
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(snapshot, f, indent=2, ensure_ascii=False)
-
+            temp_file = f"{filepath}.tmp"
+
+            with metrics.SNAPSHOT_SECONDS.time(operation='save'):
+                with open(temp_file, 'w', encoding='utf-8') as f:
+                    json.dump(snapshot, f, indent=2, ensure_ascii=False)
+                    metrics.SNAPSHOT_BYTES.observe(f.tell(), operation='save')
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_file, filepath)
+                self.history.add_snapshot(date, snapshot["players"])
+                self._directory_changed()
+
+            self._cache[filename] = snapshot
             logger.info(f"Snapshot saved: {filename} with {len(snapshot['players'])} players")
             return True
 
@@ -84,27 +173,50 @@ class SnapshotManager:
             logger.error(f"Failed to save snapshot: {e}")
             return False
 
-    def load_snapshot(self, date: datetime) -> Optional[Dict[str, Any]]:
+    def load_snapshot(self, date: datetime, cache: bool = True) -> Optional[Dict[str, Any]]:
         """
         Load a snapshot from a specific date.
 
+        A snapshot that is not valid JSON or doesn't match its checksum is
+        logged and treated as missing, so callers fall back to the nearest
+        good one. Snapshots written before checksums existed are trusted.
+
         Args:
             date: Date of the snapshot to load
+            cache: Keep the snapshot in memory for later loads (off when streaming history)
 
         Returns:
-            dict or None: Snapshot data if found, None otherwise
+            dict or None: Snapshot data if found and intact, None otherwise
         """
         try:
             filename = self.get_snapshot_filename(date)
             filepath = os.path.join(self.snapshots_dir, filename)
 
+            if filename in self._cache:
+                logger.info(f"Snapshot loaded from cache: {filename}")
+                return self._cache[filename]
+
             if not os.path.exists(filepath):
                 logger.info(f"Snapshot not found: {filename}")
                 return None
 
-            with open(filepath, 'r', encoding='utf-8') as f:
-                snapshot = json.load(f)
+            with metrics.SNAPSHOT_SECONDS.time(operation='load'):
+                with open(filepath, 'r', encoding='utf-8') as f:
+                    try:
+                        snapshot = json.load(f)
+                    except ValueError as e:
+                        logger.warning(f"Skipping corrupt snapshot {filename}: {e}")
+                        return None
+                    metrics.SNAPSHOT_BYTES.observe(f.tell(), operation='load')
+
+            checksum = snapshot.get('checksum') if isinstance(snapshot, dict) else None
+            if not isinstance(snapshot, dict) or not isinstance(snapshot.get('players'), dict) or \
+                    (checksum is not None and checksum != compute_checksum(snapshot['players'])):
+                logger.warning(f"Skipping corrupt snapshot {filename}: checksum mismatch")
+                return None
 
+            if cache:
+                self._cache[filename] = snapshot
             logger.info(f"Snapshot loaded: {filename}")
             return snapshot
 
@@ -112,87 +224,218 @@ class SnapshotManager:
             logger.error(f"Failed to load snapshot {filename}: {e}")
             return None
 
-    def calculate_weekly_votes(self, current_players: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def get_snapshot_dates(self) -> List[datetime]:
         """
-        Calculate weekly vote differences by comparing with last Sunday's snapshot.
+        Get the dates of all snapshots on disk.
+
+        Returns:
+            list: Snapshot dates, sorted ascending
+        """
+        dates = []
+        for filename in os.listdir(self.snapshots_dir):
+            if filename.startswith("snapshot_") and filename.endswith(".json"):
+                try:
+                    dates.append(datetime.strptime(filename[9:17], '%Y%m%d'))
+                except ValueError:
+                    continue
+        return sorted(dates)
+
+    def find_nearest_snapshot(
+        self,
+        date: datetime,
+        max_days: int = 3,
+        earliest: Optional[datetime] = None,
+        latest: Optional[datetime] = None
+    ) -> Optional[Tuple[datetime, Dict[str, Any]]]:
+        """
+        Find the snapshot closest to a date, for use when the exact one is missing.
 
         Args:
-            current_players: Current player voting data
+            date: Target date
+            max_days: Maximum distance in days from the target date
+            earliest: Ignore snapshots before this date
+            latest: Ignore snapshots after this date
 
         Returns:
-            list: Players with weekly vote counts, sorted by weekly votes
+            tuple or None: (snapshot_date, snapshot) if one is found, None otherwise
         """
-        try:
+        target = datetime(date.year, date.month, date.day)
+        candidates = [
+            d for d in self.get_snapshot_dates()
+            if abs((d - target).days) <= max_days
+            and (earliest is None or d >= earliest)
+            and (latest is None or d <= latest)
+        ]
+
+        # Closest first; on a tie prefer the earlier snapshot
+        for snapshot_date in sorted(candidates, key=lambda d: (abs((d - target).days), d)):
+            snapshot = self.load_snapshot(snapshot_date)
+            if snapshot:
+                return snapshot_date, snapshot
+        return None
+
+    @staticmethod
+    def snapshot_to_players(snapshot: Dict[str, Any]) -> List[Player]:
+        """
+        Convert a snapshot back into a ranked player list.
+
+        Args:
+            snapshot: Snapshot data as returned by load_snapshot
+
+        Returns:
+            list: Players with rank, sorted by votes
+        """
+        players = [Player(name, votes) for name, votes in snapshot.get('players', {}).items()]
+        players.sort(key=attrgetter('votes'), reverse=True)
+        for i, player in enumerate(players, 1):
+            player.rank = i
+        return players
+
+    def load_weekly_baseline(
+        self,
+        week_end: Optional[datetime] = None,
+        today: Optional[datetime] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Load the snapshot a week's votes are compared against (the previous Sunday).
+
+        Falls back to the nearest snapshot when that Sunday's one is missing.
+
+        Args:
+            week_end: Sunday ending the week to analyse (defaults to the current week)
+            today: Current date of the run (defaults to today)
+
+        Returns:
+            dict or None: Baseline snapshot if found, None otherwise
+        """
+        if week_end is not None:
+            last_sunday = week_end - timedelta(days=7)
+        else:
             # Find last Sunday
-            today = datetime.now()
+            if today is None:
+                today = datetime.now()
             days_since_sunday = today.weekday() + 1  # Monday = 0, Sunday = 6
             if days_since_sunday == 7:  # Today is Sunday
                 days_since_sunday = 7  # Use last Sunday instead of today
             
             last_sunday = today - timedelta(days=days_since_sunday)
-            
-            logger.info(f"Calculating weekly votes since: {last_sunday.strftime('%Y-%m-%d')}")
-
-            # Load last Sunday's snapshot
-            last_snapshot = self.load_snapshot(last_sunday)
-            if not last_snapshot:
+        
+        logger.info(f"Calculating weekly votes since: {last_sunday.strftime('%Y-%m-%d')}")
+
+        # Load last Sunday's snapshot, or the nearest one if it is missing
+        last_snapshot = self.load_snapshot(last_sunday)
+        if not last_snapshot:
+            nearest = self.find_nearest_snapshot(last_sunday)
+            if not nearest:
                 logger.warning("No snapshot found for last Sunday, cannot calculate weekly votes")
-                return []
+                return None
+            nearest_date, last_snapshot = nearest
+            logger.info(f"Using nearest snapshot from {nearest_date.strftime('%Y-%m-%d')} instead")
 
-            # Calculate differences
-            weekly_players = []
-            current_votes = {p['playername']: int(p['votes']) for p in current_players if 'playername' in p and 'votes' in p}
+        return last_snapshot
 
-            for playername, current_count in current_votes.items():
-                last_count = last_snapshot['players'].get(playername, 0)
-                weekly_votes = current_count - last_count
+    @staticmethod
+    def diff_weekly_votes(
+        current_players: List[Player],
+        last_snapshot: Dict[str, Any]
+    ) -> List[WeeklyPlayer]:
+        """
+        Calculate weekly vote differences against a baseline snapshot.
 
-                if weekly_votes > 0:  # Only include players who voted this week
-                    weekly_players.append({
-                        'playername': playername,
-                        'weekly_votes': weekly_votes,
-                        'total_votes': current_count,
-                        'last_week_votes': last_count
-                    })
+        Args:
+            current_players: Current player voting data
+            last_snapshot: Baseline snapshot from the previous Sunday
 
-            # Sort by weekly votes (descending)
-            weekly_players.sort(key=lambda x: x['weekly_votes'], reverse=True)
+        Returns:
+            list: Players with weekly vote counts, sorted by weekly votes
+        """
+        # Calculate differences
+        weekly_players = []
+        current_votes = {p.playername: p.votes for p in current_players}
+        last_votes = last_snapshot['players']
+
+        for playername, current_count in current_votes.items():
+            last_count = last_votes.get(playername, 0)
+            weekly_votes = current_count - last_count
+
+            if weekly_votes > 0:  # Only include players who voted this week
+                weekly_players.append(WeeklyPlayer(playername, weekly_votes, current_count, last_count))
+
+        # Sort by weekly votes (descending)
+        weekly_players.sort(key=attrgetter('weekly_votes'), reverse=True)
+
+        # Add ranks
+        for i, player in enumerate(weekly_players, 1):
+            player.rank = i
+
+        logger.info(f"Calculated weekly votes for {len(weekly_players)} active players")
+        return weekly_players
+
+    def calculate_weekly_votes(
+        self,
+        current_players: List[Player],
+        week_end: Optional[datetime] = None,
+        today: Optional[datetime] = None
+    ) -> List[WeeklyPlayer]:
+        """
+        Calculate weekly vote differences by comparing with last Sunday's snapshot.
 
-            # Add ranks
-            for i, player in enumerate(weekly_players, 1):
-                player['rank'] = i
+        Falls back to the nearest snapshot when last Sunday's one is missing.
 
-            logger.info(f"Calculated weekly votes for {len(weekly_players)} active players")
-            return weekly_players
+        Args:
+            current_players: Current player voting data
+            week_end: Sunday ending the week to analyse (defaults to the current week)
+            today: Current date of the run (defaults to today)
+
+        Returns:
+            list: Players with weekly vote counts, sorted by weekly votes
+        """
+        try:
+            last_snapshot = self.load_weekly_baseline(week_end, today)
+            if not last_snapshot:
+                return []
+            return self.diff_weekly_votes(current_players, last_snapshot)
 
         except Exception as e:
             logger.error(f"Failed to calculate weekly votes: {e}")
             return []
 
-    def cleanup_old_snapshots(self, keep_weeks: int = 12):
+    def cleanup_old_snapshots(self, keep_weeks: int = 12, today: Optional[datetime] = None):
         """
         Remove snapshots older than specified weeks.
 
         Args:
             keep_weeks: Number of weeks to keep (default: 12)
+            today: Current date of the run (defaults to today)
         """
         try:
-            cutoff_date = datetime.now() - timedelta(weeks=keep_weeks)
+            if today is None:
+                today = datetime.now()
+            cutoff_date = datetime(today.year, today.month, today.day) - timedelta(weeks=keep_weeks)
             
-            for filename in os.listdir(self.snapshots_dir):
-                if filename.startswith("snapshot_") and filename.endswith(".json"):
-                    try:
-                        # Extract date from filename
-                        date_str = filename[9:17]  # snapshot_YYYYMMDD.json
-                        file_date = datetime.strptime(date_str, '%Y%m%d')
+            # Removals share one directory fsync
+            with self.batch():
+                for filename in os.listdir(self.snapshots_dir):
+                    if filename.startswith("snapshot_") and filename.endswith(".json.tmp"):
+                        # Left behind by a save interrupted before its rename
+                        os.remove(os.path.join(self.snapshots_dir, filename))
+                        self._directory_changed()
+                        logger.info(f"Removed unfinished snapshot: {filename}")
+                    elif filename.startswith("snapshot_") and filename.endswith(".json"):
+                        try:
+                            # Extract date from filename
+                            date_str = filename[9:17]  # snapshot_YYYYMMDD.json
+                            file_date = datetime.strptime(date_str, '%Y%m%d')
                         
-                        if file_date < cutoff_date:
-                            filepath = os.path.join(self.snapshots_dir, filename)
-                            os.remove(filepath)
-                            logger.info(f"Removed old snapshot: {filename}")
-                    except ValueError:
-                        # Skip files with invalid date format
-                        continue
+                            if file_date < cutoff_date:
+                                filepath = os.path.join(self.snapshots_dir, filename)
+                                os.remove(filepath)
+                                self._directory_changed()
+                                self._cache.pop(filename, None)
+                                logger.info(f"Removed old snapshot: {filename}")
+                        except ValueError:
+                            # Skip files with invalid date format
+                            continue
 
         except Exception as e:
             logger.error(f"Failed to cleanup old snapshots: {e}")
\ No newline at end of file
@@ -0,0 +1,85 @@
+"""
+Synthetic Data module for generating realistic TopGames API payloads.
+
+Generated players follow the shape of real rankings: a long tail of players
+with few votes and a handful with many, some alternate accounts with a ~
+suffix (merged by name consolidation) and some entries repeated verbatim.
+Output is deterministic for a given seed so benchmark runs are comparable.
+"""
+
+import random
+from typing import Any, Dict, List
+
+# Name parts combined into player names of realistic length
+NAME_PREFIXES = ['Dark', 'Kiste', 'Borsti', 'Shadow', 'Mega', 'Blitz', 'Wolf', 'Pixel', 'Nova', 'Betty']
+NAME_SUFFIXES = ['mobile', 'phone', 'tablet', 'alt', '1', '2', 'pc']
+
+# Highest vote count a player can have in a month
+MAX_VOTES = 1000
+
+
+def generate_players(
+    count: int,
+    suffix_rate: float = 0.1,
+    duplicate_rate: float = 0.02,
+    seed: int = 42
+) -> List[Dict[str, Any]]:
+    """
+    Generate player entries as returned by the players-ranking endpoint.
+
+    Args:
+        count: Number of entries to generate
+        suffix_rate: Share of entries that are a ~suffixed alternate account of
+            an earlier player (e.g. "Wolf12~mobile")
+        duplicate_rate: Share of entries repeating an earlier entry verbatim
+        seed: Random seed
+
+    Returns:
+        list: Player dictionaries with playername and votes
+    """
+    rng = random.Random(seed)
+    players: List[Dict[str, Any]] = []
+    base_names: List[str] = []
+
+    for index in range(count):
+        roll = rng.random()
+        if players and roll < duplicate_rate:
+            players.append(dict(players[rng.randrange(len(players))]))
+            continue
+
+        if base_names and roll < duplicate_rate + suffix_rate:
+            name = f"{base_names[rng.randrange(len(base_names))]}~{rng.choice(NAME_SUFFIXES)}"
+        else:
+            name = f"{NAME_PREFIXES[index % len(NAME_PREFIXES)]}{index}"
+            base_names.append(name)
+
+        # Long tail: most players vote a few times, few vote nearly every day
+        votes = min(MAX_VOTES, int(rng.paretovariate(1.2)))
+        players.append({'playername': name, 'votes': votes})
+
+    return players
+
+
+def generate_payload(
+    count: int,
+    suffix_rate: float = 0.1,
+    duplicate_rate: float = 0.02,
+    seed: int = 42
+) -> Dict[str, Any]:
+    """
+    Generate a complete players-ranking API response.
+
+    Args:
+        count: Number of player entries
+        suffix_rate: Share of ~suffixed alternate accounts
+        duplicate_rate: Share of verbatim duplicate entries
+        seed: Random seed
+
+    Returns:
+        dict: API response with code, success and players
+    """
+    return {
+        'code': 200,
+        'success': True,
+        'players': generate_players(count, suffix_rate, duplicate_rate, seed)
+    }
@@ -0,0 +1,147 @@
+"""
+Tenants module for running many TopGames servers from one process.
+
+This module loads a tenants file listing servers (each with its own API URL,
+webhook, snapshot directory and schedule) and runs them on a bounded worker
+pool sharing HTTP connection pools, keeping each tenant's failures isolated.
+"""
+
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List
+from config import Config, get_config
+import profiling
+
+logger = logging.getLogger(__name__)
+
+
+def load_tenants(tenants_file: str) -> List[Config]:
+    """
+    Load and validate the tenants file.
+
+    The file is either a list of tenant entries or an object with optional
+    "defaults" applied to every tenant and a "tenants" list. Entry keys are
+    Config attribute names (api_url, webhook_url, snapshots_dir, timezone, ...);
+    anything not set falls back to the environment.
+
+    Args:
+        tenants_file: Path to the JSON tenants file
+
+    Returns:
+        list: One validated Config per tenant
+
+    Raises:
+        ValueError: If the file is invalid or a tenant's configuration is invalid
+    """
+    try:
+        with open(tenants_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ValueError(f"Cannot read tenants file {tenants_file}: {e}")
+
+    if isinstance(data, list):
+        data = {'tenants': data}
+
+    defaults: Dict[str, Any] = data.get('defaults', {})
+    entries = data.get('tenants', [])
+    if not entries:
+        raise ValueError(f"Tenants file {tenants_file} lists no tenants")
+
+    configs = []
+    for index, entry in enumerate(entries, 1):
+        values = {**defaults, **entry}
+        name = values.setdefault('name', f"tenant{index}")
+        try:
+            configs.append(get_config(values))
+        except ValueError as e:
+            raise ValueError(f"Tenant '{name}': {e}")
+
+    # Tenants must not share state on disk
+    for attribute in ('name', 'snapshots_dir'):
+        seen = set()
+        for config in configs:
+            value = getattr(config, attribute)
+            if value in seen:
+                raise ValueError(f"Duplicate {attribute} '{value}' in tenants file")
+            seen.add(value)
+
+    return configs
+
+
+def create_shared_session(pool_size: int):
+    """
+    Create an HTTP session whose connection pools are shared by all tenants.
+
+    Args:
+        pool_size: Connections kept per host (match the number of workers)
+
+    Returns:
+        requests.Session: Session with enlarged connection pools
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+class TenantRunner:
+    """Runs one run function per tenant on a bounded worker pool."""
+
+    def __init__(self, max_workers: int = 8):
+        """
+        Initialize the runner.
+
+        Args:
+            max_workers: Maximum number of tenants processed at the same time
+        """
+        self.max_workers = max_workers
+
+    @staticmethod
+    def _run_isolated(name: str, run: Callable[[], int]) -> int:
+        """
+        Run a tenant, turning any exception into a failed exit code.
+
+        Args:
+            name: Tenant name for logging
+            run: Function performing the tenant's run
+
+        Returns:
+            int: Exit code of the run (1 if it raised)
+        """
+        try:
+            with profiling.profile_thread():
+                return run()
+        except Exception as e:
+            logger.error(f"Tenant '{name}' failed: {e}", exc_info=True)
+            return 1
+
+    def run(self, runs: Dict[str, Callable[[], int]]) -> int:
+        """
+        Run all tenants.
+
+        Args:
+            runs: Function performing one run, keyed by tenant name
+
+        Returns:
+            int: 0 if every tenant succeeded, 1 otherwise
+        """
+        failed = []
+        workers = max(1, min(self.max_workers, len(runs)))
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='tenant') as executor:
+            futures = {executor.submit(self._run_isolated, name, run): name for name, run in runs.items()}
+            for future in as_completed(futures):
+                if future.result() != 0:
+                    failed.append(futures[future])
+
+        if failed:
+            logger.error(f"{len(failed)}/{len(runs)} tenants failed: {', '.join(sorted(failed))}")
+            return 1
+
+        logger.info(f"All {len(runs)} tenants finished successfully")
+        return 0
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the monthly and all-time aggregate leaderboards.
+"""
+
+import os
+import json
+import logging
+import tempfile
+from datetime import datetime
+from aggregates import AggregateStore
+from clock import RunClock
+from config import get_config
+from job_ledger import JobLedger, LEDGER_FILENAME, MONTHLY_FINAL
+from main import run_once
+from models import Player
+from simulator import SimulatedAPI
+from snapshot_manager import SnapshotManager
+from webhook import RecordingWebhook
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def ranking(**votes):
+    """Ranked players from votes keyed by name."""
+    players = sorted(votes.items(), key=lambda item: item[1], reverse=True)
+    return [Player(name, count, rank) for rank, (name, count) in enumerate(players, start=1)]
+
+def test_incremental_aggregates():
+    """Test that repeated runs and a month rollover keep correct totals."""
+    print("🧪 Testing Aggregate Leaderboards")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        store_file = os.path.join(temp_dir, "aggregates.json")
+        store = AggregateStore(store_file)
+        store.update(ranking(Alice=10, Bob=20), datetime(2025, 2, 10))
+        store.update(ranking(Alice=40, Bob=30), datetime(2025, 2, 28))
+        # Votes reset on the 1st; February's rows stay
+        store = AggregateStore(store_file)
+        store.update(ranking(Bob=5, Carol=8), datetime(2025, 3, 1))
+        store.update(ranking(Bob=50, Carol=12, Dave=0), datetime(2025, 3, 31))
+
+        month_over_month = store.month_over_month('2025-03')
+        print(f"  March vs February: {month_over_month}")
+        assert [(row['playername'], row['votes'], row['change']) for row in month_over_month] == \
+            [('Bob', 50, 20), ('Carol', 12, None)]
+
+        hall_of_fame = store.hall_of_fame()
+        print(f"  Hall of fame: {hall_of_fame}")
+        assert [(row['playername'], row['votes'], row['months_active'], row['best_rank']) for row in hall_of_fame] == \
+            [('Bob', 80, 2, 1), ('Alice', 40, 1, 1), ('Carol', 12, 1, 1)]
+        print("  ✅ Monthly totals, months active and best ranks folded in incrementally")
+
+        # An older (lower) total folded in later changes nothing
+        store.update(ranking(Bob=40, Carol=12), datetime(2025, 3, 30))
+        assert store.hall_of_fame()[0]['votes'] == 80
+
+        for month in (4, 5, 6):
+            store.update(ranking(Bob=month, Erin=1), datetime(2025, month, 10))
+        with open(store_file, 'r', encoding='utf-8') as f:
+            stored = json.load(f)
+        print(f"  Months kept in full: {sorted(stored['months'])}, folded: {stored['folded']}")
+        assert sorted(stored['months']) == ['2025-04', '2025-05', '2025-06']
+        assert stored['folded'] == {'2025-02': [['Alice', 40], ['Bob', 30]], '2025-03': [['Bob', 50], ['Carol', 12]]}
+        assert [(row['playername'], row['change']) for row in store.month_over_month('2025-03')] == \
+            [('Bob', 20), ('Carol', None)]
+        assert store.hall_of_fame()[0] == {'rank': 1, 'playername': 'Bob', 'votes': 95, 'months_active': 5, 'best_rank': 1}
+        print("  ✅ Only the last months kept per player, older months folded to their top rows")
+
+def test_monthly_recap_posts():
+    """Test that the month-end run posts the recap after the final ranking when enabled."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config = get_config({
+            'api_url': 'simulated://topgames',
+            'webhook_url': 'simulated://discord',
+            'snapshots_dir': temp_dir,
+            'monthly_recap': 1,
+        })
+        api = SimulatedAPI(players=30)
+        webhook = RecordingWebhook()
+        for now in (datetime(2025, 2, 28, 23, 55), datetime(2025, 3, 31, 23, 55)):
+            api.now = now
+            webhook.payloads.clear()
+            assert run_once(config, api, webhook, clock=RunClock(None, now), pipeline_workers=1) == 0
+
+        titles = [payload['embeds'][0]['title'] for payload in webhook.payloads]
+        print(f"  Posts on March 31: {titles}")
+        assert titles[-2:] == ["📅 Monatsvergleich: März vs Februar", "🏛️ Ruhmeshalle"]
+        changes = webhook.payloads[-2]['embeds'][0]['fields'][1]['value']
+        assert "(+" in changes or "(-" in changes
+        print("  ✅ Month-over-month and hall of fame posted after the final ranking")
+
+def test_catch_up_records_month():
+    """Test that a caught-up month end folds the month's last snapshot into the aggregates."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config = get_config({
+            'api_url': 'simulated://topgames',
+            'webhook_url': 'simulated://discord',
+            'snapshots_dir': temp_dir,
+            'monthly_recap': 1,
+        })
+        SnapshotManager(temp_dir).save_snapshot(ranking(Alice=40, Bob=30), datetime(2025, 2, 23))
+        JobLedger(os.path.join(temp_dir, LEDGER_FILENAME)).mark_run(MONTHLY_FINAL, datetime(2025, 1, 31))
+
+        # Down from February 23 until March 2
+        api = SimulatedAPI(players=30)
+        api.now = datetime(2025, 3, 2, 9, 0)
+        webhook = RecordingWebhook()
+        assert run_once(config, api, webhook, clock=RunClock(None, api.now), pipeline_workers=1) == 0
+
+        titles = [payload['embeds'][0]['title'] for payload in webhook.payloads]
+        print(f"  Posts on March 2: {titles}")
+        assert titles[-2:] == ["📅 Monatsvergleich: Februar vs Januar", "🏛️ Ruhmeshalle"]
+        store = AggregateStore(os.path.join(temp_dir, "aggregates.json"))
+        assert [(row['playername'], row['votes']) for row in store.month_over_month('2025-02')] == \
+            [('Alice', 40), ('Bob', 30)]
+        print("  ✅ Missed month recorded from its last snapshot and recapped")
+    print("\n🎉 Aggregate leaderboards behave correctly!")
+    print("\n🎉 Aggregate leaderboards behave correctly!")
+
+if __name__ == "__main__":
+    test_incremental_aggregates()
+    test_monthly_recap_posts()
+    test_catch_up_records_month()
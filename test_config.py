@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Test script to verify immutable configuration and hot reloading.
+"""
+
+import os
+import json
+import stat
+import contextlib
+import io
+import logging
+import tempfile
+from dataclasses import FrozenInstanceError
+import config as config_module
+from config import ConfigStore, get_config, _read_env_cache, _write_env_cache
+from tenants import load_tenants
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def write_tenants(path, max_voters, timezone=''):
+    """Write a one-tenant file and bump its mtime so the change is visible."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump([{
+            "name": "one",
+            "api_url": "https://api.example/one",
+            "webhook_url": "https://discord.example/hook",
+            "max_voters": max_voters,
+            "timezone": timezone
+        }], f)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+def test_config_is_immutable():
+    """Test that a validated configuration can't be changed afterwards."""
+    print("🧪 Testing Configuration")
+    print("=" * 50)
+
+    config = get_config({"api_url": "https://api.example", "webhook_url": "https://discord.example/hook",
+                         "max_voters": "15"})
+    assert config.max_voters == 15
+    try:
+        config.max_voters = 20
+        raise AssertionError("Config was modified")
+    except FrozenInstanceError:
+        print("  ✅ Config is immutable")
+    assert "discord.example" not in repr(config), "webhook URL leaked into repr"
+
+def test_reload_only_on_change():
+    """Test that the store reloads on change and keeps the last good config."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "tenants.json")
+        write_tenants(path, 10)
+
+        loads = []
+        store = ConfigStore(lambda: loads.append(1) or load_tenants(path), [path])
+        first = store.current
+
+        assert not store.reload_if_changed()
+        assert store.current is first and len(loads) == 1
+        print("  ✅ Unchanged file not reloaded")
+
+        write_tenants(path, 25)
+        assert store.reload_if_changed()
+        assert store.current[0].max_voters == 25
+        assert first[0].max_voters == 10, "in-flight config changed"
+        print("  ✅ Changed file reloaded, old object untouched")
+
+        good = store.current
+        write_tenants(path, 30, timezone="Mars/Olympus")
+        assert not store.reload_if_changed()
+        assert store.current is good
+        assert not store.reload_if_changed(), "rejected file was retried"
+        assert len(loads) == 3
+        print("  ✅ Invalid config rejected, last good one kept")
+
+def test_env_cache_private():
+    """Test that the .env cache holding the webhook secret is owner-only, even over an old file."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache_file = os.path.join(temp_dir, ".env.cache")
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            f.write("{}")
+        os.chmod(cache_file, 0o644)
+
+        _write_env_cache(cache_file, (1, 2), {'DISCORD_WEBHOOK_URL': 'https://discord.example/secret'})
+        mode = stat.S_IMODE(os.stat(cache_file).st_mode)
+        print(f"  Cache mode: {oct(mode)}")
+        assert mode == 0o600
+        assert _read_env_cache(cache_file, (1, 2)) == {'DISCORD_WEBHOOK_URL': 'https://discord.example/secret'}
+        assert os.listdir(temp_dir) == [".env.cache"], "temporary file left behind"
+        print("  ✅ Cache replaced by a fresh owner-only file")
+
+def test_settings_from_env_file():
+    """Test that command line defaults and profiling settings read .env like Config does."""
+    import main
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        env_file = os.path.join(temp_dir, ".env")
+        with open(env_file, 'w', encoding='utf-8') as f:
+            f.write("METRICS_PORT=9109\nTENANTS_FILE=tenants.json\nPROFILE_DIR=reports\n")
+
+        env_file_before = config_module.ENV_FILE
+        config_module.ENV_FILE = env_file
+        try:
+            args = main.parse_args([])
+            assert args.metrics_port == 9109 and args.tenants == 'tenants.json' and args.workers == 8
+            assert config_module.get_setting('PROFILE_DIR', 'profiling') == 'reports'
+            print("  ✅ .env settings reach the command line defaults")
+
+            with open(env_file, 'a', encoding='utf-8') as f:
+                f.write("TENANT_WORKERS=lots\n")
+            errors = io.StringIO()
+            with contextlib.redirect_stderr(errors):
+                try:
+                    main.parse_args([])
+                    raise AssertionError("invalid TENANT_WORKERS accepted")
+                except SystemExit as e:
+                    assert e.code == 2
+            assert "TENANT_WORKERS must be an integer, got 'lots'" in errors.getvalue()
+            print("  ✅ Invalid integer setting reported as a usage error")
+        finally:
+            config_module.ENV_FILE = env_file_before
+            config_module._env_values = None
+    print("\n🎉 Configuration behaves correctly!")
+
+if __name__ == "__main__":
+    test_config_is_immutable()
+    test_reload_only_on_change()
+    test_env_cache_private()
+    test_settings_from_env_file()
@@ -49,7 +49,7 @@ def test_name_consolidation():
     
     print("\n📈 Consolidated Rankings:")
     for player in consolidated_rankings:
-        print(f"  #{player['rank']}. {player['playername']}: {player['votes']} votes")
+        print(f"  #{player.rank}. {player.playername}: {player.votes} votes")
     
     print("\n✅ Expected Results:")
     print("  - Borsti1: 47 votes (25 + 12 + 10)")
@@ -70,8 +70,8 @@ def test_name_consolidation():
     print("\n🔍 Verification:")
     all_correct = True
     for player in consolidated_rankings:
-        name = player['playername']
-        votes = player['votes']
+        name = player.playername
+        votes = player.votes
         expected = expected_results.get(name, 0)
         
         if votes == expected:
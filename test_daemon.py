@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Test script to check the daemon scheduler's next fire times.
+"""
+
+import logging
+from datetime import datetime
+from clock import get_timezone
+from daemon import DaemonScheduler
+from schedule_manager import ScheduleManager
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def test_next_fire_times():
+    """Test next fire times for daily, weekly, month-end and interval triggers."""
+    print("🧪 Testing Daemon Scheduler")
+    print("=" * 50)
+
+    run_time = ScheduleManager.parse_run_time("23:55")
+    daily_only = DaemonScheduler(run_time)
+    with_interval = DaemonScheduler(run_time, interval_minutes=360)
+
+    scenarios = [
+        # (scheduler, now, expected fire time, expected reason)
+        (daily_only, datetime(2025, 11, 24, 12, 0), datetime(2025, 11, 24, 23, 55), 'daily'),
+        (daily_only, datetime(2025, 11, 24, 23, 55), datetime(2025, 11, 25, 23, 55), 'daily'),
+        (daily_only, datetime(2025, 11, 23, 8, 0), datetime(2025, 11, 23, 23, 55), 'weekly'),
+        (daily_only, datetime(2025, 12, 31, 1, 0), datetime(2025, 12, 31, 23, 55), 'month_end'),
+        (daily_only, datetime(2025, 11, 30, 10, 0), datetime(2025, 11, 30, 23, 55), 'month_end'),
+        (with_interval, datetime(2025, 11, 24, 7, 30), datetime(2025, 11, 24, 12, 0), 'interval'),
+        (with_interval, datetime(2025, 11, 24, 18, 0), datetime(2025, 11, 24, 23, 55), 'daily'),
+        (with_interval, datetime(2025, 11, 24, 23, 56), datetime(2025, 11, 25, 0, 0), 'interval'),
+    ]
+
+    all_correct = True
+    for scheduler, now, expected_time, expected_reason in scenarios:
+        fire_at, reason = scheduler.next_fire(now)
+        ok = fire_at == expected_time and reason == expected_reason
+        all_correct = all_correct and ok
+        print(f"  {'✅' if ok else '❌'} {now:%a %Y-%m-%d %H:%M} -> {fire_at:%a %Y-%m-%d %H:%M} ({reason})")
+
+    assert all_correct, "Some fire times were wrong"
+    print("\n🎉 All fire times are correct!")
+
+def test_fire_time_across_dst_change():
+    """Test that the daily run keeps its wall-clock time when DST ends."""
+    berlin = get_timezone("Europe/Berlin")
+    scheduler = DaemonScheduler(ScheduleManager.parse_run_time("23:55"))
+
+    # Clocks go back one hour during the night of 25./26.10.2025
+    now = datetime(2025, 10, 25, 23, 56, tzinfo=berlin)
+    fire_at, reason = scheduler.next_fire(now)
+    hours_until = (fire_at.timestamp() - now.timestamp()) / 3600
+
+    print(f"  {now.isoformat()} -> {fire_at.isoformat()} ({reason}, {hours_until:.2f}h)")
+    assert (fire_at.hour, fire_at.minute) == (23, 55)
+    assert fire_at.utcoffset().total_seconds() == 3600
+    assert round(hours_until, 2) == 24.98
+
+if __name__ == "__main__":
+    test_next_fire_times()
+    test_fire_time_across_dst_change()
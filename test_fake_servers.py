@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Test script running the bot end to end against the local fake servers.
+"""
+
+import os
+import logging
+import tempfile
+import requests
+from config import get_config
+from fake_servers import FakeDiscordWebhook, FakeTopGamesAPI
+from main import run_once
+from synthetic_data import generate_payload
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def test_end_to_end_run():
+    """Test a full run posting the consolidated top voters."""
+    print("🧪 Testing End-to-End Run Against Fake Servers")
+    print("=" * 50)
+
+    with FakeTopGamesAPI(generate_payload(500)) as api, FakeDiscordWebhook() as discord, \
+            tempfile.TemporaryDirectory() as temp_dir:
+        config = get_config({
+            "api_url": f"{api.url}/players-ranking",
+            "webhook_url": f"{discord.url}/api/webhooks/1/token",
+            "snapshots_dir": os.path.join(temp_dir, "snapshots"),
+        })
+        exit_code = run_once(config)
+
+        print(f"  Exit code {exit_code}, {len(discord.received)} post(s) received")
+        assert exit_code == 0
+        assert discord.received, "nothing was posted"
+        players_column = discord.received[0]['embeds'][0]['fields'][0]['value']
+        assert len(players_column.splitlines()) == config.max_voters
+        print("  ✅ Ranking posted within Discord's limits")
+
+def test_etag_rate_limit_and_limits():
+    """Test ETag revalidation, 429 responses and payload validation."""
+    with FakeTopGamesAPI(generate_payload(10)) as api, FakeDiscordWebhook(rate_limit=2, rate_window=60) as discord:
+        first = requests.get(f"{api.url}/players-ranking", timeout=5)
+        second = requests.get(f"{api.url}/players-ranking", headers={'If-None-Match': first.headers['ETag']}, timeout=5)
+        assert first.status_code == 200 and second.status_code == 304
+        print("  ✅ ETag answered with 304 Not Modified")
+
+        too_long = {"embeds": [{"title": "x" * 300}]}
+        statuses = [
+            requests.post(discord.url, json=too_long, timeout=5).status_code,
+            requests.post(discord.url, json={"content": "ok"}, timeout=5).status_code,
+        ]
+        limited = requests.post(discord.url, json={"content": "ok"}, timeout=5)
+        print(f"  Statuses: {statuses + [limited.status_code]}, Retry-After {limited.headers.get('Retry-After')}")
+        assert statuses == [400, 204]
+        assert limited.status_code == 429 and 'Retry-After' in limited.headers
+        assert limited.json()['retry_after'] > 0
+        print("  ✅ Payload limits and rate limits enforced")
+    print("\n🎉 Fake servers behave correctly!")
+
+if __name__ == "__main__":
+    test_end_to_end_run()
+    test_etag_rate_limit_and_limits()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the per-player history index and CLI.
+"""
+
+import os
+import time
+import logging
+import tempfile
+from datetime import datetime, timedelta
+from history import HistoryIndex, HISTORY_INDEX_FILENAME, main as history_main
+from models import Player
+from snapshot_manager import SnapshotManager
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def players(**votes):
+    """Player list from votes keyed by name."""
+    return [Player(name, count) for name, count in votes.items()]
+
+def test_history_index():
+    """Test incremental updates, weekly deltas and lookups after cleanup."""
+    print("🧪 Testing Player History")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manager = SnapshotManager(temp_dir)
+        manager.save_snapshot(players(Alice=10, Bob=15), datetime(2025, 1, 19))
+        manager.save_snapshot(players(Alice=30, Bob=20), datetime(2025, 1, 26))
+        manager.save_snapshot(players(Alice=4, Bob=9), datetime(2025, 2, 2))
+        # A catch-up replaces the entry of its date
+        manager.save_snapshot(players(Alice=12, Bob=9), datetime(2025, 2, 2))
+        manager.cleanup_old_snapshots(keep_weeks=1, today=datetime(2025, 2, 2))
+
+        index = HistoryIndex(os.path.join(temp_dir, HISTORY_INDEX_FILENAME))
+        history = index.lookup('alice~alt')
+        print(f"  alice: {history}")
+        assert [(entry['date'], entry['votes'], entry['rank'], entry['weekly_delta']) for entry in history] == [
+            ('2025-01-19', 10, 2, 10), ('2025-01-26', 30, 1, 20), ('2025-02-02', 12, 1, 12),
+        ]
+        assert [entry['weekly_delta'] for entry in index.lookup('Bob', since=datetime(2025, 1, 20))] == [5, 9]
+        print("  ✅ Case/suffix-insensitive lookup, weekly deltas, history kept after cleanup")
+
+        assert history_main(['Alice', '--snapshots-dir', temp_dir]) == 0
+        assert history_main(['Nobody', '--snapshots-dir', temp_dir]) == 1
+
+def test_upgrade_keeps_history():
+    """Test that the first save after an upgrade indexes the older snapshots too."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # Snapshots written by a version without the index
+        old = SnapshotManager(temp_dir)
+        old.save_snapshot(players(Borsti1=5), datetime(2025, 1, 5))
+        old.save_snapshot(players(Borsti1=9), datetime(2025, 1, 12))
+        os.remove(os.path.join(temp_dir, HISTORY_INDEX_FILENAME))
+
+        SnapshotManager(temp_dir).save_snapshot(players(Borsti1=14), datetime(2025, 1, 19))
+        history = HistoryIndex(os.path.join(temp_dir, HISTORY_INDEX_FILENAME)).lookup('Borsti1')
+        print(f"  borsti1 after upgrade: {history}")
+        assert [entry['date'] for entry in history] == ['2025-01-05', '2025-01-12', '2025-01-19']
+        assert history_main(['Borsti1', '--snapshots-dir', temp_dir]) == 0
+        print("  ✅ Snapshots from before the index kept after the first save")
+
+def test_reindex_and_lookup_speed():
+    """Test building the index from existing snapshots and sub-millisecond lookups."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manager = SnapshotManager(temp_dir)
+        manager.save_snapshot(players(Alice=10), datetime(2025, 1, 5))
+        os.remove(os.path.join(temp_dir, HISTORY_INDEX_FILENAME))
+        index = HistoryIndex(os.path.join(temp_dir, HISTORY_INDEX_FILENAME))
+        assert index.reindex(temp_dir) == 1 and index.lookup('Alice')[0]['votes'] == 10
+        print("  ✅ Snapshots saved before the index existed reindexed")
+
+        # Three years of weekly snapshots with 1000 players
+        big = HistoryIndex(os.path.join(temp_dir, "big_index.json"))
+        day = datetime(2022, 1, 2)
+        for week in range(156):
+            big.add_snapshot(day + timedelta(weeks=week), {f"Player{i}": week * 10 + i for i in range(1000)}, save=False)
+
+        started = time.perf_counter()
+        history = big.lookup('player500', since=datetime(2024, 7, 1))
+        elapsed = time.perf_counter() - started
+        print(f"  Lookup of {len(history)} entries: {elapsed * 1e6:.0f} µs")
+        assert history and elapsed < 0.001
+        print("  ✅ Lookup under a millisecond")
+    print("\n🎉 Player history behaves correctly!")
+
+if __name__ == "__main__":
+    test_history_index()
+    test_upgrade_keeps_history()
+    test_reindex_and_lookup_speed()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark script to catch cold-start regressions in cron mode.
+
+Runs `python -X importtime -c "import main"` in a fresh interpreter and checks
+that HTTP and snapshot code is not imported up front.
+"""
+
+import os
+import sys
+import subprocess
+
+# Modules that must only be imported by the stage that needs them
+LAZY_MODULES = ['requests', 'urllib3', 'dotenv', 'api_client', 'webhook', 'snapshot_manager', 'daemon']
+
+# Imports main defers; their measured cost is the baseline main must stay under
+BASELINE_STATEMENT = "import requests, dotenv"
+
+
+def measure_imports(statement: str = "import main"):
+    """
+    Import-time profile of a statement in a fresh interpreter.
+
+    Args:
+        statement: Python statement to profile
+
+    Returns:
+        dict: Cumulative import time in microseconds keyed by module name
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        timings[name.strip()] = int(cumulative)
+    return timings
+
+
+def test_main_import_time():
+    """Test that importing main stays cheap and skips HTTP/snapshot modules."""
+    print("🧪 Testing Cold-Start Import Time")
+    print("=" * 50)
+
+    timings = measure_imports()
+    main_us = timings['main']
+    # Measured now, on the same machine and load, instead of a fixed budget
+    baseline = measure_imports(BASELINE_STATEMENT)
+    baseline_us = sum(baseline[name] for name in ('requests', 'dotenv'))
+    eager = [module for module in LAZY_MODULES if module in timings]
+
+    # Show the heaviest direct and indirect imports
+    for name, cumulative in sorted(timings.items(), key=lambda item: item[1], reverse=True)[:8]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    print(f"\nimport main: {main_us / 1000:.1f} ms (baseline `{BASELINE_STATEMENT}`: {baseline_us / 1000:.1f} ms)")
+    print(f"Eagerly imported lazy modules: {eager or 'none'}")
+
+    assert not eager, f"Modules imported at startup that should be lazy: {eager}"
+    assert main_us < baseline_us, (
+        f"import main took {main_us / 1000:.1f} ms, more than the {baseline_us / 1000:.1f} ms it defers"
+    )
+
+
+if __name__ == "__main__":
+    test_main_import_time()
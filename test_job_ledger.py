@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test script to verify exactly-once weekly/monthly jobs and missed-run catch-up.
+"""
+
+import os
+import logging
+import tempfile
+from datetime import datetime
+from clock import RunClock
+from config import get_config
+from job_ledger import JobLedger, WEEKLY_SNAPSHOT, WEEKLY_ANALYSIS, MONTHLY_FINAL
+from main import run_once
+from schedule_manager import ScheduleManager
+from simulator import SimulatedAPI
+from snapshot_manager import SnapshotManager
+from webhook import RecordingWebhook
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def test_exactly_once_and_catch_up():
+    """Test that periodic jobs run once per period and missed periods are caught up."""
+    print("🧪 Testing Job Ledger")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        ledger_file = os.path.join(temp_dir, "job_ledger.json")
+        ledger = JobLedger(ledger_file)
+
+        checks = []
+
+        # Fresh install on a Monday: nothing to catch up
+        checks.append(("Fresh install, Monday", ScheduleManager.get_due_period(WEEKLY_SNAPSHOT, datetime(2025, 11, 17, 12), ledger), None))
+
+        # Sunday: due once, then done for the rest of the day
+        sunday = datetime(2025, 11, 23, 23, 55)
+        checks.append(("Sunday, first run", ScheduleManager.get_due_period(WEEKLY_SNAPSHOT, sunday, ledger), datetime(2025, 11, 23)))
+        ledger.mark_run(WEEKLY_SNAPSHOT, datetime(2025, 11, 23))
+        checks.append(("Sunday, second run", ScheduleManager.get_due_period(WEEKLY_SNAPSHOT, sunday, ledger), None))
+
+        # Ledger survives a restart
+        ledger = JobLedger(ledger_file)
+        checks.append(("Sunday, after restart", ScheduleManager.get_due_period(WEEKLY_SNAPSHOT, sunday, ledger), None))
+
+        # Host down on Sunday 30.11: caught up on Tuesday
+        checks.append(("Missed Sunday, Tuesday", ScheduleManager.get_due_period(WEEKLY_SNAPSHOT, datetime(2025, 12, 2, 9), ledger), datetime(2025, 11, 30)))
+
+        # Month end: due on the last day, caught up after the month rolled over
+        checks.append(("Month end", ScheduleManager.get_due_period(MONTHLY_FINAL, datetime(2025, 11, 30, 23, 55), ledger), datetime(2025, 11, 30)))
+        ledger.mark_run(MONTHLY_FINAL, datetime(2025, 10, 31))
+        checks.append(("Missed month end, 1st", ScheduleManager.get_due_period(MONTHLY_FINAL, datetime(2025, 12, 1, 9), ledger), datetime(2025, 11, 30)))
+        ledger.mark_run(MONTHLY_FINAL, datetime(2025, 11, 30))
+        checks.append(("Month end done, 2nd", ScheduleManager.get_due_period(MONTHLY_FINAL, datetime(2025, 12, 2, 9), ledger), None))
+
+        # Post type falls back to daily once the final was posted
+        checks.append(("Post type after final", ScheduleManager.get_post_type(datetime(2025, 11, 30, 23, 59), ledger), 'weekly_and_daily'))
+        ledger.mark_run(WEEKLY_ANALYSIS, datetime(2025, 11, 30))
+        checks.append(("Post type after both", ScheduleManager.get_post_type(datetime(2025, 11, 30, 23, 59), ledger), 'daily'))
+
+    all_correct = True
+    for label, actual, expected in checks:
+        ok = actual == expected
+        all_correct = all_correct and ok
+        print(f"  {'✅' if ok else '❌'} {label}: {actual} (expected {expected})")
+
+    assert all_correct, "Some ledger checks failed"
+
+def test_catch_up_keeps_snapshots_real():
+    """Test that a missed Sunday isn't faked from later data and a missing baseline is retried."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config = get_config({
+            'api_url': 'simulated://topgames',
+            'webhook_url': 'simulated://discord',
+            'snapshots_dir': temp_dir,
+        })
+        api = SimulatedAPI(players=20)
+        ledger = JobLedger(os.path.join(temp_dir, "job_ledger.json"))
+
+        def run(now):
+            api.now = now
+            webhook = RecordingWebhook()
+            assert run_once(config, api, webhook, ledger=ledger, clock=RunClock(None, now), pipeline_workers=1) == 0
+            return webhook
+
+        # First Sunday: no baseline yet, so the analysis stays due
+        run(datetime(2025, 3, 9, 23, 55))
+        assert ledger.last_period(WEEKLY_ANALYSIS) is None
+        assert ScheduleManager.get_due_period(WEEKLY_ANALYSIS, datetime(2025, 3, 9, 23, 59), ledger) == datetime(2025, 3, 9)
+        print("  ✅ Analysis without a baseline left due for a retry")
+
+        # Host down on Sunday 16.03, back on Tuesday
+        run(datetime(2025, 3, 18, 9, 0))
+        dates = [d.strftime('%Y-%m-%d') for d in SnapshotManager(temp_dir).get_snapshot_dates()]
+        print(f"  Snapshots: {dates}")
+        assert dates == ['2025-03-09']
+        assert ledger.last_period(WEEKLY_SNAPSHOT) == '2025-03-16'
+        print("  ✅ Missed snapshot skipped instead of saved from Tuesday's totals")
+    print("\n🎉 All ledger checks are correct!")
+
+if __name__ == "__main__":
+    test_exactly_once_and_catch_up()
+    test_catch_up_keeps_snapshots_real()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the read-only leaderboard endpoint.
+"""
+
+import json
+import logging
+import tempfile
+import urllib.error
+import urllib.request
+from datetime import datetime
+from clock import RunClock
+from config import get_config
+from leaderboard_server import LeaderboardCache, etag_matches
+from main import run_once
+from simulator import SimulatedAPI
+from webhook import RecordingWebhook
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def fetch(url: str, etag: str = None):
+    """GET a URL, returning (status, headers, body)."""
+    request = urllib.request.Request(url, headers={'If-None-Match': etag} if etag else {})
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+def test_etag_and_routes():
+    """Test 200 with an ETag, 304 on a match, 404 and the single-server paths."""
+    print("🧪 Testing Leaderboard Endpoint")
+    print("=" * 50)
+
+    cache = LeaderboardCache()
+    cache.publish('Main', 'ranking', [{'playername': 'Alice', 'votes': 10, 'rank': 1}])
+    server = cache.serve(0)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        status, headers, body = fetch(f"{base}/Main/ranking")
+        etag = headers['ETag']
+        print(f"  GET /Main/ranking: {status} {etag} {body[:60]}")
+        assert status == 200 and json.loads(body)['ranking'][0]['playername'] == 'Alice'
+
+        status, _, body = fetch(f"{base}/Main/ranking", etag)
+        assert status == 304 and body == b''
+        assert etag.startswith('W/"')
+        assert fetch(f"{base}/Main/ranking", f'"other", {etag[2:]}')[0] == 304
+        assert fetch(f"{base}/Main/ranking", '*')[0] == 304
+        # A tag merely containing part of the current one doesn't match
+        assert fetch(f"{base}/Main/ranking", f'"{etag[3:-2]}"')[0] == 200
+        assert not etag_matches('', etag) and not etag_matches(etag + 'x', etag)
+        print("  ✅ 304 Not Modified for a matching ETag (weak, lists, *)")
+
+        # Republishing the same data keeps the ETag
+        cache.publish('Main', 'ranking', [{'playername': 'Alice', 'votes': 10, 'rank': 1}])
+        assert fetch(f"{base}/ranking", etag)[0] == 304
+        cache.publish('Main', 'ranking', [{'playername': 'Alice', 'votes': 11, 'rank': 1}])
+        assert fetch(f"{base}/ranking", etag)[0] == 200
+        print("  ✅ ETag follows the data; single-server shortcut path")
+
+        assert fetch(f"{base}/Main/weekly")[0] == 404
+        assert fetch(f"{base}/Other/ranking")[0] == 404
+        assert json.loads(fetch(base + "/")[2])['servers'] == ['Main']
+        print("  ✅ 404 for unpublished resources, index lists servers")
+
+        # A tenant removed from the tenants file stops being served
+        cache.publish('Other', 'ranking', [])
+        cache.retain(['Other'])
+        assert fetch(f"{base}/Main/ranking")[0] == 404 and cache.servers() == ['Other']
+        print("  ✅ Bodies of removed tenants dropped")
+    finally:
+        server.shutdown()
+
+def test_run_publishes():
+    """Test that runs publish the ranking, weekly votes and snapshot history."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config = get_config({
+            'api_url': 'simulated://topgames',
+            'webhook_url': 'simulated://discord',
+            'snapshots_dir': temp_dir,
+            'max_voters': 3,
+        })
+        api = SimulatedAPI(players=30)
+        cache = LeaderboardCache()
+        for now in (datetime(2025, 3, 9, 23, 55), datetime(2025, 3, 10, 12, 0)):
+            api.now = now
+            assert run_once(config, api, RecordingWebhook(), clock=RunClock(None, now),
+                            pipeline_workers=1, leaderboard=cache) == 0
+
+        ranking = json.loads(cache.get(config.name, 'ranking')[0])
+        weekly = json.loads(cache.get(config.name, 'weekly')[0])
+        history = json.loads(cache.get(config.name, 'history')[0])
+        newcomers = json.loads(cache.get(config.name, 'newcomers')[0])
+        print(f"  Ranking: {len(ranking['ranking'])} players, weekly: {len(weekly['weekly'])}, "
+              f"history: {[entry['date'] for entry in history['history']]}")
+        assert ranking['ranking'][0]['rank'] == 1 and ranking['updated_at'].startswith('2025-03-10')
+        assert weekly['weekly'] and 'weekly_votes' in weekly['weekly'][0]
+        assert [entry['date'] for entry in history['history']] == ['2025-03-09']
+        # Players outside the snapshot's top max_voters have no baseline
+        baseline = {player['playername']: player['votes'] for player in history['history'][0]['players']}
+        assert all(entry['playername'] in baseline and entry['last_week_votes'] == baseline[entry['playername']]
+                   for entry in weekly['weekly'])
+        assert len(ranking['ranking']) > len(baseline)
+        # A fresh aggregate store has seen nobody before this month
+        assert newcomers['newcomers'][0]['rank'] == 1
+        print("  ✅ Run results published for the endpoint")
+    print("\n🎉 Leaderboard endpoint behaves correctly!")
+
+if __name__ == "__main__":
+    test_etag_and_routes()
+    test_run_publishes()
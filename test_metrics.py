@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the Prometheus metrics export.
+"""
+
+import os
+import logging
+import tempfile
+from metrics import Counter, Gauge, Histogram, MetricsRegistry
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def test_prometheus_text_format():
+    """Test histogram buckets, counters and the textfile export."""
+    print("🧪 Testing Metrics Export")
+    print("=" * 50)
+
+    registry = MetricsRegistry()
+    seconds = registry.register(Histogram('test_stage_seconds', "Stage duration.", ['stage'], [0.1, 1.0]))
+    responses = registry.register(Counter('test_responses_total', "Responses.", ['status']))
+
+    for value in (0.05, 0.5, 5.0):
+        seconds.observe(value, stage='fetch')
+    responses.inc(status='200')
+    responses.inc(status='200')
+    responses.inc(status='429')
+
+    text = registry.render()
+    print(text)
+    expected = [
+        '# TYPE test_stage_seconds histogram',
+        'test_stage_seconds_bucket{stage="fetch",le="0.1"} 1',
+        'test_stage_seconds_bucket{stage="fetch",le="1"} 2',
+        'test_stage_seconds_bucket{stage="fetch",le="+Inf"} 3',
+        'test_stage_seconds_sum{stage="fetch"} 5.55',
+        'test_stage_seconds_count{stage="fetch"} 3',
+        'test_responses_total{status="200"} 2',
+        'test_responses_total{status="429"} 1',
+    ]
+    for line in expected:
+        assert line in text.splitlines(), f"missing line: {line}"
+
+    try:
+        seconds.observe(1.0)
+        raise AssertionError("Observation without labels was accepted")
+    except ValueError:
+        print("  ✅ Missing labels rejected")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "topvoter.prom")
+        assert registry.write_textfile(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            assert f.read() == text
+        assert os.listdir(temp_dir) == ["topvoter.prom"], "temporary file left behind"
+    print("  ✅ Textfile written")
+
+def run_process(path, server, seconds, status):
+    """Record one cron run in a fresh registry and merge it into the textfile."""
+    registry = MetricsRegistry()
+    run_seconds = registry.register(Histogram('test_run_seconds', "Run duration.", ['server'], [1.0]))
+    responses = registry.register(Counter('test_responses_total', "Responses.", ['server', 'status']))
+    last_run = registry.register(Gauge('test_last_run', "Last run.", ['server']))
+    run_seconds.observe(seconds, server=server)
+    responses.inc(server=server, status=status)
+    last_run.set(seconds * 100, server=server)
+    assert registry.write_textfile(path, merge=True)
+
+def test_cron_runs_accumulate():
+    """Test that consecutive cron processes continue the counters of the textfile."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "topvoter.prom")
+        run_process(path, 'one', 0.5, '200')
+        run_process(path, 'one', 2.0, '200')
+        run_process(path, 'two', 0.1, '429')
+
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        print("\n".join(lines))
+        for line in [
+            'test_run_seconds_bucket{server="one",le="1"} 1',
+            'test_run_seconds_bucket{server="one",le="+Inf"} 2',
+            'test_run_seconds_sum{server="one"} 2.5',
+            'test_run_seconds_count{server="one"} 2',
+            'test_run_seconds_count{server="two"} 1',
+            'test_responses_total{server="one",status="200"} 2',
+            'test_responses_total{server="two",status="429"} 1',
+            'test_last_run{server="one"} 200',
+            'test_last_run{server="two"} 10',
+        ]:
+            assert line in lines, f"missing line: {line}"
+        assert lines.count('# TYPE test_run_seconds histogram') == 1
+    print("  ✅ Counters and histograms continue across processes, gauges keep the latest value")
+    print("\n🎉 Metrics behave correctly!")
+
+if __name__ == "__main__":
+    test_prometheus_text_format()
+    test_cron_runs_accumulate()
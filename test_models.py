@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the slotted player records.
+"""
+
+import sys
+import logging
+import tracemalloc
+from models import Player, WeeklyPlayer, UNTRACKED
+from ranking import get_top_rankings
+from synthetic_data import generate_payload
+
+# Configure logging
+logging.basicConfig(
+    level=logging.WARNING,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def test_records():
+    """Test slots, interned names and the JSON forms."""
+    print("🧪 Testing Player Records")
+    print("=" * 50)
+
+    player = Player('Alice', 10, 1)
+    try:
+        player.vote = 11
+        assert False, "misspelled field accepted"
+    except AttributeError:
+        pass
+    assert not hasattr(player, '__dict__')
+    print("  ✅ No per-instance dict; misspelled fields raise AttributeError")
+
+    name = ''.join(['Ali', 'ce'])
+    assert Player(name, 3).playername is player.playername is sys.intern('Alice')
+    print("  ✅ Names interned")
+
+    assert player.to_dict() == {'playername': 'Alice', 'votes': 10, 'rank': 1}
+    player.previous_rank = None
+    assert Player.from_dict(player.to_dict()) == player and player.to_dict()['previous_rank'] is None
+    assert Player.from_dict({'playername': 'Bob', 'votes': '7'}).previous_rank == UNTRACKED
+    assert WeeklyPlayer('Bob', 5, 12, 7, 1).to_dict() == \
+        {'playername': 'Bob', 'weekly_votes': 5, 'total_votes': 12, 'last_week_votes': 7, 'rank': 1}
+    print("  ✅ JSON round trip keeps untracked/new movement apart")
+
+    for record in (player, WeeklyPlayer('Bob', 5, 12, 7, 1)):
+        try:
+            hash(record)
+            assert False, "mutable record hashable"
+        except TypeError:
+            pass
+    assert {player.playername: player}['Alice'] is player
+    print("  ✅ Records compared by value and deliberately unhashable")
+
+def test_ranking_memory():
+    """Test that a ranked roster takes less memory than the same players as dicts."""
+    payload = generate_payload(20000, seed=7)
+
+    tracemalloc.start()
+    ranked = get_top_rankings(payload, None)
+    records = tracemalloc.get_traced_memory()[0]
+    as_dicts = [player.to_dict() for player in ranked]
+    dicts = tracemalloc.get_traced_memory()[0] - records
+    tracemalloc.stop()
+
+    print(f"  {len(ranked)} players: {records / 1024:.0f} KiB as records, dicts alone add {dicts / 1024:.0f} KiB")
+    assert len(as_dicts) == len(ranked) and dicts > records
+    print("  ✅ Records smaller than the equivalent dicts")
+    print("\n🎉 Player records behave correctly!")
+
+if __name__ == "__main__":
+    test_records()
+    test_ranking_memory()
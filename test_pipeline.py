@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test script to verify that independent pipeline stages overlap.
+"""
+
+import logging
+import threading
+from pipeline import Pipeline
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def meeting(barrier, value):
+    """Stage function that only returns once the other stage is running at the same time."""
+    def stage(*_):
+        # Raises BrokenBarrierError (failing the stage) if the partner never shows up
+        barrier.wait()
+        return value
+    return stage
+
+def test_independent_stages_overlap():
+    """Test that independent stages run at the same time and posts keep their order."""
+    print("🧪 Testing Pipeline Concurrency")
+    print("=" * 50)
+
+    order = []
+    barrier = threading.Barrier(2, timeout=5)
+    pipeline = Pipeline()
+    pipeline.add('fetch', meeting(barrier, {'players': []}))
+    pipeline.add('load_snapshot', meeting(barrier, {'players': {}}))
+    pipeline.add('rank', lambda api_data: [], depends=['fetch'])
+    pipeline.add('post_daily', lambda players: order.append('daily') or True, depends=['rank'])
+    pipeline.add('post_weekly', lambda players, snapshot: order.append('weekly') or True,
+                 depends=['rank', 'load_snapshot'], after=['post_daily'])
+
+    result = pipeline.run()
+
+    print(f"  Errors: {list(result.errors)}")
+    print(f"  Post order: {order}")
+    assert not result.errors, "fetch and load_snapshot did not overlap"
+    assert order == ['daily', 'weekly']
+    assert result.get('post_weekly') is True
+
+def test_failed_stage_skips_dependents():
+    """Test that a failure only skips the stages depending on it."""
+    def fail():
+        raise RuntimeError("API down")
+
+    pipeline = Pipeline()
+    pipeline.add('fetch', fail)
+    pipeline.add('rank', lambda api_data: [], depends=['fetch'])
+    pipeline.add('post_daily', lambda players: True, depends=['rank'])
+    pipeline.add('load_snapshot', lambda: {'players': {}})
+
+    result = pipeline.run()
+
+    print(f"  Errors: {list(result.errors)}, skipped: {result.skipped}")
+    assert list(result.errors) == ['fetch']
+    assert result.skipped == ['rank', 'post_daily']
+    assert result.succeeded('load_snapshot')
+
+def test_failed_post_keeps_later_posts():
+    """Test that stages ordered after a failed stage still run, inline and threaded."""
+    def fail(*_):
+        raise RuntimeError("Discord down")
+
+    for workers in (1, 4):
+        order = []
+        pipeline = Pipeline(workers)
+        pipeline.add('rank', lambda: [])
+        pipeline.add('post_daily', fail, depends=['rank'])
+        pipeline.add('post_catch_up', lambda: order.append('catch_up') or True, after=['post_daily'])
+        pipeline.add('post_weekly', lambda players: order.append('weekly') or True,
+                     depends=['rank'], after=['post_catch_up'])
+        pipeline.add('publish', lambda players: True, depends=['post_daily'])
+
+        result = pipeline.run()
+
+        print(f"  {workers} worker(s): order {order}, skipped {result.skipped}")
+        assert order == ['catch_up', 'weekly']
+        assert list(result.errors) == ['post_daily'] and result.skipped == ['publish']
+    print("  ✅ A failed post only skips the stages consuming its result")
+    print("\n🎉 Pipeline behaves correctly!")
+
+if __name__ == "__main__":
+    test_independent_stages_overlap()
+    test_failed_stage_skips_dependents()
+    test_failed_post_keeps_later_posts()
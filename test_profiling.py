@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Test script to verify opt-in profiling and report rotation.
+"""
+
+import os
+import logging
+import tempfile
+import profiling
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def work():
+    """Allocate and compute a little so both profilers have something to report."""
+    return sum(len(str(i)) for i in range(20000))
+
+def test_profiling_reports_and_rotation():
+    """Test that flags off is a no-op and flags on writes rotated reports."""
+    print("🧪 Testing Profiling")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.environ['PROFILE_DIR'] = temp_dir
+        os.environ['PROFILE_KEEP'] = '2'
+        try:
+            with profiling.profile_run('off'):
+                work()
+            assert os.listdir(temp_dir) == [], "profiled although the flags are off"
+            print("  ✅ No report with the flags off")
+
+            os.environ['PROFILE_CPU'] = '1'
+            os.environ['PROFILE_MEMORY'] = '1'
+            for _ in range(3):
+                with profiling.profile_run('bench'):
+                    work()
+
+            files = sorted(os.listdir(temp_dir))
+            print(f"  Reports: {files}")
+            assert len(files) == 4, "rotation should keep 2 runs (.prof + .txt each)"
+            with open(os.path.join(temp_dir, files[-1]), 'r', encoding='utf-8') as f:
+                report = f.read()
+            assert "cumulative time" in report and "Memory: peak" in report
+            print("  ✅ CPU and memory report written, old runs rotated")
+        finally:
+            for name in ('PROFILE_DIR', 'PROFILE_KEEP', 'PROFILE_CPU', 'PROFILE_MEMORY'):
+                os.environ.pop(name, None)
+    print("\n🎉 Profiling behaves correctly!")
+
+if __name__ == "__main__":
+    test_profiling_reports_and_rotation()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test script to verify rank movement indicators and overtake events.
+"""
+
+import os
+import json
+import logging
+import tempfile
+from datetime import datetime
+from config import get_config
+from main import run_render
+from models import Player, UNTRACKED
+from rank_tracker import RankTracker, RANK_INDEX_FILENAME
+from synthetic_data import generate_payload
+from webhook import DiscordWebhook
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def ranking(*names):
+    """Ranked players in the given order."""
+    return [Player(name, 100 - rank, rank) for rank, name in enumerate(names, start=1)]
+
+def test_rank_movement():
+    """Test movement between two posts, overtakes and the monthly reset."""
+    print("🧪 Testing Rank Movement")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        index_file = os.path.join(temp_dir, "rank_index.json")
+        tracker = RankTracker(index_file)
+        assert tracker.diff(ranking('Alice', 'Bob', 'Carol', 'Dave'), datetime(2025, 3, 10)) == []
+        tracker.commit()
+
+        # A new tracker reads the committed ranking back
+        tracker = RankTracker(index_file)
+        players = ranking('Carol', 'Alice', 'Bob', 'Erin', 'Dave')
+        overtakes = tracker.diff(players, datetime(2025, 3, 11), max_count=4)
+        movement = [DiscordWebhook('http://localhost')._get_movement_display(player) for player in players]
+        print(f"  Movement: {movement}")
+        print(f"  Overtakes: {overtakes}")
+        assert movement == ['▲2', '▼1', '▼1', 'NEU', '']
+        assert overtakes == [{'playername': 'Carol', 'overtaken': 'Alice', 'rank': 1},
+                             {'playername': 'Carol', 'overtaken': 'Bob', 'rank': 1}]
+        print("  ✅ ▲/▼/NEW indicators and one overtake per player passed")
+
+        embed = DiscordWebhook('http://localhost').create_embed(
+            "Top Voters", "Test", 3447003, players[:4], datetime(2025, 3, 11), overtakes
+        )
+        assert embed['fields'][0]['value'].splitlines()[0] == "🥇 Carol ▲2"
+        assert embed['fields'][2]['value'] == "**Carol** passed Alice for #1\n**Carol** passed Bob for #1"
+        print("  ✅ Embed shows movement and overtakes")
+
+        # A jump from #5 to #2 passes #2, #3 and #4; #1 stays ahead
+        jumps = RankTracker(os.path.join(temp_dir, "jump_index.json"))
+        jumps.diff(ranking('P1', 'P2', 'P3', 'P4', 'P5', 'P6'), datetime(2025, 3, 10))
+        jumps.commit()
+        overtakes = jumps.diff(ranking('P1', 'P5', 'P2', 'P3', 'P6', 'P4'), datetime(2025, 3, 11), max_count=5)
+        print(f"  Jump overtakes: {overtakes}")
+        assert [(event['playername'], event['overtaken'], event['rank']) for event in overtakes] == [
+            ('P5', 'P2', 2), ('P5', 'P3', 2), ('P5', 'P4', 2), ('P6', 'P4', 5),
+        ]
+        print("  ✅ Multi-position jumps overtake every player passed")
+
+        # Not committed (post failed): the next run still compares with the last post
+        tracker.diff(ranking('Dave'), datetime(2025, 3, 12))
+        players = ranking('Bob')
+        tracker.diff(players, datetime(2025, 3, 12))
+        assert players[0].previous_rank == 2
+
+        # Votes reset on the 1st: no comparison with last month's ranking
+        tracker.commit()
+        players = ranking('Bob', 'Alice')
+        assert tracker.diff(players, datetime(2025, 4, 1)) == []
+        assert players[0].previous_rank == UNTRACKED
+        print("  ✅ Uncommitted rankings ignored, no movement across months")
+
+def read_state(directory):
+    """Contents of every file in a directory."""
+    state = {}
+    for name in sorted(os.listdir(directory)):
+        with open(os.path.join(directory, name), 'rb') as f:
+            state[name] = f.read()
+    return state
+
+def test_dry_run_keeps_real_index():
+    """Test that a dry run shows movement against the real index without moving it forward."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        snapshots_dir = os.path.join(temp_dir, "snapshots")
+        tracker = RankTracker(os.path.join(snapshots_dir, RANK_INDEX_FILENAME))
+        tracker.diff(ranking('Alice', 'Bob'), datetime(2025, 3, 9))
+        tracker.commit()
+        before = read_state(snapshots_dir)
+
+        input_file = os.path.join(temp_dir, "response.json")
+        with open(input_file, 'w', encoding='utf-8') as f:
+            json.dump(generate_payload(50), f)
+        config = get_config({'api_url': 'recorded', 'webhook_url': 'dry-run', 'snapshots_dir': snapshots_dir})
+        render_dir = os.path.join(temp_dir, "rendered")
+        assert run_render(config, render_dir, [input_file], datetime(2025, 3, 10, 12, 0)) == 0
+
+        with open(os.path.join(render_dir, "response_01.json"), 'r', encoding='utf-8') as f:
+            assert "NEU" in f.read()
+        after = read_state(snapshots_dir)
+        print(f"  Real snapshots directory after the dry run: {sorted(after)}")
+        assert after == before
+        print("  ✅ Dry run leaves the rank index and every other state file alone")
+    print("\n🎉 Rank movement tracked correctly!")
+
+if __name__ == "__main__":
+    test_rank_movement()
+    test_dry_run_keeps_real_index()
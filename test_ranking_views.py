@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Test script to verify several leaderboard views cut from one ranking.
+"""
+
+import os
+import logging
+import tempfile
+from datetime import datetime
+from aggregates import AggregateStore
+from models import Player
+from ranking import RankingProcessor, RankingView, rank_views
+from synthetic_data import generate_payload
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def test_views_match_full_sort():
+    """Test that every view equals slicing and filtering one full sort."""
+    print("🧪 Testing Ranking Views")
+    print("=" * 50)
+
+    payload = generate_payload(5000, seed=3)
+    processor = RankingProcessor()
+    expected = processor.process_rankings(payload, None)
+    odd = lambda player: player.votes % 2 == 1
+
+    boards = processor.process_views(payload, [
+        RankingView('daily', 10),
+        RankingView('pinned', 50),
+        RankingView('odd', 20, where=odd),
+        RankingView('rare', 3, where=lambda player: player.playername == expected[-1].playername),
+    ])
+    key = lambda players: [(player.playername, player.votes, player.rank) for player in players]
+    assert key(boards['daily']) == key(expected[:10])
+    assert key(boards['pinned']) == key(expected[:50])
+    assert key(boards['odd']) == key([player for player in expected if odd(player)][:20])
+    assert key(boards['rare']) == key(expected[-1:])
+    print("  ✅ Top 10, top 50 and filtered views match a full sort (ties stable)")
+
+    assert boards['daily'][0] is boards['pinned'][0]
+    print("  ✅ Player objects shared between views")
+
+    players = [Player('Ann', 5), Player('Bo', 9), Player('Cyd', 7)]
+    by_length = rank_views(players, [RankingView('long', 1, key=lambda player: len(player.playername)),
+                                     RankingView('all', None), RankingView('none', 0)])
+    assert [player.playername for player in by_length['long']] == ['Ann']
+    assert [player.playername for player in by_length['all']] == ['Bo', 'Cyd', 'Ann'] and by_length['none'] == []
+    assert [player.rank for player in by_length['all']] == [1, 2, 3]
+    print("  ✅ Custom sort keys leave the vote ranks alone")
+
+def test_newcomers_view():
+    """Test the newcomers filter of the aggregate store."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        store = AggregateStore(os.path.join(temp_dir, "aggregates.json"))
+        store.update([Player('Alice', 30, 1), Player('Bob', 20, 2)], datetime(2025, 2, 27))
+        store.update([Player('Bob', 10, 1), Player('Carol', 8, 2)], datetime(2025, 3, 10))
+
+        ranking = [Player('Bob', 40), Player('Dave', 25), Player('Alice', 12), Player('Carol', 9), Player('Erin', 0)]
+        boards = rank_views(ranking, [
+            RankingView('top', 2),
+            RankingView('newcomers', 10, where=store.newcomer_filter(datetime(2025, 3, 20))),
+        ])
+        names = [player.playername for player in boards['newcomers']]
+        print(f"  Newcomers: {names}")
+        assert names == ['Dave', 'Carol']
+        print("  ✅ Newcomers are players in their first active month")
+    print("\n🎉 Ranking views behave correctly!")
+
+if __name__ == "__main__":
+    test_views_match_full_sort()
+    test_newcomers_view()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the locale packs and the render cache.
+"""
+
+import logging
+from datetime import datetime
+import metrics
+from config import get_config
+from models import Player, WeeklyPlayer
+from render import Renderer, RenderCache, get_renderer
+from webhook import RecordingWebhook
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def ranking():
+    """Three ranked players, one of them new."""
+    return [Player('Alice', 30, 1, 2), Player('Bob', 20, 2, 1), Player('Carol', 5, 3, None)]
+
+def test_render_cache():
+    """Test that fan-out and unchanged reruns reuse the rendered embed."""
+    print("🧪 Testing Embed Rendering")
+    print("=" * 50)
+
+    renderer = Renderer('de', RenderCache(size=2))
+    date = datetime(2025, 3, 14)
+    first = renderer.ranking("Top Voters", "Here!", 3447003, ranking(), date)
+    # Another webhook, fresh but equal player objects
+    second = renderer.ranking("Top Voters", "Here!", 3447003, ranking(), date)
+    assert first['fields'] is second['fields'] and first is not second
+    assert first['title'] == "Top Voters: März" and first['fields'][0]['value'] == "🥇 Alice ▲1\n🥈 Bob ▼1\n🥉 Carol NEU"
+    print("  ✅ Equal rankings rendered once, stamped separately")
+
+    changed = ranking()
+    changed[2].votes = 6
+    assert renderer.ranking("Top Voters", "Here!", 3447003, changed, date)['fields'] is not first['fields']
+    april = renderer.ranking("Top Voters", "Here!", 3447003, ranking(), datetime(2025, 4, 1))
+    assert april['title'] == "Top Voters: April"
+    english = Renderer('en', renderer.cache).ranking("Top Voters", "Here!", 3447003, ranking(), date)
+    assert english['title'] == "Top Voters: March"
+    assert english['fields'][0]['value'].endswith("Carol NEW")
+    # Size 2: the first rendering was evicted
+    assert renderer.ranking("Top Voters", "Here!", 3447003, ranking(), date)['fields'] is not first['fields']
+    print("  ✅ Votes, month and locale are part of the key; cache bounded")
+
+def test_locales():
+    """Test the locale packs through the webhook and the config."""
+    weekly = [WeeklyPlayer('Alice', 12, 40, 28, 1), WeeklyPlayer('Bob', 3, 9, 6, 2)]
+    german = RecordingWebhook()
+    english = RecordingWebhook(locale='en')
+    german.send_weekly_analysis(weekly, "09.03 - 15.03.2025")
+    english.send_weekly_analysis(weekly, "09.03 - 15.03.2025")
+    english.send_weekly_analysis([], "09.03 - 15.03.2025")
+
+    de_embed = german.payloads[0]['embeds'][0]
+    en_embed = english.payloads[0]['embeds'][0]
+    print(f"  de: {de_embed['title']} / en: {en_embed['title']}")
+    assert de_embed['title'] == "📊 Wöchentliche Voting-Analyse"
+    assert de_embed['fields'][1]['value'] == "**+12** Votes\n**+3** Votes"
+    assert en_embed['title'] == "📊 Weekly Voting Analysis" and en_embed['fields'][0]['value'] == "🔥 Alice\n⚡ Bob"
+    assert english.payloads[1]['embeds'][0]['description'].endswith("No activity found this week.")
+    assert list(de_embed) == ['title', 'description', 'color', 'fields', 'timestamp', 'footer']
+    print("  ✅ German and English weekly analysis, field order kept")
+
+    assert get_renderer('en') is get_renderer('en')
+    assert get_config({'api_url': 'x', 'webhook_url': 'y', 'locale': 'en'}).locale == 'en'
+    try:
+        get_config({'api_url': 'x', 'webhook_url': 'y', 'locale': 'fr'})
+        assert False, "unknown locale accepted"
+    except ValueError as e:
+        assert 'LOCALE' in str(e)
+    assert 'topvoter_render_cache_total{result="hit"}' in metrics.RENDER_CACHE.render()
+    print("  ✅ Renderers compiled once per locale, unknown locales rejected")
+
+def test_recap_and_alerts():
+    """Test that the monthly recap and spike alerts come from the locale packs too."""
+    rows = [{'rank': 1, 'playername': 'Alice', 'votes': 40, 'change': 5},
+            {'rank': 2, 'playername': 'Bob', 'votes': 30, 'change': None}]
+    fame = [{'rank': 1, 'playername': 'Alice', 'votes': 400, 'months_active': 7, 'best_rank': 1}]
+    flags = [{'playername': 'Alice', 'rate': 3.0, 'usual_rate': 0.5, 'votes': 40}]
+    german = RecordingWebhook()
+    english = RecordingWebhook(locale='en')
+    for webhook in (german, english):
+        webhook.send_month_over_month(rows, datetime(2025, 1, 31))
+        webhook.send_hall_of_fame(fame)
+        webhook.send_spike_alert(flags)
+
+    de_recap, de_fame, de_spike = [payload['embeds'][0] for payload in german.payloads]
+    en_recap, en_fame, en_spike = [payload['embeds'][0] for payload in english.payloads]
+    print(f"  de: {de_recap['title']} / en: {en_recap['title']}")
+    assert de_recap['title'] == "📅 Monatsvergleich: Januar vs Dezember"
+    assert de_recap['fields'][1]['value'] == "**40** (+5)\n**30** (NEU)"
+    assert en_recap['title'] == "📅 Month over Month: January vs December"
+    assert en_recap['fields'][1]['value'] == "**40** (+5)\n**30** (NEW)"
+    assert de_fame['title'] == "🏛️ Ruhmeshalle" and en_fame['fields'][1]['value'] == "**400** votes · 7 mo · best #1"
+    assert de_spike['description'] == "**Alice**: 3.0 Votes/h (sonst 0.5, 40 Votes diesen Monat)"
+    assert en_spike['footer'] == {'text': "TopGames Vote Monitor"}
+    print("  ✅ Recap, hall of fame and spike alerts in German and English")
+
+    again = RecordingWebhook(locale='en')
+    again.send_month_over_month(rows, datetime(2025, 1, 31))
+    assert again.payloads[0]['embeds'][0]['fields'] is en_recap['fields']
+    print("  ✅ Recap embeds served from the render cache")
+    print("\n🎉 Embed rendering behaves correctly!")
+
+if __name__ == "__main__":
+    test_render_cache()
+    test_locales()
+    test_recap_and_alerts()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the run lock policies.
+"""
+
+import os
+import sys
+import json
+import logging
+import tempfile
+import subprocess
+from run_lock import RunLock
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Holds the lock from another process, claiming to have started an hour ago
+HUNG_HOLDER = """
+import sys, json, time
+from datetime import datetime, timedelta, timezone
+from run_lock import RunLock
+lock = RunLock(sys.argv[1], stoppable=sys.argv[2] == 'cron')
+assert lock.acquire()
+with open(sys.argv[1], 'r+', encoding='utf-8') as f:
+    holder = json.load(f)
+    holder['started_at'] = (datetime.now(timezone.utc) - timedelta(hours=1)).isoformat()
+    f.seek(0)
+    f.truncate()
+    json.dump(holder, f)
+print('ready', flush=True)
+time.sleep(60)
+"""
+
+def test_skip_and_wait():
+    """Test that a held lock makes the next run skip, and is free again after release."""
+    print("🧪 Testing Run Lock")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        lock_file = os.path.join(temp_dir, "snapshots", ".run.lock")
+        first = RunLock(lock_file)
+        assert first.acquire()
+        holder = first.read_holder()
+        print(f"  Holder: {holder}")
+        assert holder['pid'] == os.getpid() and holder['started_at'].endswith('+00:00')
+
+        assert not RunLock(lock_file).acquire()
+        assert not RunLock(lock_file, 'wait', timeout=1).acquire()
+        print("  ✅ Overlapping run skipped, waiting run gave up after its timeout")
+
+        first.release()
+        assert first.read_holder() is None
+        with RunLock(lock_file, 'wait', timeout=1) as acquired:
+            assert acquired
+        print("  ✅ Lock free again after release, holder cleared")
+
+def start_hung_holder(lock_file, mode):
+    """Start a process holding the lock for a minute, claiming to be an hour old."""
+    holder = subprocess.Popen(
+        [sys.executable, '-c', HUNG_HOLDER, lock_file, mode],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        stdout=subprocess.PIPE,
+        text=True
+    )
+    assert holder.stdout.readline().strip() == 'ready'
+    return holder
+
+def test_takeover_stale_holder():
+    """Test that the takeover policy stops a hung cron holder and runs."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        lock_file = os.path.join(temp_dir, ".run.lock")
+        holder = start_hung_holder(lock_file, 'cron')
+        try:
+            assert not RunLock(lock_file, 'takeover', timeout=1, stale_after=7200).acquire()
+            print("  ✅ Holder younger than stale_after left alone")
+
+            lock = RunLock(lock_file, 'takeover', timeout=10, stale_after=600)
+            assert lock.acquire()
+            assert holder.wait(timeout=10) != 0
+            with open(lock_file, 'r', encoding='utf-8') as f:
+                assert json.load(f)['pid'] == os.getpid()
+            lock.release()
+            print("  ✅ Hung holder stopped and lock taken over")
+        finally:
+            holder.kill()
+            holder.wait()
+
+def test_daemon_holder_never_stopped():
+    """Test that a daemon or tenant runner holding the lock is waited for, not stopped."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        lock_file = os.path.join(temp_dir, ".run.lock")
+        holder = start_hung_holder(lock_file, 'daemon')
+        try:
+            assert not RunLock(lock_file, 'takeover', timeout=1.5, stale_after=600).acquire()
+            assert holder.poll() is None
+            print("  ✅ Stale daemon holder left running")
+        finally:
+            holder.kill()
+            holder.wait()
+    print("\n🎉 Run lock behaves correctly!")
+
+if __name__ == "__main__":
+    test_skip_and_wait()
+    test_takeover_stale_holder()
+    test_daemon_holder_never_stopped()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Test script replaying two months of cron ticks through the full pipeline.
+"""
+
+import logging
+from datetime import datetime
+from simulator import simulate
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def test_two_months_of_daily_runs():
+    """Test that every month gets one final and every full week one analysis."""
+    print("🧪 Testing Two Simulated Months")
+    print("=" * 50)
+
+    # January and February 2025; Sundays from Jan 12 on have a baseline
+    logging.getLogger().setLevel(logging.WARNING)
+    try:
+        report = simulate(datetime(2025, 1, 1), 59, players=200)
+        missed = simulate(datetime(2025, 1, 1), 59, players=200, miss_rate=0.3, seed=7)
+    finally:
+        logging.getLogger().setLevel(logging.INFO)
+
+    print(f"  Posts: {report['summary']} in {report['seconds']:.2f}s")
+    finals = [post['time'][:10] for post in report['posts'] if post['kind'] == 'monthly_final']
+    assert finals == ['2025-01-31', '2025-02-28']
+    assert report['summary']['weekly_analysis'] == 6
+    assert report['summary']['daily'] == 57
+    assert not report['anomalies'], report['anomalies']
+    print("  ✅ One final per month, one analysis per week")
+
+    print(f"  With 30% missed ticks: {missed['summary']}")
+    assert not missed['anomalies'], missed['anomalies']
+    print("  ✅ No duplicate posts when catching up")
+    print("\n🎉 Simulation behaves correctly!")
+
+if __name__ == "__main__":
+    test_two_months_of_daily_runs()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test script to verify atomic snapshot writes and corrupt snapshot detection.
+"""
+
+import os
+import json
+import logging
+import tempfile
+from datetime import datetime
+import snapshot_manager
+from models import Player
+from snapshot_manager import SnapshotManager
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+PLAYERS = [Player('Alice', 40), Player('Bob', 25)]
+
+def test_corrupt_snapshots_skipped():
+    """Test that truncated or tampered snapshots fall back to the nearest good one."""
+    print("🧪 Testing Snapshot Integrity")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manager = SnapshotManager(temp_dir)
+        for day in (4, 5, 6):
+            assert manager.save_snapshot(PLAYERS, datetime(2025, 1, day))
+
+        files = sorted(name for name in os.listdir(temp_dir) if name.startswith('snapshot_'))
+        assert files == ['snapshot_20250104.json', 'snapshot_20250105.json', 'snapshot_20250106.json']
+        with open(os.path.join(temp_dir, files[0]), 'r', encoding='utf-8') as f:
+            assert json.load(f)['checksum'].startswith('sha256:')
+        print("  ✅ Snapshots renamed into place with a checksum, no temp files left")
+
+        # Crash mid-write (old style) and a flipped vote count
+        with open(os.path.join(temp_dir, files[1]), 'r+', encoding='utf-8') as f:
+            f.truncate(40)
+        with open(os.path.join(temp_dir, files[0]), 'r', encoding='utf-8') as f:
+            tampered = json.load(f)
+        tampered['players']['Alice'] = 41
+        with open(os.path.join(temp_dir, files[0]), 'w', encoding='utf-8') as f:
+            json.dump(tampered, f)
+
+        fresh = SnapshotManager(temp_dir)
+        assert fresh.load_snapshot(datetime(2025, 1, 5)) is None
+        assert fresh.load_snapshot(datetime(2025, 1, 4)) is None
+        nearest_date, nearest = fresh.find_nearest_snapshot(datetime(2025, 1, 5))
+        print(f"  Nearest good snapshot: {nearest_date.strftime('%Y-%m-%d')}")
+        assert nearest_date == datetime(2025, 1, 6) and nearest['players']['Alice'] == 40
+        print("  ✅ Corrupt snapshots skipped in favor of the nearest good one")
+
+        # Snapshots written before checksums existed are still trusted
+        legacy = {'date': '2025-01-07T00:00:00', 'players': {'Alice': 50}}
+        with open(os.path.join(temp_dir, 'snapshot_20250107.json'), 'w', encoding='utf-8') as f:
+            json.dump(legacy, f)
+        assert fresh.load_snapshot(datetime(2025, 1, 7))['players'] == {'Alice': 50}
+        print("  ✅ Legacy snapshot without checksum loaded")
+
+def test_batch_fsyncs_directory_once():
+    """Test that a batch of writes and removals fsyncs the directory once."""
+    synced = []
+    original = snapshot_manager.fsync_directory
+    snapshot_manager.fsync_directory = synced.append
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            manager = SnapshotManager(temp_dir)
+            manager.save_snapshot(PLAYERS, datetime(2024, 6, 2))
+            assert len(synced) == 1
+
+            with open(os.path.join(temp_dir, 'snapshot_20250111.json.tmp'), 'w', encoding='utf-8') as f:
+                f.write('{"date": ')
+            with manager.batch():
+                manager.save_snapshot(PLAYERS, datetime(2025, 1, 12))
+                manager.cleanup_old_snapshots(today=datetime(2025, 1, 12))
+            files = sorted(name for name in os.listdir(temp_dir) if name.startswith('snapshot_'))
+            print(f"  Directory fsyncs: {len(synced)}, files: {files}")
+            assert len(synced) == 2
+            assert files == ['snapshot_20250112.json']
+            print("  ✅ Save, old snapshot and leftover temp file removal share one fsync")
+    finally:
+        snapshot_manager.fsync_directory = original
+    print("\n🎉 Snapshot integrity checks passed!")
+
+if __name__ == "__main__":
+    test_corrupt_snapshots_skipped()
+    test_batch_fsyncs_directory_once()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test script to verify tenant loading and failure isolation.
+"""
+
+import os
+import json
+import logging
+import tempfile
+from tenants import TenantRunner, load_tenants
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def write_tenants(temp_dir, data):
+    """Write a tenants file and return its path."""
+    path = os.path.join(temp_dir, "tenants.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    return path
+
+def test_load_tenants():
+    """Test defaults, per-tenant overrides and validation."""
+    print("🧪 Testing Tenant Loading")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = write_tenants(temp_dir, {
+            "defaults": {"webhook_url": "https://discord.example/hook", "max_voters": "15"},
+            "tenants": [
+                {"name": "one", "api_url": "https://api.example/one", "snapshots_dir": "snapshots/one"},
+                {"name": "two", "api_url": "https://api.example/two", "snapshots_dir": "snapshots/two",
+                 "max_voters": 5, "timezone": "Europe/Berlin"}
+            ]
+        })
+        configs = load_tenants(path)
+
+        for config in configs:
+            print(f"  {config.name}: {config.api_url} max={config.max_voters} tz={config.timezone or 'local'}")
+        assert [config.name for config in configs] == ["one", "two"]
+        assert configs[0].max_voters == 15 and configs[1].max_voters == 5
+
+        invalid = [
+            ("shared snapshots_dir", [{"name": "a", "api_url": "x", "snapshots_dir": "s"},
+                                      {"name": "b", "api_url": "y", "snapshots_dir": "s"}]),
+            ("unknown key", [{"name": "a", "api_url": "x", "snapshot_dir": "s"}]),
+            ("bad timezone", [{"name": "a", "api_url": "x", "timezone": "Mars/Olympus"}]),
+        ]
+        for label, tenants in invalid:
+            path = write_tenants(temp_dir, {"defaults": {"webhook_url": "https://discord.example/hook"}, "tenants": tenants})
+            try:
+                load_tenants(path)
+                raise AssertionError(f"{label} was accepted")
+            except ValueError as e:
+                print(f"  ✅ Rejected {label}: {e}")
+
+def test_failures_are_isolated():
+    """Test that one crashing tenant doesn't stop the others."""
+    finished = []
+
+    def succeed(name):
+        return lambda: finished.append(name) or 0
+
+    def crash():
+        raise RuntimeError("boom")
+
+    runs = {"one": succeed("one"), "broken": crash, "three": succeed("three")}
+    exit_code = TenantRunner(max_workers=2).run(runs)
+
+    print(f"  Finished: {sorted(finished)}, exit code {exit_code}")
+    assert sorted(finished) == ["one", "three"]
+    assert exit_code == 1
+    print("\n🎉 Tenants behave correctly!")
+
+if __name__ == "__main__":
+    test_load_tenants()
+    test_failures_are_isolated()
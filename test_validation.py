@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the compiled payload validator and the quarantine file.
+"""
+
+import os
+import json
+import logging
+import tempfile
+from datetime import datetime
+import metrics
+from config import get_config
+from main import run_render
+from ranking import RankingProcessor
+from validation import PLAYER_VALIDATOR, RowValidator, non_empty_str
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+ROWS = [
+    {'playername': 'Alice', 'votes': 12},
+    {'playername': 'Bob', 'votes': '7'},
+    {'playername': 'Alice~2', 'votes': 3.0},
+    {'playername': 'Carol'},
+    {'votes': 4},
+    {'playername': '', 'votes': 1},
+    {'playername': 42, 'votes': 1},
+    {'playername': 'Dave', 'votes': 'many'},
+    {'playername': 'Eve', 'votes': None},
+    ['Mallory', 5],
+    None,
+]
+
+def test_validator():
+    """Test coercion and rejection reasons."""
+    print("🧪 Testing Payload Validation")
+    print("=" * 50)
+
+    result = PLAYER_VALIDATOR.validate(ROWS)
+    print(f"  Valid: {result.rows}")
+    print(f"  Rejected: {result.summary()}")
+    assert result.rows == [('Alice', 12), ('Bob', 7), ('Alice~2', 3)]
+    assert result.rejections == {
+        'missing_votes': 1, 'missing_playername': 1, 'invalid_playername': 2,
+        'invalid_votes': 2, 'not_an_object': 2,
+    }
+    assert [reason for reason, _ in result.rejected][:2] == ['missing_votes', 'missing_playername']
+    print("  ✅ Votes coerced in one step, every rejection counted by reason")
+
+    assert RankingProcessor.validate_player(ROWS[1]) and not RankingProcessor.validate_player(ROWS[3])
+    single = RowValidator({'playername': non_empty_str})
+    assert single.validate([{'playername': 'Zoe'}, {}]).rows == [('Zoe',)]
+    print("  ✅ validate_player and single-field schemas")
+
+def test_quarantine():
+    """Test that a run's rejected rows land in the quarantine file and the metrics."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        quarantine_file = os.path.join(temp_dir, "quarantine.jsonl")
+        before = metrics.REJECTED_PLAYERS.render()
+        processor = RankingProcessor(quarantine_file, 'Main')
+        players = processor.process_rankings({'success': True, 'players': ROWS}, None)
+
+        assert [(player.playername, player.votes) for player in players] == [('Alice', 15), ('Bob', 7)]
+        assert sum(processor.rejections.values()) == 8
+        with open(quarantine_file, 'r', encoding='utf-8') as f:
+            lines = [json.loads(line) for line in f]
+        print(f"  Quarantined: {lines[0]}")
+        assert len(lines) == 8 and lines[0]['reason'] == 'missing_votes' and lines[0]['row'] == {'playername': 'Carol'}
+        assert 'topvoter_rejected_players_total{server="Main",reason="invalid_votes"}' in metrics.REJECTED_PLAYERS.render()
+        assert 'topvoter_players_count{server="Main",step="consolidated"}' in metrics.PLAYERS.render()
+        assert metrics.REJECTED_PLAYERS.render() != before
+        print("  ✅ Rejected rows quarantined and exported as metrics")
+
+        # Clean payloads don't touch the file
+        RankingProcessor(quarantine_file).process_rankings({'success': True, 'players': ROWS[:3]}, None)
+        with open(quarantine_file, 'r', encoding='utf-8') as f:
+            assert len(f.readlines()) == 8
+        print("  ✅ Nothing written for clean payloads")
+
+        # Dry runs quarantine into their scratch copy
+        input_file = os.path.join(temp_dir, "response.json")
+        with open(input_file, 'w', encoding='utf-8') as f:
+            json.dump({'success': True, 'players': ROWS}, f)
+        config = get_config({'api_url': 'recorded', 'webhook_url': 'dry-run', 'quarantine_file': quarantine_file,
+                             'snapshots_dir': os.path.join(temp_dir, "snapshots")})
+        assert run_render(config, os.path.join(temp_dir, "rendered"), [input_file], datetime(2025, 3, 10, 12, 0)) == 0
+        with open(quarantine_file, 'r', encoding='utf-8') as f:
+            assert len(f.readlines()) == 8
+        print("  ✅ Dry runs leave the real quarantine file alone")
+    print("\n🎉 Payload validation behaves correctly!")
+
+if __name__ == "__main__":
+    test_validator()
+    test_quarantine()
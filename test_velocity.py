@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test script to verify vote velocity tracking and spike detection.
+"""
+
+import os
+import json
+import logging
+import tempfile
+from datetime import datetime, timedelta
+import velocity
+from api_client import RecordedAPIClient
+from clock import RunClock
+from config import get_config
+from job_ledger import JobLedger
+from main import run_once
+from models import Player
+from velocity import VelocityTracker
+from webhook import RecordingWebhook
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def test_spike_detection():
+    """Test that a sudden jump is flagged while steady voters and the monthly reset are not."""
+    print("🧪 Testing Vote Velocity")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        state_file = os.path.join(temp_dir, "velocity_state.json")
+        tracker = VelocityTracker(state_file)
+        start = datetime(2025, 3, 1)
+
+        # Hourly runs: Alice votes every 2 hours, Bob every hour, Carol never
+        for hour in range(48):
+            players = [
+                Player('Alice', hour // 2),
+                Player('Bob', hour),
+                Player('Carol', 3),
+            ]
+            assert tracker.update(players, start + timedelta(hours=hour)) == []
+        print("  ✅ Two days of steady voting raised no flags")
+
+        # The state survives a restart; Alice suddenly gains 20 votes in an hour
+        tracker = VelocityTracker(state_file)
+        now = start + timedelta(hours=48)
+        flags = tracker.update([
+            Player('Alice', 23 + 20),
+            Player('Bob', 48),
+            Player('Carol', 3),
+        ], now)
+        print(f"  Flags: {flags}")
+        assert [flag['playername'] for flag in flags] == ['Alice']
+        assert flags[0]['usual_rate'] < 1 < flags[0]['rate']
+        print("  ✅ Spike flagged against the player's own usual rate")
+
+        # Votes reset on the 1st only move the baseline
+        assert tracker.update([Player('Bob', 0)], datetime(2025, 4, 1)) == []
+        print("  ✅ Monthly reset not flagged")
+
+        webhook = RecordingWebhook()
+        assert webhook.send_spike_alert(flags)
+        embed = webhook.payloads[0]['embeds'][0]
+        assert embed['description'].startswith("**Alice**") and embed['color'] == 15158332
+        print("  ✅ Admin alert embed rendered")
+
+        # A run sends its flags through the injected admin webhook, never a new one
+        tracker = VelocityTracker(os.path.join(temp_dir, "run_state.json"))
+        for hour in range(48):
+            tracker.update([Player('Alice', hour // 2)], start + timedelta(hours=hour))
+        response_file = os.path.join(temp_dir, "response.json")
+        with open(response_file, 'w', encoding='utf-8') as f:
+            json.dump({'success': True, 'players': [{'playername': 'Alice', 'votes': 43}]}, f)
+        config = get_config({'api_url': 'recorded', 'webhook_url': 'dry-run', 'snapshots_dir': temp_dir,
+                             'admin_webhook_url': 'http://127.0.0.1:9/unreachable'})
+        admin = RecordingWebhook()
+        run_once(config, RecordedAPIClient(response_file), RecordingWebhook(),
+                 ledger=JobLedger(os.path.join(temp_dir, "job_ledger.json"), read_only=True),
+                 clock=RunClock(None, start + timedelta(hours=48)), pipeline_workers=1,
+                 velocity_tracker=tracker, admin_webhook=admin)
+        assert [payload['embeds'][0]['description'][:9] for payload in admin.payloads] == ["**Alice**"]
+        print("  ✅ Spike alert sent through the injected admin webhook")
+
+def test_state_log_and_compaction():
+    """Test that runs append only their changes and the log is folded into the state."""
+    compact_entries = velocity.MIN_COMPACT_ENTRIES
+    velocity.MIN_COMPACT_ENTRIES = 0
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state_file = os.path.join(temp_dir, "velocity_state.json")
+            start = datetime(2025, 1, 1)
+            tracker = VelocityTracker(state_file)
+            tracker.update([Player('Old', 5)], start)
+            tracker.update([Player('Alice', 1), Player('Bob', 1)], start + timedelta(days=69))
+            assert not os.path.exists(state_file)
+            tracker.update([Player('Alice', 2), Player('Bob', 2)], start + timedelta(days=70))
+            assert os.path.exists(state_file) and not os.path.exists(tracker.log_file)
+            print("  ✅ Log folded into the state once it outgrew it")
+
+            tracker.update([Player('Alice', 3)], start + timedelta(days=70, hours=2))
+            with open(tracker.log_file, 'r', encoding='utf-8') as f:
+                lines = [json.loads(line) for line in f]
+            print(f"  Log: {lines}")
+            assert list(lines[0]) == ['Alice']
+            with open(state_file, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+            assert sorted(stored) == ['Alice', 'Bob'], "stale player kept"
+
+            reloaded = VelocityTracker(state_file)
+            assert reloaded._state == tracker._state
+            print("  ✅ Only changed entries appended, replayed on load; stale players dropped")
+    finally:
+        velocity.MIN_COMPACT_ENTRIES = compact_entries
+    print("\n🎉 Vote velocity tracked correctly!")
+
+if __name__ == "__main__":
+    test_spike_detection()
+    test_state_log_and_compaction()
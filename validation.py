@@ -0,0 +1,189 @@
+"""
+Validation module checking API player rows against a declarative schema.
+
+The schema maps each field to the function coercing it. It is compiled once
+into a single itemgetter plus the coercers, so a good row is fetched,
+checked and coerced in one try block without per-field branching. Only
+rejected rows take the slow path that works out why (missing_votes,
+invalid_playername, ...). Rejections are counted per run and can be
+appended to a quarantine file to look at later.
+"""
+
+import json
+import logging
+from collections import Counter
+from datetime import datetime
+from operator import itemgetter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Errors of a missing field or a failed coercion
+REJECTED_ERRORS = (LookupError, TypeError, ValueError, ArithmeticError)
+
+# Rejected rows kept per run for the quarantine file (all are counted)
+QUARANTINE_LIMIT = 1000
+
+
+def non_empty_str(value: Any) -> str:
+    """
+    Accept a non-empty string.
+
+    Args:
+        value: Field value
+
+    Returns:
+        str: The value
+
+    Raises:
+        ValueError: If the value is not a string or empty
+    """
+    if type(value) is not str or not value:
+        raise ValueError(f"expected a non-empty string, got {value!r}")
+    return value
+
+
+# Fields of a player row and how they are coerced; votes may arrive as strings
+PLAYER_SCHEMA: Dict[str, Callable[[Any], Any]] = {
+    'playername': non_empty_str,
+    'votes': int,
+}
+
+
+def _call(coerce: Callable[[Any], Any], value: Any) -> Any:
+    """Apply a coercer (map helper)."""
+    return coerce(value)
+
+
+class ValidationResult:
+    """Rows that passed a validation and what was rejected."""
+
+    __slots__ = ('rows', 'rejections', 'rejected')
+
+    def __init__(self):
+        """Initialize an empty result."""
+        # Coerced field values in schema order
+        self.rows: List[tuple] = []
+        # Rejected rows per reason
+        self.rejections: Counter = Counter()
+        # (reason, row) of the first QUARANTINE_LIMIT rejected rows
+        self.rejected: List[Tuple[str, Any]] = []
+
+    def summary(self) -> str:
+        """
+        Describe the rejections.
+
+        Returns:
+            str: e.g. "invalid_votes=2, missing_playername=1"
+        """
+        return ", ".join(f"{reason}={count}" for reason, count in sorted(self.rejections.items()))
+
+
+class RowValidator:
+    """Validator compiled from a schema of field names and coercers."""
+
+    def __init__(self, schema: Dict[str, Callable[[Any], Any]]):
+        """
+        Compile a schema.
+
+        Args:
+            schema: Coercer per field name, in the order of the coerced tuples
+        """
+        self.schema = dict(schema)
+        self.fields = tuple(self.schema)
+        self._coercers = tuple(self.schema.values())
+        if len(self.fields) == 1:
+            field = self.fields[0]
+            self._get = lambda row: (row[field],)
+        else:
+            self._get = itemgetter(*self.fields)
+
+    def coerce(self, row: Any) -> tuple:
+        """
+        Check and coerce one row.
+
+        Args:
+            row: Row as decoded from JSON
+
+        Returns:
+            tuple: Coerced field values in schema order
+
+        Raises:
+            LookupError, TypeError, ValueError, ArithmeticError: If the row is rejected
+        """
+        return tuple(map(_call, self._coercers, self._get(row)))
+
+    def reason(self, row: Any) -> Optional[str]:
+        """
+        Work out why a row is rejected.
+
+        Args:
+            row: Row as decoded from JSON
+
+        Returns:
+            str or None: not_an_object, missing_<field> or invalid_<field>; None if the row is valid
+        """
+        if not isinstance(row, dict):
+            return 'not_an_object'
+        for field, coerce in self.schema.items():
+            if field not in row:
+                return f"missing_{field}"
+            try:
+                coerce(row[field])
+            except REJECTED_ERRORS:
+                return f"invalid_{field}"
+        return None
+
+    def validate(self, rows: List[Any]) -> ValidationResult:
+        """
+        Check and coerce rows, counting the rejected ones by reason.
+
+        Args:
+            rows: Rows as decoded from JSON
+
+        Returns:
+            ValidationResult: Coerced rows and rejections
+        """
+        result = ValidationResult()
+        append = result.rows.append
+        get = self._get
+        coercers = self._coercers
+        for row in rows:
+            try:
+                append(tuple(map(_call, coercers, get(row))))
+            except REJECTED_ERRORS:
+                reason = self.reason(row) or 'invalid'
+                result.rejections[reason] += 1
+                if len(result.rejected) < QUARANTINE_LIMIT:
+                    result.rejected.append((reason, row))
+        return result
+
+
+def quarantine(quarantine_file: str, rejected: List[Tuple[str, Any]], now: Optional[datetime] = None) -> int:
+    """
+    Append rejected rows to a quarantine file, one JSON object per line.
+
+    Args:
+        quarantine_file: Path to the JSONL file
+        rejected: (reason, row) pairs from a ValidationResult
+        now: Time recorded with the rows (defaults to now)
+
+    Returns:
+        int: Number of rows written (0 if the file can't be written)
+    """
+    if not rejected:
+        return 0
+    timestamp = (now or datetime.now()).isoformat()
+    try:
+        with open(quarantine_file, 'a', encoding='utf-8') as f:
+            for reason, row in rejected:
+                f.write(json.dumps({'time': timestamp, 'reason': reason, 'row': row},
+                                   ensure_ascii=False, default=repr) + '\n')
+    except OSError as e:
+        logger.error(f"Failed to write quarantine file {quarantine_file}: {e}")
+        return 0
+    return len(rejected)
+
+
+# Validator of the API's player rows
+PLAYER_VALIDATOR = RowValidator(PLAYER_SCHEMA)
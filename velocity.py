@@ -0,0 +1,225 @@
+"""
+Velocity module tracking each player's vote rate to detect vote farming.
+
+Every player keeps five numbers of state: their votes and the time those
+changed last, and an exponentially weighted mean and variance of their vote
+rate (votes per hour). Only players whose votes changed since the last run
+are updated, and a rate far above a player's usual one is flagged.
+
+A run appends only the entries it changed to a log next to the state file.
+Once the log holds more entries than the state, both are folded into a new
+state file, dropping players whose votes haven't changed for a long time.
+"""
+
+import json
+import math
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, List
+import logging
+from models import Player
+
+logger = logging.getLogger(__name__)
+
+# Velocity state file name inside a snapshots directory
+VELOCITY_FILENAME = 'velocity_state.json'
+
+# Suffix of the log of changed entries next to the state file
+LOG_SUFFIX = '.log'
+
+# Log entries always allowed before compacting, however small the state
+MIN_COMPACT_ENTRIES = 1000
+
+# Players without a vote change for this long are dropped when compacting
+STALE_AFTER_DAYS = 62
+
+# Rate samples a player needs before they can be flagged
+MIN_SAMPLES = 5
+
+# Rates below this (votes per hour) are never flagged; one vote every two
+# hours is what a single account can do on TopGames
+MIN_SPIKE_RATE = 0.5
+
+# Fewer new votes than this are never flagged (one vote in a short interval
+# looks like a high rate for a player who rarely votes)
+MIN_SPIKE_VOTES = 3
+
+# Fields of a player's state, stored as a list to keep the file compact
+VOTES, CHANGED_AT, RATE, VARIANCE, SAMPLES = range(5)
+
+
+class VelocityTracker:
+    """Exponentially weighted vote rate and variance per player."""
+
+    def __init__(
+        self,
+        state_file: str = os.path.join("snapshots", VELOCITY_FILENAME),
+        half_life_hours: float = 72.0,
+        threshold: float = 4.0
+    ):
+        """
+        Initialize the tracker and load its state.
+
+        Args:
+            state_file: Path to the JSON file storing the state between runs
+            half_life_hours: Time after which a rate sample has half its weight
+            threshold: Standard deviations above the usual rate that count as a spike
+        """
+        self.state_file = state_file
+        self.log_file = state_file + LOG_SUFFIX
+        self.half_life_hours = half_life_hours
+        self.threshold = threshold
+        # Entries appended to the log since the last compaction
+        self._log_entries = 0
+        self._state: Dict[str, List[float]] = self._load()
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, List[float]]:
+        """
+        Load the state from disk and replay the log of changed entries over it.
+
+        Returns:
+            dict: State per player name (empty if missing or unreadable)
+        """
+        state: Dict[str, List[float]] = {}
+        if os.path.exists(self.state_file):
+            try:
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    state = json.load(f)
+            except Exception as e:
+                logger.error(f"Failed to load velocity state {self.state_file}: {e}")
+
+        if os.path.exists(self.log_file):
+            try:
+                with open(self.log_file, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            changed = json.loads(line)
+                        except ValueError:
+                            # Line torn by a crash while appending
+                            continue
+                        state.update(changed)
+                        self._log_entries += len(changed)
+            except OSError as e:
+                logger.error(f"Failed to load velocity log {self.log_file}: {e}")
+        return state
+
+    def _save(self, changed: List[str], timestamp: float):
+        """
+        Persist the entries changed by a run.
+
+        Args:
+            changed: Names of the players whose entries changed
+            timestamp: Time of the run (Unix seconds)
+        """
+        directory = os.path.dirname(self.state_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if self._log_entries + len(changed) > max(len(self._state), MIN_COMPACT_ENTRIES):
+            self._compact(timestamp)
+            return
+
+        entries = {name: self._state[name] for name in changed}
+        with open(self.log_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entries, ensure_ascii=False, separators=(',', ':')) + '\n')
+        self._log_entries += len(entries)
+
+    def _compact(self, timestamp: float):
+        """
+        Write the whole state to a new state file and start an empty log.
+
+        Args:
+            timestamp: Time of the run (Unix seconds)
+        """
+        cutoff = timestamp - STALE_AFTER_DAYS * 86400
+        stale = [name for name, entry in self._state.items() if entry[CHANGED_AT] < cutoff]
+        for name in stale:
+            del self._state[name]
+
+        temp_file = f"{self.state_file}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(self._state, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temp_file, self.state_file)
+        # Replaying a leftover log over the new state would only repeat its entries
+        if os.path.exists(self.log_file):
+            os.remove(self.log_file)
+        self._log_entries = 0
+        logger.info(f"Compacted velocity state: {len(self._state)} players kept, {len(stale)} stale dropped")
+
+    def update(self, players: List[Player], now: datetime) -> List[Dict[str, Any]]:
+        """
+        Feed the votes of a run and flag players voting far faster than usual.
+
+        A player's rate sample is the votes gained divided by the hours since
+        their votes last changed. Votes going down (the monthly reset) only
+        move the baseline.
+
+        Args:
+            players: Consolidated players
+            now: Time of the run
+
+        Returns:
+            list: Flags ({'playername', 'rate', 'usual_rate', 'deviations', 'votes'}), highest rate first
+        """
+        timestamp = now.timestamp()
+        flags = []
+
+        with self._lock:
+            state = self._state
+            changed = []
+            for player in players:
+                name = player.playername
+                votes = player.votes
+                entry = state.get(name)
+                if entry is None:
+                    state[name] = [votes, timestamp, 0.0, 0.0, 0]
+                    changed.append(name)
+                    continue
+                if votes == entry[VOTES]:
+                    continue
+
+                changed.append(name)
+                hours = (timestamp - entry[CHANGED_AT]) / 3600
+                if votes < entry[VOTES] or hours <= 0:
+                    entry[VOTES], entry[CHANGED_AT] = votes, timestamp
+                    continue
+
+                gained = votes - entry[VOTES]
+                rate = gained / hours
+                mean, variance, samples = entry[RATE], entry[VARIANCE], entry[SAMPLES]
+                if samples >= MIN_SAMPLES and rate >= MIN_SPIKE_RATE and gained >= MIN_SPIKE_VOTES:
+                    # Floor the deviation so a perfectly regular voter isn't flagged for one extra vote
+                    deviation = max(math.sqrt(variance), mean * 0.25, 0.1)
+                    deviations = (rate - mean) / deviation
+                    if deviations > self.threshold:
+                        flags.append({
+                            'playername': name,
+                            'rate': rate,
+                            'usual_rate': mean,
+                            'deviations': deviations,
+                            'votes': votes,
+                        })
+
+                # Incremental exponentially weighted mean and variance; the weight of
+                # the new sample grows with the time it covers
+                alpha = 1 - 0.5 ** (hours / self.half_life_hours)
+                if samples == 0:
+                    mean, variance = rate, 0.0
+                else:
+                    diff = rate - mean
+                    increment = alpha * diff
+                    mean += increment
+                    variance = (1 - alpha) * (variance + diff * increment)
+                entry[VOTES], entry[CHANGED_AT] = votes, timestamp
+                entry[RATE], entry[VARIANCE], entry[SAMPLES] = mean, variance, samples + 1
+
+            if changed:
+                self._save(changed, timestamp)
+
+        flags.sort(key=lambda flag: flag['rate'], reverse=True)
+        for flag in flags:
+            logger.warning(f"Vote spike: {flag['playername']} at {flag['rate']:.1f} votes/h "
+                           f"(usually {flag['usual_rate']:.1f}, {flag['deviations']:.1f} deviations)")
+        return flags
@@ -4,29 +4,49 @@ Discord Webhook module for sending formatted messages.
 This module creates Discord embeds and sends them via webhook.
 """
 
+import os
+import json
+import time
 import requests
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from datetime import datetime
+import metrics
+from models import Player, WeeklyPlayer
+from render import DEFAULT_LOCALE, get_renderer, rank_display, weekly_rank_display
 
 
 class DiscordWebhook:
     """Handler for sending messages to Discord via webhook."""
 
-    def __init__(self, webhook_url: str):
+    def __init__(
+        self,
+        webhook_url: str,
+        session: Optional[requests.Session] = None,
+        locale: str = DEFAULT_LOCALE,
+        server: str = 'default'
+    ):
         """
         Initialize the Discord webhook sender.
 
         Args:
             webhook_url: The Discord webhook URL
+            session: Optional requests session to reuse connections across runs
+            locale: Locale pack of the posts (see render.LOCALES)
+            server: Server (tenant) name the request metrics are recorded under
         """
         self.webhook_url = webhook_url
+        self.session = session
+        self.server = server
+        self.renderer = get_renderer(locale)
 
     def create_embed(
         self,
         title: str,
         description: str,
         color: int,
-        players: List[Dict[str, Any]]
+        players: List[Player],
+        date: Optional[datetime] = None,
+        overtakes: Optional[List[Dict[str, Any]]] = None
     ) -> Dict[str, Any]:
         """
         Create a Discord embed with player rankings.
@@ -35,62 +55,14 @@ class DiscordWebhook:
             title: Embed title
             description: Embed description
             color: Embed color (decimal format)
-            players: List of player dictionaries with rank, playername, and votes
+            players: Ranked players (with previous_rank when rank movement is tracked)
+            date: Date whose month is shown in the title (defaults to today)
+            overtakes: Overtake events since the last post (see RankTracker.diff)
 
         Returns:
             dict: Discord embed structure
         """
-        # Build the fields for each player in 2-column layout
-        fields = []
-        
-        # Create names column
-        names_list = []
-        votes_list = []
-        
-        for player in players:
-            rank = player.get('rank', '?')
-            name = player.get('playername', 'Unknown')
-            votes = player.get('votes', 0)
-
-            # Create medal emoji for top 3
-            rank_display = self._get_rank_display(rank)
-            
-            names_list.append(f"{rank_display} {name}")
-            votes_list.append(f"**{votes}** votes")
-
-        # Add the two columns as fields
-        if names_list:
-            fields.append({
-                "name": "Rank & Player",
-                "value": "\n".join(names_list),
-                "inline": True
-            })
-            fields.append({
-                "name": "Votes",
-                "value": "\n".join(votes_list),
-                "inline": True
-            })
-
-        # Add current month in German to title
-        german_months = {
-            1: "Januar", 2: "Februar", 3: "März", 4: "April", 5: "Mai", 6: "Juni",
-            7: "Juli", 8: "August", 9: "September", 10: "Oktober", 11: "November", 12: "Dezember"
-        }
-        current_month = german_months[datetime.now().month]
-        title_with_month = f"{title}: {current_month}"
-
-        embed = {
-            "title": title_with_month,
-            "description": description,
-            "color": color,
-            "fields": fields,
-            "timestamp": datetime.utcnow().isoformat(),
-            "footer": {
-                "text": "TopGames Top Voters"
-            }
-        }
-
-        return embed
+        return self.renderer.ranking(title, description, color, players, date, overtakes)
 
     @staticmethod
     def _get_rank_display(rank: int) -> str:
@@ -103,14 +75,34 @@ class DiscordWebhook:
         Returns:
             str: Formatted rank string
         """
-        medals = {
-            1: "🥇",
-            2: "🥈",
-            3: "🥉"
+        return rank_display(rank)
+
+    def _get_movement_display(self, player: Player) -> str:
+        """
+        Get the rank movement indicator of a player since the last post.
+
+        Args:
+            player: Player, with previous_rank set if movement is tracked
+
+        Returns:
+            str: ▲n, ▼n or the locale's new-entry marker; empty if the rank is unchanged or not tracked
+        """
+        return self.renderer.movement(player)
+
+    @staticmethod
+    def build_payload(embed: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build the webhook request body for an embed.
+
+        Args:
+            embed: Discord embed structure
+
+        Returns:
+            dict: JSON payload as POSTed to Discord
+        """
+        return {
+            "embeds": [embed]
         }
-        if rank in medals:
-            return medals[rank]
-        return f"#{rank}"
 
     def send_embed(self, embed: Dict[str, Any]) -> bool:
         """
@@ -125,57 +117,61 @@ class DiscordWebhook:
         Raises:
             requests.RequestException: If the webhook request fails
         """
-        payload = {
-            "embeds": [embed]
-        }
+        payload = self.build_payload(embed)
 
+        response = None
+        started = time.perf_counter()
         try:
-            response = requests.post(
+            http = self.session if self.session is not None else requests
+            response = http.post(
                 self.webhook_url,
                 json=payload,
                 timeout=10
             )
+            body = response.request.body if response.request is not None else None
+            metrics.observe_response(self.server, 'discord', response, started, len(body) if body else None)
             response.raise_for_status()
             return True
 
         except requests.RequestException as e:
+            if response is None:
+                metrics.observe_response(self.server, 'discord', None, started)
             raise requests.RequestException(f"Failed to send Discord webhook: {str(e)}")
 
     def send_rankings(
         self,
-        players: List[Dict[str, Any]],
+        players: List[Player],
         title: str,
         description: str,
-        color: int
+        color: int,
+        date: Optional[datetime] = None,
+        overtakes: Optional[List[Dict[str, Any]]] = None
     ) -> bool:
         """
         Create and send player rankings to Discord.
 
         Args:
-            players: List of player dictionaries
+            players: Ranked players
             title: Embed title
             description: Embed description
             color: Embed color
+            date: Date whose month is shown in the title (defaults to today)
+            overtakes: Overtake events since the last post
 
         Returns:
             bool: True if successful
         """
         if not players:
             # Send a message indicating no players
-            embed = {
-                "title": title,
-                "description": "No voters to display at this time.",
-                "color": color,
-                "timestamp": datetime.utcnow().isoformat()
-            }
+            embed = self.renderer.empty_ranking(title, color)
         else:
-            embed = self.create_embed(title, description, color, players)
+            embed = self.create_embed(title, description, color, players, date, overtakes)
 
         return self.send_embed(embed)
 
     def send_weekly_analysis(
         self,
-        weekly_players: List[Dict[str, Any]],
+        weekly_players: List[WeeklyPlayer],
         week_range: str,
         color: int = 7506394  # Purple color for weekly posts
     ) -> bool:
@@ -183,63 +179,63 @@ class DiscordWebhook:
         Create and send weekly voting analysis to Discord.
 
         Args:
-            weekly_players: List of players with weekly vote data
+            weekly_players: Players ranked by weekly votes
             week_range: Date range string (e.g., "17.11 - 23.11.2025")
             color: Embed color for weekly posts
 
         Returns:
             bool: True if successful
         """
-        if not weekly_players:
-            embed = {
-                "title": "📊 Wöchentliche Voting-Analyse",
-                "description": f"**Woche: {week_range}**\n\nKeine Aktivitäten in dieser Woche gefunden.",
-                "color": color,
-                "timestamp": datetime.utcnow().isoformat(),
-                "footer": {
-                    "text": "TopGames Weekly Analysis"
-                }
-            }
-        else:
-            # Create weekly analysis embed
-            names_list = []
-            votes_list = []
-            
-            for player in weekly_players[:10]:  # Limit to top 10
-                rank = player.get('rank', '?')
-                name = player.get('playername', 'Unknown')
-                weekly_votes = player.get('weekly_votes', 0)
-                
-                # Use different emojis for weekly rankings
-                rank_display = self._get_weekly_rank_display(rank)
-                names_list.append(f"{rank_display} {name}")
-                votes_list.append(f"**+{weekly_votes}** Votes")
-
-            fields = []
-            if names_list:
-                fields.append({
-                    "name": "🏃‍♂️ Aktivste Voter",
-                    "value": "\n".join(names_list),
-                    "inline": True
-                })
-                fields.append({
-                    "name": "📈 Wöchentliche Votes",
-                    "value": "\n".join(votes_list),
-                    "inline": True
-                })
-
-            embed = {
-                "title": "📊 Wöchentliche Voting-Analyse",
-                "description": f"**Woche: {week_range}**\n\nHier sind die aktivsten Voter dieser Woche!",
-                "color": color,
-                "fields": fields,
-                "timestamp": datetime.utcnow().isoformat(),
-                "footer": {
-                    "text": "TopGames Weekly Analysis"
-                }
-            }
+        return self.send_embed(self.renderer.weekly(weekly_players, week_range, color))
 
-        return self.send_embed(embed)
+    def send_spike_alert(self, flags: List[Dict[str, Any]], color: int = 15158332) -> bool:
+        """
+        Send vote spike flags to the admin channel.
+
+        Args:
+            flags: Players voting far faster than usual (see VelocityTracker.update)
+            color: Embed color for alerts (red)
+
+        Returns:
+            bool: True if successful
+        """
+        return self.send_embed(self.renderer.spike_alert(flags, color))
+
+    def send_month_over_month(
+        self,
+        rows: List[Dict[str, Any]],
+        month: datetime,
+        color: int = 1752220  # Teal color for monthly recaps
+    ) -> bool:
+        """
+        Send a month's top players compared with the month before.
+
+        Args:
+            rows: Rows from AggregateStore.month_over_month
+            month: Any date in the month
+            color: Embed color for monthly recaps
+
+        Returns:
+            bool: True if successful
+        """
+        return self.send_embed(self.renderer.month_over_month(rows, month, color))
+
+    def send_hall_of_fame(
+        self,
+        rows: List[Dict[str, Any]],
+        color: int = 12745742  # Dark gold color for the hall of fame
+    ) -> bool:
+        """
+        Send the all-time top players.
+
+        Args:
+            rows: Rows from AggregateStore.hall_of_fame
+            color: Embed color for the hall of fame
+
+        Returns:
+            bool: True if successful
+        """
+        return self.send_embed(self.renderer.hall_of_fame(rows, color))
 
     @staticmethod
     def _get_weekly_rank_display(rank: int) -> str:
@@ -252,11 +248,45 @@ class DiscordWebhook:
         Returns:
             str: Formatted rank string
         """
-        weekly_medals = {
-            1: "🔥",  # Fire for most active
-            2: "⚡",  # Lightning for second
-            3: "🌟"   # Star for third
-        }
-        if rank in weekly_medals:
-            return weekly_medals[rank]
-        return f"#{rank}"
+        return weekly_rank_display(rank)
+
+
+class RecordingWebhook(DiscordWebhook):
+    """Webhook that keeps the payloads it would send instead of POSTing them."""
+
+    def __init__(self, render_dir: Optional[str] = None, locale: str = DEFAULT_LOCALE):
+        """
+        Initialize the recorder without a webhook URL.
+
+        Args:
+            render_dir: Directory the payloads are also written to as JSON files
+            locale: Locale pack of the posts (see render.LOCALES)
+        """
+        super().__init__('', locale=locale)
+        self.render_dir = render_dir
+        # File name prefix of the next payloads (e.g. the recorded input they came from)
+        self.prefix = 'payload'
+        self.payloads: List[Dict[str, Any]] = []
+        if render_dir:
+            os.makedirs(render_dir, exist_ok=True)
+
+    def send_embed(self, embed: Dict[str, Any]) -> bool:
+        """
+        Record the payload of an embed.
+
+        Args:
+            embed: Discord embed structure
+
+        Returns:
+            bool: True if recorded (and written, with a render directory)
+        """
+        payload = self.build_payload(embed)
+        self.payloads.append(payload)
+        if self.render_dir:
+            path = os.path.join(self.render_dir, f"{self.prefix}_{len(self.payloads):02d}.json")
+            try:
+                with open(path, 'w', encoding='utf-8') as f:
+                    json.dump(payload, f, indent=2, ensure_ascii=False)
+            except OSError:
+                return False
+        return True